@@ -0,0 +1,42 @@
+"""Convert example market data from CSV to Parquet.
+
+Run once before the examples:
+    python examples/_prepare_data.py
+
+The examples pick up the .parquet file automatically when it exists and fall
+back to the CSV otherwise. Writing Parquet requires pyarrow.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_CSV = "AAPL_5d_1m.csv"
+
+
+def convert_to_parquet(csv_name: str = DEFAULT_CSV, data_dir: Path = DATA_DIR) -> Path:
+    """Write a Parquet copy of a CSV in the data directory.
+    
+    Returns:
+        Path to the Parquet file
+    """
+    csv_path = Path(data_dir) / csv_name
+    parquet_path = csv_path.with_suffix(".parquet")
+    df = pd.read_csv(csv_path, float_precision="round_trip")
+    df["Datetime"] = pd.to_datetime(df["Datetime"])
+    df.to_parquet(parquet_path, compression="zstd", index=False)
+    return parquet_path
+
+
+def data_file(csv_name: str = DEFAULT_CSV, data_dir: Path = DATA_DIR) -> str:
+    """Return the Parquet name for a data file if it has been prepared, else the CSV name."""
+    parquet_name = Path(csv_name).with_suffix(".parquet").name
+    if (Path(data_dir) / parquet_name).exists():
+        return parquet_name
+    return csv_name
+
+
+if __name__ == "__main__":
+    path = convert_to_parquet()
+    print(f"Wrote {path}")
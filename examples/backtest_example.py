@@ -4,10 +4,8 @@ This is the same as running: python main.py --config config_simulation.json
 But shows how to do it programmatically.
 """
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import asyncio
+from dataclasses import replace
 
 from trading_lib.config import load_config
 from trading_lib import create_gateway
@@ -17,6 +15,13 @@ from trading_lib.portfolio import SimplePortfolio
 from trading_lib.order_manager import OrderManager
 from trading_lib.performance import PerformanceTracker
 
+from _prepare_data import data_file
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # optional: faster event loop
+
 
 def main():
     """Run a backtest using config file."""
@@ -24,8 +29,9 @@ def main():
     # Load config (same as main.py)
     config = load_config("config_simulation.json")
     
-    # Create gateway
-    gateway = create_gateway(config.gateway)
+    # Create gateway, reading the Parquet copy of the data if it has been prepared
+    gateway_config = replace(config.gateway, csv_path=data_file(config.gateway.csv_path))
+    gateway = create_gateway(gateway_config)
     
     # Create strategy from config
     strategy = create_strategy(config.strategy)
@@ -53,8 +59,9 @@ def main():
     )
     
     print("Running backtest...")
+    run = uvloop.run if uvloop is not None else asyncio.run
     try:
-        engine.run()
+        run(engine.run_async())
     finally:
         gateway.disconnect()
     
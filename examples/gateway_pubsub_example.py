@@ -1,63 +1,79 @@
 """Example: Using Gateway with publish-subscribe pattern."""
 
-import sys
-from pathlib import Path
+import logging
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
 
 from trading_lib.gateway import SimulationGateway
-from trading_lib.models import MarketDataPoint, Order, OrderStatus, Action
+from trading_lib.models import Order, OrderStatus
 from trading_lib.portfolio import SimplePortfolio
 from trading_lib.strategies import MovingAverageStrategy
 
+from _prepare_data import data_file
+
+log = logging.getLogger(__name__)
+
 
 class TradingSystem:
     """Simple trading system that uses Gateway pattern."""
     
-    def __init__(self, gateway, strategy, portfolio):
+    def __init__(self, gateway, strategy, portfolio, batch_size: int = 1024):
         self.gateway = gateway
         self.strategy = strategy
         self.portfolio = portfolio
         self.tick_count = 0
         
-        # Subscribe to market data
-        self.gateway.subscribe_market_data(self.on_market_data)
+        # Subscribe to market data in batches so signals are computed per array
+        self.gateway.subscribe_market_data_batch(self.on_market_data_batch, batch_size=batch_size)
+        
+        # Progress reporting runs on its own thread so logging never slows the data loop
+        self.progress_count = 0
+        self.gateway.subscribe_market_data(self.on_progress, queue_size=10_000)
         
         # Subscribe to order updates
         self.gateway.subscribe_order_updates(self.on_order_update)
     
-    def on_market_data(self, data_point: MarketDataPoint):
-        """Called when new market data arrives."""
-        self.tick_count += 1
-        
-        # Show progress
-        if self.tick_count % 100 == 0:
-            print(f"Processed {self.tick_count} ticks...")
+    def on_progress(self, data_point):
+        """Called (asynchronously) for every tick."""
+        self.progress_count += 1
+        if self.progress_count % 100 == 0:
+            log.info("Processed %d ticks...", self.progress_count)
+    
+    def on_market_data_batch(self, batch: np.ndarray):
+        """Called with a structured array of ticks (timestamp, symbol, price)."""
+        self.tick_count += len(batch)
         
-        # Generate trading signals
-        signals = self.strategy.generate_signals(data_point)
+        # Generate trading signals for the whole batch
+        actions = self.strategy.generate_signals_batch(batch['price'], batch['symbol'], batch['timestamp'])
         
-        # Process signals and submit orders
-        for symbol, quantity, price, action in signals:
-            if action != Action.HOLD:
-                # Check if we can execute
-                order = Order(symbol, quantity, price, OrderStatus.PENDING)
-                
-                if self.portfolio.can_execute_order(order):
-                    print(f"Submitting order: {symbol} {quantity}@{price}")
-                    self.gateway.submit_order(order)
-                else:
-                    print(f"Cannot execute order: Insufficient funds/holdings")
+        # Only ticks with a BUY/SELL action produce orders
+        for i in np.flatnonzero(actions):
+            symbol = batch['symbol'][i]
+            price = float(batch['price'][i])
+            quantity = int(actions[i]) * self.strategy.quantity
+            order = Order.acquire(symbol, quantity, price, OrderStatus.PENDING)
+            
+            if self.portfolio.can_execute_order(order):
+                log.info("Submitting order: %s %d@%s", symbol, quantity, price)
+                self.gateway.submit_order(order)
+            else:
+                log.info("Cannot execute order: Insufficient funds/holdings")
+                # Never submitted, so the object can be reused
+                order.release()
     
     def on_order_update(self, order: Order):
         """Called when order status changes."""
-        if order.status == OrderStatus.COMPLETED:
-            print(f"Order filled: {order.symbol} {order.quantity}@{order.price}")
+        if order.status == OrderStatus.FILLED:
+            # Fills arrive after the batch handler returns, so an earlier fill
+            # in the same batch may already have used up the cash
+            if not self.portfolio.can_execute_order(order):
+                log.info("Fill rejected: %s %d@%s", order.symbol, order.quantity, order.price)
+                return
+            log.info("Order filled: %s %d@%s", order.symbol, order.quantity, order.price)
             # Update portfolio
             self.portfolio.apply_order(order)
         elif order.status == OrderStatus.FAILED:
-            print(f"Order failed: {order.symbol}")
+            log.warning("Order failed: %s", order.symbol)
     
     def run(self):
         """Start the trading system."""
@@ -82,13 +98,16 @@ class TradingSystem:
 
 def main():
     """Run the example."""
+    # Per-tick and per-order messages are INFO; use level=logging.INFO to see them
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s | %(message)s")
+    
     print("=" * 60)
     print("GATEWAY PUB/SUB PATTERN EXAMPLE")
     print("=" * 60)
     print()
     
     # Create gateway (simulation mode)
-    gateway = SimulationGateway(csv_path='AAPL_5d_1m.csv', data_dir='data')
+    gateway = SimulationGateway(csv_path=data_file('AAPL_5d_1m.csv'), data_dir='data')
     gateway.connect()
     
     # Create strategy and portfolio
@@ -1,12 +1,7 @@
 """Example demonstrating market data logging from live trading."""
 
-import sys
-from pathlib import Path
-
-# Add parent directory to path so we can import trading_lib
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from datetime import datetime
+
 from trading_lib.models import MarketDataPoint
 from trading_lib.market_data_logger import MarketDataLogger
 
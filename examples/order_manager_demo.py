@@ -1,15 +1,12 @@
 """Demo: OrderManager validation and Gateway audit logging."""
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from trading_lib.gateway import SimulationGateway
 from trading_lib.order_manager import OrderManager
 from trading_lib.portfolio import SimplePortfolio
 from trading_lib.models import Order, OrderStatus
 
+from _prepare_data import data_file
+
 def main():
     # Setup
     portfolio = SimplePortfolio(cash=10000, holdings={})
@@ -21,7 +18,7 @@ def main():
     )
     
     gateway = SimulationGateway(
-        csv_path='AAPL_5d_1m.csv',
+        csv_path=data_file('AAPL_5d_1m.csv'),
         data_dir='data',
         audit_log_path='logs/order_audit.csv'
     )
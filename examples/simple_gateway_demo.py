@@ -1,17 +1,19 @@
 """Simple example showing how to use the Gateway with callbacks."""
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import logging
 
 from trading_lib.config import load_config
 from trading_lib.gateway import create_gateway
 from trading_lib.models import MarketDataPoint
 
+log = logging.getLogger(__name__)
+
 
 def main():
     """Run a simple gateway demo."""
+    # Tick messages are INFO; use level=logging.INFO to see them
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s | %(message)s")
+    
     # Load config
     config = load_config('config_simulation.json')
     gateway = create_gateway(config.gateway)
@@ -24,7 +26,7 @@ def main():
         nonlocal tick_count
         tick_count += 1
         if tick_count % 100 == 0:
-            print(f"Tick #{tick_count}: {data_point.symbol} @ ${data_point.price:.2f}")
+            log.info("Tick #%d: %s @ $%.2f", tick_count, data_point.symbol, data_point.price)
     
     # Subscribe and run
     gateway.subscribe_market_data(on_market_data)
@@ -4,47 +4,80 @@ This uses the same infrastructure as main.py - just creates the components
 directly for programmatic testing.
 """
 
-import sys
+import os
+import faulthandler
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
 
-from trading_lib import create_gateway, load_config
 from trading_lib.engine import TradingEngine
+from trading_lib.gateway import SimulationGateway, load_market_data
 from trading_lib.strategies.factory import create_strategy
 from trading_lib.portfolio import SimplePortfolio
 from trading_lib.order_manager import OrderManager
 from trading_lib.performance import PerformanceTracker, PerformanceMetrics
-from trading_lib.config import GatewayConfig, Mode
 
+from _prepare_data import data_file
 
-def test_strategy_config(config: dict, csv_path: str = "AAPL_5d_1m.csv") -> PerformanceMetrics:
+
+DATA_DIR = Path("data")
+DEFAULT_CSV = data_file("AAPL_5d_1m.csv")
+
+
+@lru_cache(maxsize=4)
+def _load_csv_cached(csv_path: str = DEFAULT_CSV):
+    """Parse a data file once per process; every backtest replays the same arrays."""
+    return load_market_data(DATA_DIR / csv_path)
+
+
+@lru_cache(maxsize=4)
+def _get_gateway(csv_path: str = DEFAULT_CSV) -> SimulationGateway:
+    """One simulation gateway per data file per process, reset between runs."""
+    return SimulationGateway.from_arrays(_load_csv_cached(csv_path))
+
+
+@lru_cache(maxsize=1)
+def _get_components() -> tuple[SimplePortfolio, OrderManager, PerformanceTracker]:
+    """One portfolio/order manager/tracker per process, reset between runs."""
+    portfolio = SimplePortfolio()
+    order_manager = OrderManager(
+        portfolio=portfolio,
+        max_orders_per_minute=60,
+        max_order_value=50000.0
+    )
+    return portfolio, order_manager, PerformanceTracker(initial_capital=0.0)
+
+
+def _reset_components(initial_capital: float) -> tuple[SimplePortfolio, OrderManager, PerformanceTracker]:
+    """Return this process's components, cleared for a fresh run."""
+    portfolio, order_manager, performance_tracker = _get_components()
+    portfolio.reset(initial_capital)
+    order_manager.reset()
+    performance_tracker.reset(initial_capital)
+    return portfolio, order_manager, performance_tracker
+
+
+def _init_worker():
+    """Per-process setup for the backtest worker pool."""
+    faulthandler.enable()
+    _get_gateway()
+
+
+def test_strategy_config(config: dict, csv_path: str = DEFAULT_CSV) -> PerformanceMetrics:
     """Test a strategy configuration using the same infrastructure as main.py."""
     initial_capital = 100000.0
     
-    # Create gateway (simulation mode)
-    gateway_config = GatewayConfig(
-        mode=Mode.SIMULATION,
-        csv_path=csv_path,
-        data_dir="data"
-    )
-    gateway = create_gateway(gateway_config)
+    # Reuse this process's simulation gateway over the shared, pre-parsed data
+    gateway = _get_gateway(csv_path)
+    gateway.reset()
     
     # Create strategy
     strategy = create_strategy(config)
     
-    # Create portfolio
-    portfolio = SimplePortfolio(cash=initial_capital)
-    
-    # Create order manager
-    order_manager = OrderManager(
-        portfolio=portfolio,
-        max_orders_per_minute=60,
-        max_order_value=50000.0
-    )
-    
-    # Create performance tracker
-    performance_tracker = PerformanceTracker(initial_capital=initial_capital)
+    # Reuse this process's portfolio, order manager and performance tracker
+    portfolio, order_manager, performance_tracker = _reset_components(initial_capital)
     
     # Create and run engine
     engine = TradingEngine(
@@ -93,16 +126,24 @@ def main():
         },
     ]
     
-    results = []
-    for item in configs:
-        print(f"\nTesting: {item['name']}...")
-        metrics = test_strategy_config(item['config'])
-        results.append((item['name'], metrics))
-        print(f"  Return: ${metrics.total_return:,.2f} ({metrics.total_return_pct:.2f}%) | "
-              f"Trades: {metrics.total_trades} | Sharpe: {metrics.sharpe_ratio:.2f}")
+    # Backtests are independent, so run them across all cores
+    completed = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as executor:
+        futures = {executor.submit(test_strategy_config, item['config']): i for i, item in enumerate(configs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            metrics = future.result()
+            completed[i] = (configs[i]['name'], metrics)
+            print(f"\nTested: {configs[i]['name']}")
+            print(f"  Return: ${metrics.total_return:,.2f} ({metrics.total_return_pct:.2f}%) | "
+                  f"Trades: {metrics.total_trades} | Sharpe: {metrics.sharpe_ratio:.2f}")
+    
+    # Keep submission order so ties rank the same as a sequential run
+    results = [completed[i] for i in sorted(completed)]
     
-    # Sort by total return
-    results.sort(key=lambda x: x[1].total_return, reverse=True)
+    # Sort by total return (stable, so ties keep their submission order)
+    returns = np.fromiter((r[1].total_return for r in results), dtype=np.float64, count=len(results))
+    results = [results[i] for i in np.argsort(-returns, kind='stable')]
     
     print(f"\n{'='*70}")
     print("RESULTS SUMMARY (sorted by return)")
@@ -1,40 +1,130 @@
 """Comprehensive strategy optimization - test many configurations to find the best."""
 
-import sys
+import os
 import json
+import faulthandler
+from collections.abc import Mapping
+from functools import lru_cache
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
 
-from trading_lib import create_gateway
 from trading_lib.engine import TradingEngine
+from trading_lib.gateway import SimulationGateway, load_market_data
+from trading_lib.models import Action, MarketDataPoint
+from trading_lib.strategies.base import Strategy
 from trading_lib.strategies.factory import create_strategy
 from trading_lib.portfolio import SimplePortfolio
 from trading_lib.order_manager import OrderManager
 from trading_lib.performance import PerformanceTracker, PerformanceMetrics
-from trading_lib.config import GatewayConfig, Mode
 
+from _prepare_data import data_file
 
-def test_strategy_config(config: dict, csv_path: str = "AAPL_5d_1m.csv") -> PerformanceMetrics:
-    """Test a strategy configuration."""
-    initial_capital = 100000.0
-    
-    gateway_config = GatewayConfig(
-        mode=Mode.SIMULATION,
-        csv_path=csv_path,
-        data_dir="data"
-    )
-    gateway = create_gateway(gateway_config)
-    
-    strategy = create_strategy(config)
-    portfolio = SimplePortfolio(cash=initial_capital)
+
+DATA_DIR = Path("data")
+DEFAULT_CSV = data_file("AAPL_5d_1m.csv")
+
+
+@lru_cache(maxsize=4)
+def _load_csv_cached(csv_path: str = DEFAULT_CSV):
+    """Parse a data file once per process; every backtest replays the same arrays."""
+    return load_market_data(DATA_DIR / csv_path)
+
+
+@lru_cache(maxsize=4)
+def _get_gateway(csv_path: str = DEFAULT_CSV) -> SimulationGateway:
+    """One simulation gateway per data file per process, reset between runs."""
+    return SimulationGateway.from_arrays(_load_csv_cached(csv_path))
+
+
+@lru_cache(maxsize=1)
+def _get_components() -> tuple[SimplePortfolio, OrderManager, PerformanceTracker]:
+    """One portfolio/order manager/tracker per process, reset between runs."""
+    portfolio = SimplePortfolio()
     order_manager = OrderManager(
         portfolio=portfolio,
         max_orders_per_minute=60,
         max_order_value=50000.0
     )
-    performance_tracker = PerformanceTracker(initial_capital=initial_capital)
+    return portfolio, order_manager, PerformanceTracker(initial_capital=0.0)
+
+
+def _reset_components(initial_capital: float) -> tuple[SimplePortfolio, OrderManager, PerformanceTracker]:
+    """Return this process's components, cleared for a fresh run."""
+    portfolio, order_manager, performance_tracker = _get_components()
+    portfolio.reset(initial_capital)
+    order_manager.reset()
+    performance_tracker.reset(initial_capital)
+    return portfolio, order_manager, performance_tracker
+
+
+def _init_worker():
+    """Per-process setup for the backtest worker pool."""
+    faulthandler.enable()
+    _get_gateway()
+
+
+# Recorded signal stream: tick index and direction (+1 buy, -1 sell)
+SIGNAL_DTYPE = np.dtype([('tick', np.int64), ('action', np.int8)])
+
+
+class _ReplayStrategy(Strategy):
+    """Re-emits a recorded signal stream at a given order size."""
+    
+    def __init__(self, signals: np.ndarray, quantity: int):
+        super().__init__(quantity)
+        self._signals = signals
+        self._next = 0
+        self._tick = -1
+    
+    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
+        self._tick += 1
+        out = []
+        while self._next < len(self._signals) and self._signals[self._next]['tick'] == self._tick:
+            action = int(self._signals[self._next]['action'])
+            out.append((tick.symbol, action * self.quantity, tick.price, Action.BUY if action > 0 else Action.SELL))
+            self._next += 1
+        return out
+
+
+@lru_cache(maxsize=None)
+def _compute_signals_cached(config_items: frozenset, csv_path: str, mtime_ns: int) -> np.ndarray:
+    strategy = create_strategy(dict(config_items))
+    data = _load_csv_cached(csv_path)
+    
+    signals = []
+    for i, (timestamp, symbol, price) in enumerate(zip(data.timestamps, data.symbols, data.prices.tolist())):
+        for _, quantity, _, action in strategy.generate_signals(MarketDataPoint(timestamp, symbol, price)):
+            if action != Action.HOLD:
+                signals.append((i, 1 if quantity > 0 else -1))
+    
+    signals = np.array(signals, dtype=SIGNAL_DTYPE)
+    signals.flags.writeable = False
+    return signals
+
+
+def compute_signals(config: dict, csv_path: str = DEFAULT_CSV) -> np.ndarray:
+    """Signal stream for a config, ignoring its quantity.
+    
+    Strategy signals depend only on prices, so configs that differ only in
+    quantity share one indicator pass. Cached per process on the remaining
+    config items and the data file's mtime.
+    """
+    base = frozenset((k, v) for k, v in config.items() if k != "quantity")
+    mtime_ns = (DATA_DIR / csv_path).stat().st_mtime_ns
+    return _compute_signals_cached(base, csv_path, mtime_ns)
+
+
+def apply_quantity(signals: np.ndarray, quantity: int, initial_capital: float = 100000.0,
+                   csv_path: str = DEFAULT_CSV) -> PerformanceMetrics:
+    """Run the engine over the data, replaying signals at the given quantity."""
+    gateway = _get_gateway(csv_path)
+    gateway.reset()
+    
+    strategy = _ReplayStrategy(signals, quantity)
+    portfolio, order_manager, performance_tracker = _reset_components(initial_capital)
     
     engine = TradingEngine(
         gateway=gateway,
@@ -52,6 +142,44 @@ def test_strategy_config(config: dict, csv_path: str = "AAPL_5d_1m.csv") -> Perf
     return performance_tracker.calculate_metrics()
 
 
+def test_strategy_config(config: dict, csv_path: str = DEFAULT_CSV) -> PerformanceMetrics:
+    """Test a strategy configuration."""
+    quantity = create_strategy(config).quantity
+    return apply_quantity(compute_signals(config, csv_path), quantity, csv_path=csv_path)
+
+
+def _run_config(config: dict):
+    """Worker entry point: (metrics, None) on success, (None, error message) on failure."""
+    try:
+        return test_strategy_config(config), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _run_serial(configs: list, prefetcher: Executor):
+    """Run configs in this process, yielding (metrics, error) in order.
+    
+    Used when there is a single core. Signals for the next config are computed
+    on the prefetcher thread while the current backtest runs, so the indicator
+    pass for the next base strategy is already under way (both are pure Python,
+    so the GIL limits how much actually overlaps).
+    """
+    futures = {}
+    
+    def prefetch(i):
+        if i < len(configs) and i not in futures:
+            futures[i] = prefetcher.submit(compute_signals, configs[i])
+    
+    for i, config in enumerate(configs):
+        prefetch(i)
+        prefetch(i + 1)
+        try:
+            signals = futures.pop(i).result()
+            yield apply_quantity(signals, create_strategy(config).quantity), None
+        except Exception as e:
+            yield None, str(e)
+
+
 def save_results_to_markdown(results: list, best: tuple):
     """Save optimization results to a markdown file."""
     # Create directory
@@ -62,83 +190,121 @@ def save_results_to_markdown(results: list, best: tuple):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = output_dir / f"strategy_comparison_{timestamp}.md"
     
-    with open(report_path, 'w') as f:
-        f.write("# Strategy Performance Comparison\n\n")
-        f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write("---\n\n")
-        
-        # Best strategy section
-        f.write("## 🏆 Best Strategy\n\n")
-        f.write(f"**Name:** {best[0]}\n\n")
-        f.write(f"**Configuration:**\n```json\n{json.dumps(best[2], indent=2)}\n```\n\n")
-        f.write("**Performance Metrics:**\n\n")
-        f.write(f"- **Total Return:** ${best[1].total_return:,.2f} ({best[1].total_return_pct:.2f}%)\n")
-        f.write(f"- **Total Trades:** {best[1].total_trades}\n")
-        f.write(f"- **Win Rate:** {best[1].win_rate:.2f}%\n")
-        f.write(f"- **Winning Trades:** {best[1].winning_trades}\n")
-        f.write(f"- **Losing Trades:** {best[1].losing_trades}\n")
-        f.write(f"- **Average Win:** ${best[1].avg_win:,.2f}\n")
-        f.write(f"- **Average Loss:** ${best[1].avg_loss:,.2f}\n")
-        f.write(f"- **Profit Factor:** {best[1].profit_factor:.2f}\n")
-        f.write(f"- **Sharpe Ratio:** {best[1].sharpe_ratio:.2f}\n")
-        f.write(f"- **Max Drawdown:** ${best[1].max_drawdown:,.2f} ({best[1].max_drawdown_pct:.2f}%)\n")
-        f.write(f"- **Initial Capital:** ${best[1].initial_capital:,.2f}\n")
-        f.write(f"- **Final Capital:** ${best[1].final_capital:,.2f}\n\n")
-        
-        f.write("---\n\n")
-        
-        # All results table
-        f.write("## All Strategies (Sorted by Return)\n\n")
-        f.write("| Rank | Strategy | Return % | Trades | Win % | Sharpe | Max DD % | Initial Capital | Final Capital |\n")
-        f.write("|------|----------|----------|--------|-------|--------|----------|-----------------|---------------|\n")
-        
-        for rank, (name, m, config) in enumerate(results, 1):
-            f.write(f"| {rank} | {name} | {m.total_return_pct:.2f}% | {m.total_trades} | "
-                   f"{m.win_rate:.1f}% | {m.sharpe_ratio:.2f} | {m.max_drawdown_pct:.2f}% | "
-                   f"${m.initial_capital:,.2f} | ${m.final_capital:,.2f} |\n")
-        
-        f.write("\n---\n\n")
-        
-        # Detailed metrics for top 10
-        f.write("## Top 10 Strategies - Detailed Metrics\n\n")
-        for rank, (name, m, config) in enumerate(results[:10], 1):
-            f.write(f"### {rank}. {name}\n\n")
-            f.write(f"**Configuration:**\n```json\n{json.dumps(config, indent=2)}\n```\n\n")
-            f.write("**Metrics:**\n\n")
-            f.write(f"- Return: ${m.total_return:,.2f} ({m.total_return_pct:.2f}%)\n")
-            f.write(f"- Total Trades: {m.total_trades}\n")
-            f.write(f"- Win Rate: {m.win_rate:.2f}% ({m.winning_trades} wins, {m.losing_trades} losses)\n")
-            f.write(f"- Average Win: ${m.avg_win:,.2f}\n")
-            f.write(f"- Average Loss: ${m.avg_loss:,.2f}\n")
-            f.write(f"- Profit Factor: {m.profit_factor:.2f}\n")
-            f.write(f"- Sharpe Ratio: {m.sharpe_ratio:.2f}\n")
-            f.write(f"- Max Drawdown: ${m.max_drawdown:,.2f} ({m.max_drawdown_pct:.2f}%)\n")
-            f.write(f"- Initial Capital: ${m.initial_capital:,.2f}\n")
-            f.write(f"- Final Capital: ${m.final_capital:,.2f}\n\n")
-        
-        # Summary statistics
-        f.write("---\n\n")
-        f.write("## Summary Statistics\n\n")
-        returns = [r[1].total_return_pct for r in results]
-        sharpe_ratios = [r[1].sharpe_ratio for r in results]
-        win_rates = [r[1].win_rate for r in results]
-        
-        f.write(f"- **Total Strategies Tested:** {len(results)}\n")
-        f.write(f"- **Average Return:** {sum(returns) / len(returns):.2f}%\n")
-        f.write(f"- **Best Return:** {max(returns):.2f}%\n")
-        f.write(f"- **Worst Return:** {min(returns):.2f}%\n")
-        f.write(f"- **Average Sharpe Ratio:** {sum(sharpe_ratios) / len(sharpe_ratios):.2f}\n")
-        f.write(f"- **Best Sharpe Ratio:** {max(sharpe_ratios):.2f}\n")
-        f.write(f"- **Average Win Rate:** {sum(win_rates) / len(win_rates):.2f}%\n")
-        f.write(f"- **Best Win Rate:** {max(win_rates):.2f}%\n")
-        f.write(f"- **Profitable Strategies:** {sum(1 for r in returns if r > 0)}\n")
-        f.write(f"- **Losing Strategies:** {sum(1 for r in returns if r <= 0)}\n\n")
+    # Build the whole report in memory and write it once
+    parts = []
+    append = parts.append
+    best_json = json.dumps(dict(best[2]), indent=2)
+    
+    append("# Strategy Performance Comparison\n\n")
+    append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    append("---\n\n")
+    
+    # Best strategy section
+    append("## 🏆 Best Strategy\n\n")
+    append(f"**Name:** {best[0]}\n\n")
+    append(f"**Configuration:**\n```json\n{best_json}\n```\n\n")
+    append("**Performance Metrics:**\n\n")
+    append(f"- **Total Return:** ${best[1].total_return:,.2f} ({best[1].total_return_pct:.2f}%)\n")
+    append(f"- **Total Trades:** {best[1].total_trades}\n")
+    append(f"- **Win Rate:** {best[1].win_rate:.2f}%\n")
+    append(f"- **Winning Trades:** {best[1].winning_trades}\n")
+    append(f"- **Losing Trades:** {best[1].losing_trades}\n")
+    append(f"- **Average Win:** ${best[1].avg_win:,.2f}\n")
+    append(f"- **Average Loss:** ${best[1].avg_loss:,.2f}\n")
+    append(f"- **Profit Factor:** {best[1].profit_factor:.2f}\n")
+    append(f"- **Sharpe Ratio:** {best[1].sharpe_ratio:.2f}\n")
+    append(f"- **Max Drawdown:** ${best[1].max_drawdown:,.2f} ({best[1].max_drawdown_pct:.2f}%)\n")
+    append(f"- **Initial Capital:** ${best[1].initial_capital:,.2f}\n")
+    append(f"- **Final Capital:** ${best[1].final_capital:,.2f}\n\n")
+    
+    append("---\n\n")
+    
+    # All results table
+    append("## All Strategies (Sorted by Return)\n\n")
+    append("| Rank | Strategy | Return % | Trades | Win % | Sharpe | Max DD % | Initial Capital | Final Capital |\n")
+    append("|------|----------|----------|--------|-------|--------|----------|-----------------|---------------|\n")
+    
+    for rank, (name, m, config) in enumerate(results, 1):
+        append(f"| {rank} | {name} | {m.total_return_pct:.2f}% | {m.total_trades} | "
+               f"{m.win_rate:.1f}% | {m.sharpe_ratio:.2f} | {m.max_drawdown_pct:.2f}% | "
+               f"${m.initial_capital:,.2f} | ${m.final_capital:,.2f} |\n")
+    
+    append("\n---\n\n")
+    
+    # Detailed metrics for top 10
+    append("## Top 10 Strategies - Detailed Metrics\n\n")
+    for rank, (name, m, config) in enumerate(results[:10], 1):
+        append(f"### {rank}. {name}\n\n")
+        config_json = best_json if config is best[2] else json.dumps(dict(config), indent=2)
+        append(f"**Configuration:**\n```json\n{config_json}\n```\n\n")
+        append("**Metrics:**\n\n")
+        append(f"- Return: ${m.total_return:,.2f} ({m.total_return_pct:.2f}%)\n")
+        append(f"- Total Trades: {m.total_trades}\n")
+        append(f"- Win Rate: {m.win_rate:.2f}% ({m.winning_trades} wins, {m.losing_trades} losses)\n")
+        append(f"- Average Win: ${m.avg_win:,.2f}\n")
+        append(f"- Average Loss: ${m.avg_loss:,.2f}\n")
+        append(f"- Profit Factor: {m.profit_factor:.2f}\n")
+        append(f"- Sharpe Ratio: {m.sharpe_ratio:.2f}\n")
+        append(f"- Max Drawdown: ${m.max_drawdown:,.2f} ({m.max_drawdown_pct:.2f}%)\n")
+        append(f"- Initial Capital: ${m.initial_capital:,.2f}\n")
+        append(f"- Final Capital: ${m.final_capital:,.2f}\n\n")
+    
+    # Summary statistics
+    append("---\n\n")
+    append("## Summary Statistics\n\n")
+    n = len(results)
+    returns = np.fromiter((r[1].total_return_pct for r in results), dtype=np.float64, count=n)
+    sharpe_ratios = np.fromiter((r[1].sharpe_ratio for r in results), dtype=np.float64, count=n)
+    win_rates = np.fromiter((r[1].win_rate for r in results), dtype=np.float64, count=n)
+    profitable = int((returns > 0).sum())
+    
+    append(f"- **Total Strategies Tested:** {n}\n")
+    append(f"- **Average Return:** {returns.mean():.2f}%\n")
+    append(f"- **Best Return:** {returns.max():.2f}%\n")
+    append(f"- **Worst Return:** {returns.min():.2f}%\n")
+    append(f"- **Average Sharpe Ratio:** {sharpe_ratios.mean():.2f}\n")
+    append(f"- **Best Sharpe Ratio:** {sharpe_ratios.max():.2f}\n")
+    append(f"- **Average Win Rate:** {win_rates.mean():.2f}%\n")
+    append(f"- **Best Win Rate:** {win_rates.max():.2f}%\n")
+    append(f"- **Profitable Strategies:** {profitable}\n")
+    append(f"- **Losing Strategies:** {n - profitable}\n\n")
+    
+    report_path.write_text(''.join(parts))
     
     print(f"\n{'='*80}")
     print(f"📊 Results saved to: {report_path}")
     print(f"{'='*80}")
 
 
+class _QtyOverlay(Mapping):
+    """Read-only view of a base config with its quantity overridden.
+    
+    Lets every quantity variant share the base dict instead of copying it.
+    """
+    __slots__ = ('base', 'qty')
+    
+    def __init__(self, base: dict, qty: int):
+        self.base = base
+        self.qty = qty
+    
+    def __getitem__(self, key):
+        if key == "quantity":
+            return self.qty
+        return self.base[key]
+    
+    def __iter__(self):
+        for key in self.base:
+            if key != "quantity":
+                yield key
+        yield "quantity"
+    
+    def __len__(self):
+        return len(self.base) + (0 if "quantity" in self.base else 1)
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+
 def generate_configs_with_quantities(base_configs: list, quantities: list = [10, 25, 50, 100]) -> list:
     """Generate configs with varying quantities.
     
@@ -147,13 +313,12 @@ def generate_configs_with_quantities(base_configs: list, quantities: list = [10,
         quantities: List of quantities to test
         
     Returns:
-        Expanded list of configs with quantity variations
+        Expanded list of configs with quantity variations (read-only mappings)
     """
     expanded = []
     for base in base_configs:
         for qty in quantities:
-            config = base["config"].copy()
-            config["quantity"] = qty
+            config = _QtyOverlay(base["config"], qty)
             name = f"{base['name']} (qty={qty})"
             expanded.append({"name": name, "config": config})
     return expanded
@@ -207,21 +372,31 @@ def main():
     print(f"Testing {len(configs)} strategy configurations with quantities: {quantities}")
     print("="*80)
     
+    # Backtests are independent, so run them across all cores. Configs that
+    # share a base strategy are sent to the same worker so its signal cache hits.
+    # On a single core, run in-process and prefetch the next config's signals.
     results = []
-    for i, item in enumerate(configs, 1):
-        print(f"\n[{i}/{len(configs)}] Testing: {item['name']}...")
-        try:
-            metrics = test_strategy_config(item['config'])
+    config_list = [item['config'] for item in configs]
+    if (os.cpu_count() or 1) > 1:
+        executor = ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker)
+        outcomes = executor.map(_run_config, config_list, chunksize=len(quantities))
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+        outcomes = _run_serial(config_list, executor)
+    with executor:
+        for i, (item, (metrics, error)) in enumerate(zip(configs, outcomes), 1):
+            print(f"\n[{i}/{len(configs)}] Tested: {item['name']}")
+            if error is not None:
+                print(f"  ✗ Error: {error}")
+                continue
             results.append((item['name'], metrics, item['config']))
             print(f"  ✓ Return: ${metrics.total_return:,.2f} ({metrics.total_return_pct:.2f}%) | "
                   f"Trades: {metrics.total_trades} | Win: {metrics.win_rate:.1f}% | "
                   f"Sharpe: {metrics.sharpe_ratio:.2f} | DD: {metrics.max_drawdown_pct:.2f}%")
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            continue
     
-    # Sort by total return
-    results.sort(key=lambda x: x[1].total_return, reverse=True)
+    # Sort by total return (stable, so ties keep their submission order)
+    returns = np.fromiter((r[1].total_return for r in results), dtype=np.float64, count=len(results))
+    results = [results[i] for i in np.argsort(-returns, kind='stable')]
     
     print(f"\n{'='*80}")
     print("TOP 10 STRATEGIES (sorted by return)")
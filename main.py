@@ -6,11 +6,10 @@ Usage:
     python main.py --config config_live.json
 """
 import argparse
+import asyncio
 import logging
 import signal
-import sys
-import threading
-import time
+from datetime import datetime
 from pathlib import Path
 
 from trading_lib import load_config, create_gateway
@@ -21,37 +20,137 @@ from trading_lib.order_manager import OrderManager
 from trading_lib.logging_config import setup_logging, get_logger
 from trading_lib.performance import PerformanceTracker
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # optional: faster event loop
 
-def _generate_equity_curve_graph(timestamps, values, output_path: Path):
+# Equity curves shorter than this get no graph; longer ones are decimated
+MIN_PLOT_POINTS = 50
+MAX_PLOT_POINTS = 10_000
+
+
+def _format_timestamp(ts) -> str:
+    """Format as 'YYYY-MM-DD HH:MM:SS', dropping any UTC offset.
+    
+    Equivalent to strftime('%Y-%m-%d %H:%M:%S') but about twice as fast.
+    """
+    return ts.isoformat(sep=' ', timespec='seconds')[:19]
+
+
+def _generate_equity_curve_graph(timestamps, values, output_path: Path) -> bool:
     """Generate equity curve graph.
     
+    Curves with fewer than MIN_PLOT_POINTS points are skipped (not worth
+    loading matplotlib for), as is everything when matplotlib isn't
+    installed. Long curves are decimated to at most MAX_PLOT_POINTS points;
+    the difference is not visible at the saved resolution.
+    
     Args:
         timestamps: List of timestamps
         values: List of portfolio values
         output_path: Path to save the graph
+    
+    Returns:
+        True if the graph was saved
     """
+    if len(values) < MIN_PLOT_POINTS:
+        return False
+    
     try:
         import matplotlib
         matplotlib.use('Agg')
         import matplotlib.pyplot as plt
-        
-        plt.figure(figsize=(12, 6))
-        plt.plot(timestamps, values, linewidth=2, color='#2E86AB')
-        plt.axhline(y=values[0], color='gray', linestyle='--', alpha=0.5, label='Initial Capital')
-        plt.fill_between(timestamps, values[0], values, where=[v >= values[0] for v in values], 
-                        alpha=0.3, color='green', label='Profit')
-        plt.fill_between(timestamps, values[0], values, where=[v < values[0] for v in values], 
-                        alpha=0.3, color='red', label='Loss')
-        plt.xlabel('Time', fontsize=12)
-        plt.ylabel('Portfolio Value ($)', fontsize=12)
-        plt.title('Equity Curve', fontsize=14, fontweight='bold')
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
     except ImportError:
-        pass  # matplotlib not available
+        return False  # matplotlib not available
+    import numpy as np
+    
+    t = np.asarray(timestamps, dtype=object)
+    v = np.asarray(values, dtype=np.float64)
+    step = max(1, -(-len(v) // MAX_PLOT_POINTS))  # ceil division
+    t, v = t[::step], v[::step]
+    profit = v >= v[0]
+    
+    plt.figure(figsize=(12, 6))
+    plt.plot(t, v, linewidth=2, color='#2E86AB')
+    plt.axhline(y=v[0], color='gray', linestyle='--', alpha=0.5, label='Initial Capital')
+    plt.fill_between(t, v[0], v, where=profit, 
+                    alpha=0.3, color='green', label='Profit')
+    plt.fill_between(t, v[0], v, where=~profit, 
+                    alpha=0.3, color='red', label='Loss')
+    plt.xlabel('Time', fontsize=12)
+    plt.ylabel('Portfolio Value ($)', fontsize=12)
+    plt.title('Equity Curve', fontsize=14, fontweight='bold')
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close()
+    return True
+
+
+def _startup_live(gateway, portfolio, logger):
+    """Connect and sync the portfolio with the Alpaca account."""
+    logger.info("Syncing portfolio state with Alpaca account...")
+    try:
+        # Connect to gateway first
+        gateway.connect()
+        
+        # Get current state from Alpaca (returns AccountState object)
+        account_state = gateway.get_account_state()
+        
+        # Sync portfolio with actual account state
+        # Use buying_power to represent full available capital from Alpaca
+        portfolio.sync_state(
+            cash=account_state.buying_power,
+            positions=account_state.positions
+        )
+        
+        # Log current state as one record
+        lines = [
+            "Account synced:",
+            f"  Cash: ${account_state.cash:,.2f}",
+            f"  Buying Power: ${account_state.buying_power:,.2f}",
+            f"  Portfolio Value: ${account_state.portfolio_value:,.2f}",
+        ]
+        
+        if account_state.has_positions:
+            lines.append("  Current Positions:")
+            for symbol, pos in account_state.positions.items():
+                plpc = pos.unrealized_plpc
+                pl_pct = (plpc * 100) if plpc else 0
+                lines.append(f"    {symbol}: {pos.quantity} @ ${pos.avg_price:.2f} "
+                             f"(Current: ${pos.current_price:.2f}, "
+                             f"P/L: ${pos.unrealized_pl:+.2f} ({pl_pct:+.2f}%))")
+            lines.append(f"  Total Unrealized P/L: ${account_state.total_unrealized_pl:+,.2f}")
+        
+        if account_state.has_open_orders:
+            lines.append(f"  Open Orders ({len(account_state.open_orders)}):")
+            for order in account_state.open_orders:
+                qty = abs(order.quantity)
+                limit_price = order.limit_price
+                price_str = f"@ ${limit_price:.2f}" if limit_price else "(market)"
+                lines.append(f"    [{order.id}] {order.symbol} {order.side} {qty} {price_str} "
+                             f"(Status: {order.status}, Filled: {order.filled_qty}/{qty})")
+        else:
+            lines.append("  No open orders")
+        
+        logger.info("\n".join(lines))
+    except Exception as e:
+        logger.error(f"Failed to sync account state: {e}")
+        logger.warning("Continuing with initial portfolio settings...")
+
+
+def _startup_simulation(gateway, portfolio, logger):
+    """Log the starting capital."""
+    logger.info(f"Initial capital: ${portfolio.get_cash():,.2f}")
+
+
+# Startup step for each gateway mode
+STARTUP_HANDLERS = {
+    "live": _startup_live,
+    "simulation": _startup_simulation,
+}
 
 
 def main():
@@ -104,10 +203,17 @@ def main():
         max_order_value=config.max_order_value
     )
     
-    # Create performance tracker for simulation mode
+    # Report files are named by session start time
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = Path(f"reports/backtest_report_{timestamp}.md")
+    trade_log_path = report_path.parent / f"backtest_trades_{timestamp}.csv"
+    
+    # Create performance tracker for simulation mode; trades are streamed to
+    # a CSV as they happen so a crashed run still leaves them behind
     performance_tracker = None
     if config.gateway.mode == "simulation":
         performance_tracker = PerformanceTracker(initial_capital=initial_capital)
+        performance_tracker.open_trade_log(trade_log_path)
         logger.info("Performance tracking enabled for simulation")
     
     # Create and run trading engine
@@ -124,163 +230,121 @@ def main():
     logger.info(f"Gateway: {type(gateway).__name__}")
     logger.info(f"Strategy: {type(strategy).__name__}")
     
-    # Sync state for live mode
-    if config.gateway.mode == "live":
-        from trading_lib.gateway import LiveGateway
-        if isinstance(gateway, LiveGateway):
-            logger.info("Syncing portfolio state with Alpaca account...")
-            try:
-                # Connect to gateway first
-                gateway.connect()
-                
-                # Get current state from Alpaca (returns AccountState object)
-                account_state = gateway.get_account_state()
-                
-                # Sync portfolio with actual account state
-                # Use buying_power to represent full available capital from Alpaca
-                portfolio.sync_state(
-                    cash=account_state.buying_power,
-                    positions=account_state.positions
-                )
-                
-                # Log current state
-                logger.info(f"Account synced:")
-                logger.info(f"  Cash: ${account_state.cash:,.2f}")
-                logger.info(f"  Buying Power: ${account_state.buying_power:,.2f}")
-                logger.info(f"  Portfolio Value: ${account_state.portfolio_value:,.2f}")
-                
-                if account_state.has_positions:
-                    logger.info(f"  Current Positions:")
-                    for symbol, pos in account_state.positions.items():
-                        pl_pct = (pos.unrealized_plpc * 100) if pos.unrealized_plpc else 0
-                        logger.info(f"    {symbol}: {pos.quantity} @ ${pos.avg_price:.2f} "
-                                  f"(Current: ${pos.current_price:.2f}, "
-                                  f"P/L: ${pos.unrealized_pl:+.2f} ({pl_pct:+.2f}%))")
-                    logger.info(f"  Total Unrealized P/L: ${account_state.total_unrealized_pl:+,.2f}")
-                
-                if account_state.has_open_orders:
-                    logger.info(f"  Open Orders ({len(account_state.open_orders)}):")
-                    for order in account_state.open_orders:
-                        price_str = f"@ ${order.limit_price:.2f}" if order.limit_price else f"(market)"
-                        logger.info(f"    [{order.id}] {order.symbol} {order.side} {abs(order.quantity)} {price_str} "
-                                  f"(Status: {order.status}, Filled: {order.filled_qty}/{abs(order.quantity)})")
-                else:
-                    logger.info(f"  No open orders")
-                    
-            except Exception as e:
-                logger.error(f"Failed to sync account state: {e}")
-                logger.warning("Continuing with initial portfolio settings...")
-    else:
-        logger.info(f"Initial capital: ${portfolio.get_cash():,.2f}")
+    # Mode-specific startup (account sync for live, capital summary for simulation)
+    STARTUP_HANDLERS[str(config.gateway.mode)](gateway, portfolio, logger)
     
     logger.info("-" * 50)
     logger.info("Press Ctrl+C to stop")
     
-    # Run the gateway in a background thread
-    gateway_thread = threading.Thread(target=engine.run, daemon=True)
-    gateway_thread.start()
+    async def _run():
+        # Ctrl+C stops the gateway loop; a second Ctrl+C interrupts the run
+        loop = asyncio.get_running_loop()
+        
+        def _request_shutdown():
+            logger.info("\n\nShutdown signal received (Ctrl+C)...")
+            gateway.stop()
+            loop.remove_signal_handler(signal.SIGINT)
+        
+        loop.add_signal_handler(signal.SIGINT, _request_shutdown)
+        try:
+            await engine.run_async()
+        finally:
+            loop.remove_signal_handler(signal.SIGINT)
     
+    # Run the engine on the event loop (uvloop's if installed)
+    run = uvloop.run if uvloop is not None else asyncio.run
     try:
-        # Keep main thread alive and responsive to
-        while gateway_thread.is_alive():
-            time.sleep(0.1)  # Check every 100ms
+        run(_run())
     except KeyboardInterrupt:
-        logger.info("\n\nShutdown signal received (Ctrl+C)...")
-        # Stop the gateway loop
-        gateway._connected = False
-        # Wait for thread to finish 
-        gateway_thread.join(timeout=2.0)
-        if gateway_thread.is_alive():
-            logger.warning("Gateway thread did not stop cleanly")
+        logger.warning("Gateway did not stop cleanly")
     finally:
-        # Ensure cleanup happens
-        if gateway._connected:
-            gateway.disconnect()
+        # Ensure cleanup happens (also after a Ctrl+C stop)
+        gateway.stop()
+        gateway.disconnect()
         logger.info("-" * 50)
-        logger.info("Final portfolio state:")
-        logger.info(f"  Cash: ${portfolio.get_cash():,.2f}")
-        logger.info(f"  Positions: {portfolio.get_all_holdings()}")
+        logger.info("\n".join([
+            "Final portfolio state:",
+            f"  Cash: ${portfolio.get_cash():,.2f}",
+            f"  Positions: {portfolio.get_all_holdings()}",
+        ]))
         
         # Write performance metrics to markdown file for simulation mode
         if performance_tracker:
+            performance_tracker.close_trade_log()
             metrics = performance_tracker.calculate_metrics()
-            
-            # Generate report filename with timestamp
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            report_path = Path(f"reports/backtest_report_{timestamp}.md")
             report_path.parent.mkdir(exist_ok=True)
             
-            # Write markdown report
-            with open(report_path, 'w') as f:
-                f.write("# Backtest Performance Report\n\n")
-                f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write("---\n\n")
+            # Build the markdown report in memory and write it once
+            parts = [
+                "# Backtest Performance Report\n\n",
+                f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+                "---\n\n",
                 
-                f.write("## Summary\n\n")
-                f.write(f"- **Initial Capital:** ${metrics.initial_capital:,.2f}\n")
-                f.write(f"- **Final Capital:** ${metrics.final_capital:,.2f}\n")
-                f.write(f"- **Total Return:** ${metrics.total_return:,.2f} ({metrics.total_return_pct:.2f}%)\n")
-                f.write(f"- **Total P&L:** ${metrics.total_pnl:,.2f}\n\n")
+                "## Summary\n\n",
+                f"- **Initial Capital:** ${metrics.initial_capital:,.2f}\n",
+                f"- **Final Capital:** ${metrics.final_capital:,.2f}\n",
+                f"- **Total Return:** ${metrics.total_return:,.2f} ({metrics.total_return_pct:.2f}%)\n",
+                f"- **Total P&L:** ${metrics.total_pnl:,.2f}\n\n",
                 
-                f.write("## Trade Statistics\n\n")
-                f.write(f"- **Total Trades:** {metrics.total_trades}\n")
-                f.write(f"- **Winning Trades:** {metrics.winning_trades}\n")
-                f.write(f"- **Losing Trades:** {metrics.losing_trades}\n")
-                if metrics.total_trades > 0:
-                    f.write(f"- **Win Rate:** {metrics.win_rate:.2f}%\n")
-                    f.write(f"- **Average Win:** ${metrics.avg_win:,.2f}\n")
-                    f.write(f"- **Average Loss:** ${metrics.avg_loss:,.2f}\n")
-                    f.write(f"- **Profit Factor:** {metrics.profit_factor:.2f}\n")
-                f.write("\n")
+                "## Trade Statistics\n\n",
+                f"- **Total Trades:** {metrics.total_trades}\n",
+                f"- **Winning Trades:** {metrics.winning_trades}\n",
+                f"- **Losing Trades:** {metrics.losing_trades}\n",
+            ]
+            if metrics.total_trades > 0:
+                parts += [
+                    f"- **Win Rate:** {metrics.win_rate:.2f}%\n",
+                    f"- **Average Win:** ${metrics.avg_win:,.2f}\n",
+                    f"- **Average Loss:** ${metrics.avg_loss:,.2f}\n",
+                    f"- **Profit Factor:** {metrics.profit_factor:.2f}\n",
+                ]
+            parts += [
+                "\n",
                 
-                f.write("## Risk Metrics\n\n")
-                f.write(f"- **Max Drawdown:** ${metrics.max_drawdown:,.2f} ({metrics.max_drawdown_pct:.2f}%)\n")
-                f.write(f"- **Sharpe Ratio:** {metrics.sharpe_ratio:.2f}\n\n")
+                "## Risk Metrics\n\n",
+                f"- **Max Drawdown:** ${metrics.max_drawdown:,.2f} ({metrics.max_drawdown_pct:.2f}%)\n",
+                f"- **Sharpe Ratio:** {metrics.sharpe_ratio:.2f}\n\n",
+            ]
+            
+            # Add equity curve data if available
+            timestamps, values = performance_tracker.get_equity_curve_data()
+            if timestamps:
+                parts.append("## Equity Curve\n\n")
+                parts.append(f"Total data points: {len(timestamps)}\n\n")
                 
-                # Add equity curve data if available
-                timestamps, values = performance_tracker.get_equity_curve_data()
-                if timestamps:
-                    f.write("## Equity Curve\n\n")
-                    f.write(f"Total data points: {len(timestamps)}\n\n")
-                    
-                    # Generate equity curve graph
-                    try:
-                        import matplotlib
-                        matplotlib.use('Agg')
-                        import matplotlib.pyplot as plt
-                        
-                        graph_path = report_path.parent / f"equity_curve_{timestamp}.png"
-                        _generate_equity_curve_graph(timestamps, values, graph_path)
-                        f.write(f"![Equity Curve]({graph_path.name})\n\n")
-                    except ImportError:
-                        pass  # matplotlib not available, skip graph
-                    
-                    # Also include data table
-                    f.write("### Data Points\n\n")
-                    f.write("| Timestamp | Portfolio Value |\n")
-                    f.write("|-----------|----------------|\n")
-                    # Show first 10 and last 10 points
-                    for i in range(min(10, len(timestamps))):
-                        f.write(f"| {timestamps[i].strftime('%Y-%m-%d %H:%M:%S')} | ${values[i]:,.2f} |\n")
-                    if len(timestamps) > 20:
-                        f.write("| ... | ... |\n")
-                    for i in range(max(10, len(timestamps) - 10), len(timestamps)):
-                        f.write(f"| {timestamps[i].strftime('%Y-%m-%d %H:%M:%S')} | ${values[i]:,.2f} |\n")
-                    f.write("\n")
+                # Generate equity curve graph (skipped for short runs or if matplotlib isn't installed)
+                graph_path = report_path.parent / f"equity_curve_{timestamp}.png"
+                if _generate_equity_curve_graph(timestamps, values, graph_path):
+                    parts.append(f"![Equity Curve]({graph_path.name})\n\n")
                 
-                # Add trade history if available
-                trades = performance_tracker.get_trade_history()
-                if trades:
-                    f.write("## Trade History\n\n")
-                    f.write("| Timestamp | Symbol | Side | Quantity | Price |\n")
-                    f.write("|-----------|--------|------|----------|-------|\n")
-                    for trade in trades[:50]:  # Limit to first 50 trades
-                        f.write(f"| {trade.timestamp.strftime('%Y-%m-%d %H:%M:%S')} | {trade.symbol} | {trade.side} | {trade.quantity} | ${trade.price:.2f} |\n")
-                    if len(trades) > 50:
-                        f.write(f"| ... | ... | ... | ... | ... |\n")
-                        f.write(f"*({len(trades) - 50} more trades)*\n")
-                    f.write("\n")
+                # Also include data table
+                parts.append("### Data Points\n\n")
+                parts.append("| Timestamp | Portfolio Value |\n")
+                parts.append("|-----------|----------------|\n")
+                # Show first 10 and last 10 points
+                parts.extend(f"| {_format_timestamp(timestamps[i])} | ${values[i]:,.2f} |\n"
+                             for i in range(min(10, len(timestamps))))
+                if len(timestamps) > 20:
+                    parts.append("| ... | ... |\n")
+                parts.extend(f"| {_format_timestamp(timestamps[i])} | ${values[i]:,.2f} |\n"
+                             for i in range(max(10, len(timestamps) - 10), len(timestamps)))
+                parts.append("\n")
+            
+            # Add trade history if available
+            trades = performance_tracker.get_trade_history()
+            if trades:
+                parts.append("## Trade History\n\n")
+                parts.append("| Timestamp | Symbol | Side | Quantity | Price |\n")
+                parts.append("|-----------|--------|------|----------|-------|\n")
+                parts.extend(f"| {_format_timestamp(trade.timestamp)} | {trade.symbol} | {trade.side} | {trade.quantity} | ${trade.price:.2f} |\n"
+                             for trade in trades[:50])  # Limit to first 50 trades
+                if len(trades) > 50:
+                    parts.append(f"| ... | ... | ... | ... | ... |\n")
+                    parts.append(f"*({len(trades) - 50} more trades)*\n")
+                parts.append("\n")
+                parts.append(f"Full trade log: [{trade_log_path.name}]({trade_log_path.name})\n\n")
+            
+            report_path.write_text("".join(parts))
             
             logger.info(f"Performance report saved to: {report_path}")
         
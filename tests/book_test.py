@@ -0,0 +1,144 @@
+import pytest
+
+from trading_lib.book import OrderBook
+from trading_lib.exceptions import OrderError
+from trading_lib.models import Order, OrderStatus
+
+
+def buy(quantity, price):
+    return Order("AAPL", quantity, price, OrderStatus.PENDING)
+
+
+def sell(quantity, price):
+    return Order("AAPL", -quantity, price, OrderStatus.PENDING)
+
+
+def test_best_prices_and_spread():
+    book = OrderBook("AAPL")
+    book.add_order(buy(10, 100.0))
+    book.add_order(buy(20, 99.5))
+    book.add_order(sell(5, 101.0))
+    book.add_order(sell(5, 102.0))
+
+    assert book.get_best_bid() == 100.0
+    assert book.get_best_ask() == 101.0
+    assert book.get_spread() == 1.0
+    assert book.get_matchable_orders() is None
+
+
+def test_time_priority_within_level():
+    book = OrderBook("AAPL")
+    first = book.add_order(buy(10, 100.0))
+    second = book.add_order(buy(5, 100.0))
+    book.add_order(buy(7, 99.0))
+
+    assert book.remove_top_bid().order_id == first
+    assert book.remove_top_bid().order_id == second
+    assert book.get_best_bid() == 99.0
+
+
+def test_cancel_skips_order_and_empties_level():
+    book = OrderBook("AAPL")
+    top = book.add_order(buy(10, 101.0))
+    book.add_order(buy(20, 100.0))
+
+    assert book.cancel_order(top) is True
+    assert book.cancel_order(top) is False
+    assert book.get_best_bid() == 100.0
+    assert book.get_depth() == {'bids': [(100.0, 20)], 'asks': []}
+
+    # A new order at the emptied price starts a fresh level
+    book.add_order(buy(3, 101.0))
+    assert book.get_best_bid() == 101.0
+
+
+def test_depth_aggregates_levels():
+    book = OrderBook("AAPL")
+    book.add_order(buy(10, 100.0))
+    book.add_order(buy(5, 100.0))
+    book.add_order(buy(20, 99.5))
+    book.add_order(buy(1, 99.0))
+    book.add_order(sell(8, 100.5))
+    book.add_order(sell(5, 101.0))
+
+    assert book.get_depth(levels=2) == {
+        'bids': [(100.0, 15), (99.5, 20)],
+        'asks': [(100.5, 8), (101.0, 5)]
+    }
+
+
+def test_matchable_and_modify():
+    book = OrderBook("AAPL")
+    bid_id = book.add_order(buy(10, 100.0))
+    book.add_order(sell(8, 100.5))
+    assert book.get_matchable_orders() is None
+
+    assert book.modify_order(bid_id, new_price=101.0) is True
+    bid, ask = book.get_matchable_orders()
+    assert (bid.order.price, bid.order.quantity) == (101.0, 10)
+    assert (ask.order.price, ask.order.quantity) == (100.5, -8)
+    assert book.modify_order(bid_id, new_price=102.0) is False
+
+
+def test_prices_share_levels_by_tick():
+    book = OrderBook("AAPL", tick_size=0.05)
+    book.add_order(buy(10, 100.05))
+    book.add_order(buy(5, 100.049))  # rounds to the same tick
+    book.add_order(sell(3, 1.1))
+
+    assert book.get_depth()['bids'] == [(100.05, 15)]
+    assert book.get_best_ask() == 1.1
+    assert all(isinstance(key, int) for key in book._bid_keys + book._ask_keys)
+
+
+def test_depth_volumes_follow_cancels_and_removals():
+    book = OrderBook("AAPL")
+    first = book.add_order(buy(10, 100.0))
+    book.add_order(buy(5, 100.0))
+    book.add_order(buy(4, 99.0))
+    book.add_order(sell(6, 101.0))
+
+    book.cancel_order(first)
+    assert book.get_depth()['bids'] == [(100.0, 5), (99.0, 4)]
+
+    book.remove_top_bid()
+    book.remove_top_ask()
+    assert book.get_depth() == {'bids': [(99.0, 4)], 'asks': []}
+
+
+def test_sequence_gives_time_priority():
+    book = OrderBook("AAPL")
+    ids = [book.add_order(sell(1, 101.0)) for _ in range(3)]
+
+    removed = [book.remove_top_ask() for _ in range(3)]
+    assert [b.order_id for b in removed] == ids
+    assert [b.sequence for b in removed] == [0, 1, 2]
+    assert book.format_order_id(ids[1]) == "AAPL_1"
+
+
+def test_cancel_marks_order_canceled():
+    book = OrderBook("AAPL")
+    order = buy(10, 100.0)
+    order_id = book.add_order(order)
+
+    book.cancel_order(order_id)
+    assert order.status == OrderStatus.CANCELED
+    assert book.get_best_bid() is None
+
+    with pytest.raises(OrderError):
+        book.add_order(order)
+
+
+def test_departed_orders_cannot_be_cancelled_again():
+    book = OrderBook("AAPL")
+    filled = book.add_order(buy(10, 100.0))
+    cancelled = book.add_order(buy(5, 99.0))
+
+    assert book.remove_top_bid().order_id == filled
+    assert book.cancel_order(cancelled)
+
+    assert not book.cancel_order(filled)
+    assert not book.cancel_order(cancelled)
+    assert not book.modify_order(cancelled, new_price=98.0)
+    assert not book.cancel_order(99)
+    assert book.get_depth() == {'bids': [], 'asks': []}
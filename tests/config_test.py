@@ -0,0 +1,23 @@
+import json
+import os
+
+from trading_lib.config import load_config
+
+
+def test_load_config_picks_up_changes(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({
+        "gateway": {"mode": "simulation"},
+        "strategy": {"type": "rsi", "period": 14},
+        "initial_capital": 5000.0,
+    }))
+
+    first = load_config(str(config_path))
+    assert first.initial_capital == 5000.0
+    first.strategy["period"] = 99
+    assert load_config(str(config_path)).strategy["period"] == 14
+
+    config_path.write_text(json.dumps({"gateway": {"mode": "simulation"}, "initial_capital": 7500.0}))
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_config(str(config_path)).initial_capital == 7500.0
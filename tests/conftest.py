@@ -0,0 +1,38 @@
+import copy
+
+import pytest
+
+from trading_lib.gateway.simulation import SimulationGateway, load_market_data
+from trading_lib.matching_engine import MatchingEngine
+from trading_lib.portfolio import SimplePortfolio
+
+
+@pytest.fixture(scope="session")
+def aapl_market_data():
+    """AAPL_5d_1m.csv parsed once and shared by every test that needs it."""
+    return load_market_data("data/AAPL_5d_1m.csv")
+
+
+@pytest.fixture
+def make_gateway(aapl_market_data):
+    """Factory for SimulationGateways replaying the shared AAPL data.
+
+    Keyword arguments go to the MatchingEngine (e.g. cancel_rate).
+    """
+    def _make_gateway(**engine_kwargs):
+        return SimulationGateway.from_arrays(
+            aapl_market_data, matching_engine=MatchingEngine(**engine_kwargs)
+        )
+    return _make_gateway
+
+
+@pytest.fixture(scope="session")
+def portfolio_template():
+    """$10,000 portfolio with no holdings; never modified, only copied."""
+    return SimplePortfolio(cash=10000)
+
+
+@pytest.fixture
+def fresh_portfolio(portfolio_template):
+    """Factory returning independent copies of the $10,000 template portfolio."""
+    return lambda: copy.copy(portfolio_template)
@@ -1,10 +1,16 @@
+import os
+import time
+
 import pytest
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+from trading_lib import data_loader
 from trading_lib.data_loader import DataLoader
 from trading_lib.models import MarketDataPoint
+from trading_lib.strategies import MovingAverageStrategy
+from trading_lib.strategies.base import ACTION_CODES
 
 
 @pytest.fixture
@@ -26,6 +32,18 @@ def sample_csv(tmp_path):
     return csv_file
 
 
+@pytest.fixture
+def mixed_offset_csv(tmp_path):
+    """Create a CSV spanning a DST change, with mixed UTC offsets."""
+    csv_content = """Datetime,Open,High,Low,Close,Volume,Symbol
+2025-10-31 15:59:00-04:00,100.0,101.0,99.0,100.5,1000,AAPL
+2025-11-03 09:30:00-05:00,100.5,102.0,100.0,101.5,1500,AAPL"""
+    
+    csv_file = tmp_path / "mixed_offsets.csv"
+    csv_file.write_text(csv_content)
+    return csv_file
+
+
 def test_clean_data(loader):
     """Test data cleaning functionality."""
     # Create sample data with issues
@@ -61,6 +79,17 @@ def test_load_and_save_csv(loader, sample_csv):
     assert len(reloaded) == 3
 
 
+def test_load_csv_mixed_offsets(loader, mixed_offset_csv):
+    """Test loading a CSV whose rows straddle a DST change."""
+    data = loader.load_csv(mixed_offset_csv.name)
+    
+    assert data['Datetime'].tolist() == [
+        pd.Timestamp("2025-10-31 15:59:00-04:00"),
+        pd.Timestamp("2025-11-03 09:30:00-05:00"),
+    ]
+    assert loader.from_csv(mixed_offset_csv.name) == list(loader.stream_from_csv(mixed_offset_csv.name))
+
+
 def test_to_market_data_points(loader, sample_csv):
     """Test conversion to MarketDataPoint objects."""
     data = loader.load_csv(sample_csv.name)
@@ -83,6 +112,92 @@ def test_stream_from_csv(loader, sample_csv):
     assert count == 3
 
 
+def test_stream_from_csv_across_chunks(loader, sample_csv):
+    """Test chunked streaming yields the same points as loading everything."""
+    streamed = list(loader.stream_from_csv(sample_csv.name, chunksize=2))
+    
+    assert streamed == loader.from_csv(sample_csv.name)
+
+
+def test_stream_from_csv_mixed_offsets(loader, mixed_offset_csv):
+    """Test rows either side of a DST change keep their own UTC offsets."""
+    points = list(loader.stream_from_csv(mixed_offset_csv.name))
+    
+    assert [p.timestamp for p in points] == [
+        pd.Timestamp("2025-10-31 15:59:00-04:00"),
+        pd.Timestamp("2025-11-03 09:30:00-05:00"),
+    ]
+    assert points[0].timestamp.utcoffset() != points[1].timestamp.utcoffset()
+
+
+def test_stream_batches(loader, sample_csv):
+    """Test batched streaming yields the same ticks as stream_from_csv."""
+    batches = list(loader.stream_batches(sample_csv.name, chunksize=2))
+    
+    assert [len(prices) for prices, _, _ in batches] == [2, 1]
+    points = [
+        MarketDataPoint(timestamp=pd.Timestamp(ts), symbol=sym, price=float(px))
+        for prices, symbols, timestamps in batches
+        for px, sym, ts in zip(prices, symbols, timestamps)
+    ]
+    assert points == list(loader.stream_from_csv(sample_csv.name))
+
+
+def test_stream_batches_mixed_offsets(loader, mixed_offset_csv):
+    """Test batched streaming parses rows either side of a DST change."""
+    timestamps = [ts for _, _, batch_ts in loader.stream_batches(mixed_offset_csv.name) for ts in batch_ts]
+    
+    assert timestamps == [p.timestamp for p in loader.stream_from_csv(mixed_offset_csv.name)]
+
+
+def test_stream_batches_feed_generate_signals_batch():
+    """Test stream_batches output unpacks into generate_signals_batch."""
+    loader = DataLoader(data_dir="data")
+    per_tick = MovingAverageStrategy(short_window=5, long_window=20)
+    batched = MovingAverageStrategy(short_window=5, long_window=20)
+    
+    expected = [
+        ACTION_CODES[signals[0][3]] if signals else 0
+        for signals in map(per_tick.generate_signals, loader.stream_from_csv("AAPL_5d_1m.csv"))
+    ]
+    actions = [
+        action
+        for batch in loader.stream_batches("AAPL_5d_1m.csv", chunksize=500)
+        for action in batched.generate_signals_batch(*batch).tolist()
+    ]
+    
+    assert len(actions) == len(expected) > 0
+    assert any(expected)
+    assert actions == expected
+
+
+def test_download_data_uses_cache(loader, monkeypatch):
+    """Test that a second download within the cache age skips yfinance."""
+    calls = []
+    
+    def fake_download(tickers, period, interval, progress):
+        calls.append((tickers, period, interval))
+        return pd.DataFrame(
+            {'Close': [100.0, 101.0]},
+            index=pd.DatetimeIndex(['2025-01-01 10:00', '2025-01-01 10:01'], name='Datetime')
+        )
+    
+    monkeypatch.setattr(data_loader.yf, 'download', fake_download)
+    
+    first = loader.download_data("AAPL", period="1d", interval="1m")
+    second = loader.download_data("AAPL", period="1d", interval="1m")
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    
+    # Stale cache entries and use_cache=False go back to yfinance
+    cache_file = next(loader.data_dir.glob("AAPL_1d_1m.*"))
+    old = time.time() - data_loader.DOWNLOAD_CACHE_MAX_AGE.total_seconds() - 60
+    os.utime(cache_file, (old, old))
+    loader.download_data("AAPL", period="1d", interval="1m")
+    loader.download_data("AAPL", period="1d", interval="1m", use_cache=False)
+    assert len(calls) == 3
+
+
 def test_download_data_with_flattening(loader):
     """Test that MultiIndex columns are flattened properly."""
     # Create a mock DataFrame with MultiIndex columns
@@ -2,12 +2,17 @@ import pytest
 from unittest.mock import Mock, MagicMock
 
 from trading_lib.engine import TradingEngine
+from trading_lib.gateway.simulation import SimulationGateway
+from trading_lib.matching_engine import MatchingEngine
 from trading_lib.portfolio import SimplePortfolio
 from trading_lib.order_manager import OrderManager
-from trading_lib.models import Order, OrderStatus, MarketDataPoint
-from trading_lib.strategies import Strategy
+from trading_lib.models import Order, OrderStatus, MarketDataPoint, Action, RecordingInterval
+from trading_lib.performance import PerformanceTracker
+from trading_lib.strategies import Strategy, MovingAverageStrategy
 from datetime import datetime
 
+import numpy as np
+
 
 class MockStrategy(Strategy):
     """Mock strategy that doesn't generate signals."""
@@ -40,26 +45,40 @@ class MockGateway:
         pass  # Mock doesn't actually run
 
 
-def test_partial_fill_flow():
-    """Test the complete flow of a partial fill."""
+@pytest.fixture(scope="module")
+def shared_engine():
+    """One engine wired to a mock gateway, shared by the tests in this module."""
     portfolio = SimplePortfolio(cash=10000)
     order_manager = OrderManager(portfolio=portfolio)
     gateway = MockGateway()
-    strategy = MockStrategy()
-    
-    engine = TradingEngine(
+    TradingEngine(
         gateway=gateway,
-        strategy=strategy,
+        strategy=MockStrategy(),
         portfolio=portfolio,
         order_manager=order_manager
     )
+    return portfolio, order_manager, gateway
+
+
+@pytest.fixture
+def engine_parts(shared_engine):
+    """The shared engine's (portfolio, order_manager, gateway), reset to $10,000 and no orders."""
+    portfolio, order_manager, gateway = shared_engine
+    portfolio.reset(10000)
+    order_manager.reset()
+    return shared_engine
+
+
+def test_partial_fill_flow(engine_parts):
+    """Test the complete flow of a partial fill."""
+    portfolio, order_manager, gateway = engine_parts
     
     # Create an order
     order = Order("AAPL", 100, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
     
     # Record order in manager
     order_manager.record_order(order)
-    assert len(order_manager.get_active_orders()) == 1
+    assert order_manager.active_order_count == 1
     
     # Simulate first partial fill: 30 shares
     order.filled_quantity = 30
@@ -71,7 +90,7 @@ def test_partial_fill_flow():
     assert portfolio.cash == 7000  # 10000 - (30 * 100)
     
     # Order should still be active
-    assert len(order_manager.get_active_orders()) == 1
+    assert order_manager.active_order_count == 1
     assert order.status == OrderStatus.PARTIALLY_FILLED
     
     # Simulate second partial fill: 50 more shares (total 80)
@@ -83,7 +102,7 @@ def test_partial_fill_flow():
     assert portfolio.cash == 2000  # 10000 - (80 * 100)
     
     # Order still active
-    assert len(order_manager.get_active_orders()) == 1
+    assert order_manager.active_order_count == 1
     
     # Final fill: remaining 20 shares
     order.filled_quantity = 100
@@ -95,23 +114,13 @@ def test_partial_fill_flow():
     assert portfolio.cash == 0  # 10000 - (100 * 100)
     
     # Order should be removed from active orders
-    assert len(order_manager.get_active_orders()) == 0
+    assert order_manager.active_order_count == 0
     assert order.status == OrderStatus.FILLED
 
 
-def test_full_fill_immediately():
+def test_full_fill_immediately(engine_parts):
     """Test order that fills completely immediately."""
-    portfolio = SimplePortfolio(cash=10000)
-    order_manager = OrderManager(portfolio=portfolio)
-    gateway = MockGateway()
-    strategy = MockStrategy()
-    
-    engine = TradingEngine(
-        gateway=gateway,
-        strategy=strategy,
-        portfolio=portfolio,
-        order_manager=order_manager
-    )
+    portfolio, order_manager, gateway = engine_parts
     
     order = Order("AAPL", 50, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
     order_manager.record_order(order)
@@ -123,22 +132,13 @@ def test_full_fill_immediately():
     
     assert portfolio.get_holding("AAPL")["quantity"] == 50
     assert portfolio.cash == 5000
-    assert len(order_manager.get_active_orders()) == 0
+    assert order_manager.active_order_count == 0
 
 
-def test_multiple_orders_partial_fills():
+def test_multiple_orders_partial_fills(engine_parts):
     """Test multiple orders with partial fills."""
-    portfolio = SimplePortfolio(cash=20000)
-    order_manager = OrderManager(portfolio=portfolio)
-    gateway = MockGateway()
-    strategy = MockStrategy()
-    
-    engine = TradingEngine(
-        gateway=gateway,
-        strategy=strategy,
-        portfolio=portfolio,
-        order_manager=order_manager
-    )
+    portfolio, order_manager, gateway = engine_parts
+    portfolio.reset(20000)
     
     # Two orders
     order1 = Order("AAPL", 50, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
@@ -153,7 +153,7 @@ def test_multiple_orders_partial_fills():
     gateway._publish_order_update(order1)
     
     assert portfolio.get_holding("AAPL")["quantity"] == 25
-    assert len(order_manager.get_active_orders()) == 2
+    assert order_manager.active_order_count == 2
     
     # Fully fill order2
     order2.filled_quantity = 30
@@ -161,7 +161,7 @@ def test_multiple_orders_partial_fills():
     gateway._publish_order_update(order2)
     
     assert portfolio.get_holding("MSFT")["quantity"] == 30
-    assert len(order_manager.get_active_orders()) == 1  # order1 still active
+    assert order_manager.active_order_count == 1  # order1 still active
     
     # Complete order1
     order1.filled_quantity = 50
@@ -169,22 +169,12 @@ def test_multiple_orders_partial_fills():
     gateway._publish_order_update(order1)
     
     assert portfolio.get_holding("AAPL")["quantity"] == 50
-    assert len(order_manager.get_active_orders()) == 0
+    assert order_manager.active_order_count == 0
 
 
-def test_order_cancellation():
+def test_order_cancellation(engine_parts):
     """Test that canceled orders are removed from tracking."""
-    portfolio = SimplePortfolio(cash=10000)
-    order_manager = OrderManager(portfolio=portfolio)
-    gateway = MockGateway()
-    strategy = MockStrategy()
-    
-    engine = TradingEngine(
-        gateway=gateway,
-        strategy=strategy,
-        portfolio=portfolio,
-        order_manager=order_manager
-    )
+    portfolio, order_manager, gateway = engine_parts
     
     order = Order("AAPL", 100, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
     order_manager.record_order(order)
@@ -194,17 +184,161 @@ def test_order_cancellation():
     order.status = OrderStatus.PARTIALLY_FILLED
     gateway._publish_order_update(order)
     
-    assert len(order_manager.get_active_orders()) == 1
+    assert order_manager.active_order_count == 1
     
     # Cancel order
     order.status = OrderStatus.CANCELED
     gateway._publish_order_update(order)
     
-    assert len(order_manager.get_active_orders()) == 0
+    assert order_manager.active_order_count == 0
     # Portfolio should only have the 30 shares that were filled
     assert portfolio.get_holding("AAPL")["quantity"] == 30
 
 
+class PairStrategy(Strategy):
+    """Strategy that buys two symbols on every tick."""
+    def generate_signals(self, tick: MarketDataPoint):
+        return [
+            ("AAPL", 10, 100.0, Action.BUY),
+            ("MSFT", 10, 100.0, Action.BUY),
+        ]
+
+
+@pytest.mark.parametrize("quantity", [200, -10])
+def test_unaffordable_fill_is_skipped(engine_parts, quantity):
+    """Test that a fill the portfolio can't cover leaves it untouched."""
+    portfolio, order_manager, gateway = engine_parts
+    
+    order = Order("AAPL", quantity, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
+    order_manager.record_order(order)
+    order.filled_quantity = abs(quantity)
+    order.status = OrderStatus.FILLED
+    gateway._publish_order_update(order)
+    
+    assert portfolio.cash == 10000
+    assert portfolio.get_all_holdings() == {}
+    assert order_manager.active_order_count == 0
+
+
+class BatchRecordingGateway(MockGateway):
+    """Mock gateway that records each submit_orders batch."""
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+    
+    def submit_orders(self, orders):
+        self.batches.append(list(orders))
+        for order in orders:
+            self.submit_order(order)
+
+
+def test_tick_orders_submitted_together():
+    """Test that all orders from one tick go to the gateway in one batch."""
+    portfolio = SimplePortfolio(cash=10000)
+    order_manager = OrderManager(portfolio=portfolio)
+    gateway = BatchRecordingGateway()
+    
+    TradingEngine(
+        gateway=gateway,
+        strategy=PairStrategy(),
+        portfolio=portfolio,
+        order_manager=order_manager
+    )
+    
+    for callback in gateway._market_data_callbacks:
+        callback(MarketDataPoint(datetime(2025, 1, 1, 10, 0), "AAPL", 100.0))
+    
+    assert len(gateway.batches) == 1
+    assert [order.symbol for order in gateway.batches[0]] == ["AAPL", "MSFT"]
+    assert order_manager.active_order_count == 2
+
+
+def test_recording_interval_keeps_latest_value_per_period():
+    """Test that ticks in the same recording period share one equity curve point."""
+    portfolio = SimplePortfolio(cash=10000)
+    tracker = PerformanceTracker(initial_capital=10000)
+    gateway = MockGateway()
+    
+    engine = TradingEngine(
+        gateway=gateway,
+        strategy=MockStrategy(),
+        portfolio=portfolio,
+        order_manager=OrderManager(portfolio=portfolio),
+        performance_tracker=tracker,
+        recording_interval=RecordingInterval.MINUTE
+    )
+    
+    times = [datetime(2025, 1, 1, 10, 0, 0), datetime(2025, 1, 1, 10, 0, 30), datetime(2025, 1, 1, 10, 1, 0)]
+    for ts in times:
+        for callback in gateway._market_data_callbacks:
+            callback(MarketDataPoint(ts, "AAPL", 100.0))
+    
+    assert [t for t, _ in tracker.equity_curve] == times[1:]
+    assert engine._get_period(times[0]) == engine._get_period(times[1])
+    
+    engine.recording_interval = RecordingInterval.TICK
+    assert engine._get_period(times[0]) is None
+    
+    with pytest.raises(ValueError):
+        engine.recording_interval = "2m"
+
+
+@pytest.mark.parametrize("with_tracker,interval,cents,windows", [
+    (True, RecordingInterval.TICK, False, (5, 20)),
+    (True, RecordingInterval.MINUTE, False, (5, 20)),
+    (True, RecordingInterval.HOURLY, False, (5, 20)),
+    (False, RecordingInterval.TICK, False, (5, 20)),
+    (True, RecordingInterval.TICK, True, (3, 5)),
+    (False, RecordingInterval.TICK, True, (5, 20)),
+])
+def test_batch_mode_matches_per_tick(aapl_market_data, with_tracker, interval, cents, windows):
+    """Test that batch mode trades exactly like the per-tick engine, for any batch size."""
+    market_data = aapl_market_data
+    if cents:
+        # Rounded prices are where differently-summed MAs diverge
+        market_data = market_data._replace(prices=np.round(market_data.prices, 2))
+    results = []
+    for batch_size in (None, 1, 256, 1000):
+        # Enough cash that every signal becomes a trade
+        portfolio = SimplePortfolio(cash=1_000_000)
+        tracker = PerformanceTracker(initial_capital=1_000_000) if with_tracker else None
+        gateway = SimulationGateway.from_arrays(
+            market_data, matching_engine=MatchingEngine(rng=np.random.default_rng(7))
+        )
+        TradingEngine(
+            gateway=gateway,
+            strategy=MovingAverageStrategy(*windows, quantity=1),
+            portfolio=portfolio,
+            order_manager=OrderManager(portfolio=portfolio),
+            performance_tracker=tracker,
+            recording_interval=interval,
+            batch_size=batch_size
+        )
+        gateway.run()
+        results.append((portfolio.get_cash(), portfolio.get_all_holdings(), tracker and tracker.equity_curve))
+    
+    assert results[0][1]  # some trades happened
+    assert all(result == results[0] for result in results[1:])
+
+
+def test_fills_use_simulated_time(make_gateway, fresh_portfolio, aapl_market_data):
+    """Test that backtest trades are stamped with the tick time, not wall-clock time."""
+    portfolio = fresh_portfolio()
+    tracker = PerformanceTracker(initial_capital=10000)
+    gateway = make_gateway(cancel_rate=0, partial_fill_rate=0)
+    TradingEngine(
+        gateway=gateway,
+        strategy=MovingAverageStrategy(short_window=5, long_window=20, quantity=1),
+        portfolio=portfolio,
+        order_manager=OrderManager(portfolio=portfolio),
+        performance_tracker=tracker
+    )
+    gateway.run()
+    
+    tick_times = set(aapl_market_data.timestamps.tolist())
+    assert tracker.trades
+    assert all(trade.timestamp in tick_times for trade in tracker.trades)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
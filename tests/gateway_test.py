@@ -1,12 +1,17 @@
-from trading_lib.matching_engine import MatchingEngine
-from trading_lib.models import Order, OrderStatus
-from trading_lib.gateway.simulation import SimulationGateway
+import asyncio
+import csv
+import threading
+from datetime import datetime, timedelta
 
+from trading_lib.models import MarketDataPoint, Order, OrderStatus
+from trading_lib.gateway.base import QueuedSubscriber
+from trading_lib.gateway.simulation import SimulationGateway, load_market_data
+
+import pandas as pd
 import pytest
 
-def test_filling_order_with_id():
-    engine = MatchingEngine(cancel_rate = 0.0, partial_fill_rate = 0.0)
-    gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv", matching_engine = engine)
+def test_filling_order_with_id(make_gateway):
+    gateway = make_gateway(cancel_rate = 0.0, partial_fill_rate = 0.0)
     
     def assert_order_atrb(ord: Order):
         assert ord.id == "custom_id_123"
@@ -21,9 +26,8 @@ def test_filling_order_with_id():
 
     gateway.submit_order(order)
 
-def test_never_connected_gateway():
-    engine = MatchingEngine(cancel_rate = 0.0, partial_fill_rate = 0.0)
-    gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv", matching_engine = engine)
+def test_never_connected_gateway(make_gateway):
+    gateway = make_gateway(cancel_rate = 0.0, partial_fill_rate = 0.0)
     
     order = Order(symbol = "AAPL", quantity = 10, price = 150, status = OrderStatus.PENDING)
 
@@ -35,9 +39,8 @@ def test_never_connected_gateway():
     with pytest.raises(RuntimeError):
         gateway.submit_order(order)
 
-def test_gateway_connect_disconnect():
-    engine = MatchingEngine(cancel_rate = 0.0, partial_fill_rate = 0.0)
-    gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv", matching_engine = engine)
+def test_gateway_connect_disconnect(make_gateway):
+    gateway = make_gateway(cancel_rate = 0.0, partial_fill_rate = 0.0)
 
     order = Order(symbol = "AAPL", quantity = 10, price = 150, status = OrderStatus.PENDING)
     
@@ -54,4 +57,237 @@ def test_gateway_connect_disconnect():
     
     gateway.disconnect()
     with pytest.raises(RuntimeError):
-        gateway.submit_order(order)
\ No newline at end of file
+        gateway.submit_order(order)
+
+def test_from_arrays_matches_csv_stream():
+    csv_gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+    array_gateway = SimulationGateway.from_arrays(load_market_data("data/AAPL_5d_1m.csv"))
+
+    csv_ticks, array_ticks = [], []
+    csv_gateway.subscribe_market_data(csv_ticks.append)
+    array_gateway.subscribe_market_data(array_ticks.append)
+    csv_gateway.run()
+    array_gateway.run()
+
+    assert len(array_ticks) == len(csv_ticks) > 0
+    assert array_ticks == csv_ticks
+    assert type(array_ticks[0].price) is float
+    assert type(csv_ticks[0].timestamp) is type(array_ticks[0].timestamp) is pd.Timestamp
+
+@pytest.fixture
+def mixed_offset_csv(tmp_path):
+    """Two rows either side of a DST change, with different UTC offsets."""
+    path = tmp_path / "mixed_offsets.csv"
+    path.write_text(
+        "Datetime,Open,High,Low,Close,Volume,Symbol\n"
+        "2025-10-31 15:59:00-04:00,1,1,1,100.5,10,AAPL\n"
+        "2025-11-03 09:30:00-05:00,1,1,1,101.25,10,AAPL\n"
+    )
+    return path
+
+def test_load_market_data_mixed_offsets(mixed_offset_csv):
+    csv_gateway = SimulationGateway(csv_path = mixed_offset_csv)
+    array_gateway = SimulationGateway.from_arrays(load_market_data(mixed_offset_csv))
+
+    csv_ticks, array_ticks = [], []
+    csv_gateway.subscribe_market_data(csv_ticks.append)
+    array_gateway.subscribe_market_data(array_ticks.append)
+    csv_gateway.run()
+    array_gateway.run()
+
+    assert len(csv_ticks) == 2
+    assert array_ticks == csv_ticks
+    assert [t.timestamp.utcoffset() for t in array_ticks] == [timedelta(hours = -4), timedelta(hours = -5)]
+
+def test_run_async_matches_run():
+    sync_gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+    async_gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+
+    sync_ticks, async_ticks = [], []
+    sync_gateway.subscribe_market_data(sync_ticks.append)
+    async_gateway.subscribe_market_data(async_ticks.append)
+    sync_gateway.run()
+    asyncio.run(async_gateway.run_async())
+
+    assert len(async_ticks) == len(sync_ticks) > 0
+    assert async_ticks == sync_ticks
+
+def test_market_data_batches_cover_stream():
+    gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+    ticks, batches = [], []
+    gateway.subscribe_market_data(ticks.append)
+    gateway.subscribe_market_data_batch(batches.append, batch_size = 500)
+    gateway.run()
+
+    assert [len(b) for b in batches] == [500, 500, 500, len(ticks) - 1500]
+    prices = [p for b in batches for p in b['price']]
+    assert prices == [t.price for t in ticks]
+    assert batches[0]['symbol'][0] == ticks[0].symbol
+    assert batches[0]['timestamp'][0] == ticks[0].timestamp
+
+@pytest.mark.parametrize("from_arrays", [False, True])
+def test_batch_only_run_publishes_blocks(from_arrays):
+    ticks, batches = [], []
+    tick_gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+    tick_gateway.subscribe_market_data(ticks.append)
+    tick_gateway.run()
+
+    if from_arrays:
+        gateway = SimulationGateway.from_arrays(load_market_data("data/AAPL_5d_1m.csv"))
+    else:
+        gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+    gateway.subscribe_market_data_batch(batches.append, batch_size = 500)
+    gateway.run()
+
+    assert [len(b) for b in batches] == [500, 500, 500, len(ticks) - 1500]
+    rows = [row for b in batches for row in b.tolist()]
+    assert rows == [(t.timestamp, t.symbol, t.price) for t in ticks]
+
+@pytest.mark.parametrize("from_arrays", [False, True])
+def test_batch_run_mixed_offsets(mixed_offset_csv, from_arrays):
+    ticks, batches = [], []
+    tick_gateway = SimulationGateway(csv_path = mixed_offset_csv)
+    tick_gateway.subscribe_market_data(ticks.append)
+    tick_gateway.run()
+
+    if from_arrays:
+        gateway = SimulationGateway.from_arrays(load_market_data(mixed_offset_csv))
+    else:
+        gateway = SimulationGateway(csv_path = mixed_offset_csv)
+    gateway.subscribe_market_data_batch(batches.append, batch_size = 1)
+    gateway.run()
+
+    rows = [row for b in batches for row in b.tolist()]
+    assert len(rows) == 2
+    assert rows == [(t.timestamp, t.symbol, t.price) for t in ticks]
+
+def test_reset_replays_from_start():
+    gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+    first, second = [], []
+    gateway.subscribe_market_data(first.append)
+    gateway.run()
+    gateway.disconnect()
+
+    gateway.reset()
+    gateway.subscribe_market_data(second.append)
+    gateway.run()
+
+    assert second == first
+
+def test_nested_publish_is_queued(make_gateway):
+    gateway = make_gateway()
+    gateway.connect()
+    events = []
+
+    def on_tick(tick):
+        events.append("tick start")
+        gateway.submit_order(Order(tick.symbol, 1, tick.price, OrderStatus.PENDING))
+        events.append("tick end")
+
+    gateway.subscribe_market_data(on_tick)
+    gateway.subscribe_order_updates(lambda order: events.append("fill"))
+    gateway._publish_market_data(MarketDataPoint(datetime(2025, 1, 1), "AAPL", 100.0))
+
+    assert events == ["tick start", "tick end", "fill"]
+
+def test_later_subscribers_join_single_subscriber(make_gateway):
+    gateway = make_gateway()
+    first, second, batches = [], [], []
+    tick = MarketDataPoint(datetime(2025, 1, 1), "AAPL", 100.0)
+
+    gateway.subscribe_market_data(first.append)
+    gateway._publish_market_data(tick)
+    gateway.subscribe_market_data(second.append)
+    gateway.subscribe_market_data_batch(batches.append, batch_size = 1)
+    gateway._publish_market_data(tick)
+
+    assert first == [tick, tick]
+    assert second == [tick]
+    assert len(batches) == 1
+
+def test_queued_subscriber_drops_oldest():
+    started, release = threading.Event(), threading.Event()
+    seen = []
+
+    def slow(tick):
+        started.set()
+        release.wait()
+        seen.append(tick)
+
+    subscriber = QueuedSubscriber(slow, maxlen = 2)
+    subscriber(0)
+    assert started.wait(timeout = 2)  # the worker has taken event 0 off the queue
+    for tick in range(1, 5):
+        subscriber(tick)
+    release.set()
+
+    assert subscriber.join(timeout = 2)
+    assert seen == [0, 3, 4]
+    assert subscriber.dropped == 2
+    subscriber.close()
+
+
+def test_queued_market_data_delivered_by_end_of_run():
+    gateway = SimulationGateway(csv_path = "AAPL_5d_1m.csv")
+    sync_ticks, queued_ticks = [], []
+    gateway.subscribe_market_data(sync_ticks.append)
+    gateway.subscribe_market_data(queued_ticks.append, queue_size = 10_000)
+    gateway.run()
+
+    assert queued_ticks == sync_ticks
+    gateway.reset()
+
+def test_queued_order_updates_are_not_dropped(make_gateway):
+    gateway = make_gateway(cancel_rate = 0.0, partial_fill_rate = 0.0)
+    gateway.connect()
+    sync_ids, queued_ids = [], []
+    gateway.subscribe_order_updates(lambda order: sync_ids.append(order.id))
+    gateway.subscribe_order_updates(lambda order: queued_ids.append(order.id), queue_size = 1)
+
+    for _ in range(50):
+        gateway.submit_order(Order("AAPL", 1, 100.0, OrderStatus.PENDING))
+    gateway.wait_for_subscribers(timeout = 2)
+
+    assert len(sync_ids) == 50
+    assert queued_ids == sync_ids
+    gateway.reset()
+
+def test_audit_log_written_on_flush_and_disconnect(aapl_market_data, tmp_path):
+    path = tmp_path / "audit.csv"
+    gateway = SimulationGateway.from_arrays(aapl_market_data, audit_log_path = str(path))
+    gateway.connect()
+    order = Order("AAPL", 10, 150.0, OrderStatus.FILLED)
+
+    gateway.log_order_filled(order, fill_price = 150.0)
+    gateway.flush_audit_log()
+    assert len(path.read_text().splitlines()) == 2
+
+    gateway.log_order_filled(order, fill_price = 150.0)
+    gateway.disconnect()
+    assert len(path.read_text().splitlines()) == 3
+
+def test_audit_rows_match_csv_writer(aapl_market_data, tmp_path):
+    path = tmp_path / "audit.csv"
+    gateway = SimulationGateway.from_arrays(aapl_market_data, audit_log_path = str(path))
+    order = Order("AAPL", -10, 150.25, OrderStatus.CANCELED)
+
+    gateway.log_order_cancelled(order, order_id = "7", notes = "plain")
+    gateway.log_order_cancelled(order, order_id = "7", notes = 'needs "quoting", really')
+    gateway.disconnect()
+
+    with open(path, newline = '') as f:
+        rows = list(csv.reader(f))
+    assert [row[1:] for row in rows[1:]] == [
+        ["CANCELLED", "AAPL", "-10", "150.25", "7", "CANCELED", "plain"],
+        ["CANCELLED", "AAPL", "-10", "150.25", "7", "CANCELED", 'needs "quoting", really'],
+    ]
+    assert path.read_bytes().count(b"\r\n") == 3
+
+def test_audit_timestamp_is_current_isoformat(make_gateway):
+    gateway = make_gateway()
+    before = datetime.now()
+    stamps = [gateway._audit_timestamp() for _ in range(3)]
+    after = datetime.now()
+
+    parsed = [datetime.fromisoformat(stamp) for stamp in stamps]
+    assert before - timedelta(microseconds = 1) <= parsed[0] <= parsed[-1] <= after
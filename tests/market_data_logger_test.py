@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from trading_lib.market_data_logger import MarketDataLogger
+from trading_lib.models import MarketDataPoint
+
+
+def make_ticks(n, start=datetime(2025, 11, 17, 14, 30)):
+    return [MarketDataPoint(start + timedelta(minutes=i), "AAPL", 100.0 + i) for i in range(n)]
+
+
+def read_rows(path):
+    return path.read_text().splitlines()
+
+
+def test_ticks_buffered_until_batch_size(tmp_path):
+    logger = MarketDataLogger(data_dir=tmp_path, batch_size=3, commit_delay=3600)
+    ticks = make_ticks(4)
+    path = logger.get_filepath("AAPL", ticks[0].timestamp)
+
+    logger.log_ticks(ticks[:2])
+    assert len(read_rows(path)) <= 1  # header at most
+
+    logger.log_tick(ticks[2])
+    assert len(read_rows(path)) == 4
+
+    logger.log_tick(ticks[3])
+    logger.close_all()
+    rows = read_rows(path)
+    assert len(rows) == 5
+    assert rows[-1] == f"{ticks[3].timestamp.isoformat()},AAPL,103.0"
+
+
+def test_commit_delay_flushes(tmp_path):
+    logger = MarketDataLogger(data_dir=tmp_path, batch_size=1000, commit_delay=0.0)
+    tick = make_ticks(1)[0]
+
+    logger.log_tick(tick)
+    assert len(read_rows(logger.get_filepath("AAPL", tick.timestamp))) == 2
+
+
+def test_rotation_flushes_previous_day(tmp_path):
+    logger = MarketDataLogger(data_dir=tmp_path, batch_size=1000, commit_delay=3600)
+    day1 = make_ticks(2)
+    day2 = make_ticks(1, start=datetime(2025, 11, 18, 14, 30))
+
+    logger.log_ticks(day1 + day2)
+    assert len(read_rows(logger.get_filepath("AAPL", day1[0].timestamp))) == 3
+
+    logger.close_all()
+    assert len(read_rows(logger.get_filepath("AAPL", day2[0].timestamp))) == 2
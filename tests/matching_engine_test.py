@@ -1,60 +1,111 @@
+import math
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pytest
+
 from trading_lib.matching_engine import MatchingEngine
+from trading_lib.matching_engine.matching_engine import RANDOM_BATCH_SIZE
 from trading_lib.models import Order, OrderStatus
 
-def test_filling_order_with_id():
-    engine = MatchingEngine(cancel_rate=0.0, partial_fill_rate=0.0)
-    order = Order(symbol="AAPL", quantity=10, price=150, status=OrderStatus.PENDING, id="custom_id_123")
+@pytest.mark.parametrize("cancel_rate,partial_fill_rate,quantity,order_id,expected_status,expected_fill", [
+    (0.0, 0.0, 10, "custom_id_123", OrderStatus.FILLED, 10),
+    (0.0, 0.0, 10, None, OrderStatus.FILLED, 10),
+    (0.0, 0.0, 15, None, OrderStatus.FILLED, 15),
+    (0.0, 1.0, 9, None, OrderStatus.PARTIALLY_FILLED, 3),  # Force partial fill: 1/3 of 9 is 3
+    (1.0, 0.0, 10, None, OrderStatus.CANCELED, 0),  # Force cancel
+], ids=["filled_with_id", "filled_without_id", "filled_15", "partially_filled", "cancelled"])
+def test_order_outcome(cancel_rate, partial_fill_rate, quantity, order_id, expected_status, expected_fill):
+    engine = MatchingEngine(cancel_rate=cancel_rate, partial_fill_rate=partial_fill_rate)
+    order = Order(symbol="AAPL", quantity=quantity, price=150, status=OrderStatus.PENDING, id=order_id)
+    updates = []
     
     def assert_order_atrb(ord: Order):
-        assert ord.id == "custom_id_123"
-        assert ord.status == OrderStatus.FILLED
-        assert ord.filled_quantity == 10
+        if order_id is not None:
+            assert ord.id == order_id
+        else:
+            assert ord.id is not None
+        assert ord.status == expected_status
+        assert ord.filled_quantity == expected_fill
     
-    engine.subscribe_order_updates(assert_order_atrb)
+    engine.subscribe_order_updates(updates.append)
     
     processed_order = engine.process_order(order)
     assert_order_atrb(processed_order)
+    assert len(updates) == 1
+    assert_order_atrb(updates[0])
+
 
-def test_filling_order_without_id():
+def test_concurrent_producers_single_consumer():
+    """Orders from several producer threads all reach one consumer, in per-producer order."""
+    producers, orders_per_producer, quantity = 4, 500, 10
+    total = producers * orders_per_producer
     engine = MatchingEngine(cancel_rate=0.0, partial_fill_rate=0.0)
-    order = Order(symbol="AAPL", quantity=10, price=150, status=OrderStatus.PENDING)
+    ring = deque()  # appends from producers, pops from the consumer
+    engine.subscribe_order_updates(ring.append)
+    received = []
 
-    def assert_order_atrb(ord: Order):
-        assert ord.id is not None
-        assert ord.status == OrderStatus.FILLED
-        assert ord.filled_quantity == 10
-    
-    engine.subscribe_order_updates(assert_order_atrb)
-    
-    assert order.id is None
+    def produce(p: int):
+        for k in range(orders_per_producer):
+            engine.process_order(Order(symbol="AAPL", quantity=quantity, price=150, status=OrderStatus.PENDING,
+                                       client_order_id=f"p{p}-{k}"))
 
-    processed_order = engine.process_order(order)
-    assert_order_atrb(processed_order)
+    def consume():
+        while len(received) < total:
+            try:
+                received.append(ring.popleft())
+            except IndexError:
+                time.sleep(0)
 
-def test_partially_filled_order():
-    engine = MatchingEngine(cancel_rate=0.0, partial_fill_rate=1.0)  # Force partial fill
-    order = Order(symbol="AAPL", quantity=9, price=150, status=OrderStatus.PENDING)
-    
-    def assert_order_atrb(ord: Order):
-        assert ord.id is not None
-        assert ord.status == OrderStatus.PARTIALLY_FILLED
-        assert ord.filled_quantity == 3  # 1/3 of 9 is 3
-    
-    engine.subscribe_order_updates(assert_order_atrb)
-    
-    processed_order = engine.process_order(order)
-    assert_order_atrb(processed_order)
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # interleave the producers as much as possible
+    try:
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        consumer.join(timeout=10)
+    finally:
+        sys.setswitchinterval(switch_interval)
 
-def test_cancelled_order():
-    engine = MatchingEngine(cancel_rate=1.0, partial_fill_rate=0.0)  # Force cancel
-    order = Order(symbol="AAPL", quantity=10, price=150, status=OrderStatus.PENDING)
-    
-    def assert_order_atrb(ord: Order):
-        assert ord.id is not None
-        assert ord.status == OrderStatus.CANCELED
-        assert ord.filled_quantity == 0
-    
-    engine.subscribe_order_updates(assert_order_atrb)
-    
-    processed_order = engine.process_order(order)
-    assert_order_atrb(processed_order)
\ No newline at end of file
+    assert len(received) == total
+    assert sum(order.filled_quantity for order in received) == total * quantity
+    assert len({order.id for order in received}) == total
+    for p in range(producers):
+        sequence = [order.client_order_id for order in received if order.client_order_id.startswith(f"p{p}-")]
+        assert sequence == [f"p{p}-{k}" for k in range(orders_per_producer)]
+
+
+class CountingGenerator:
+    """Wraps a numpy Generator and counts calls to random()."""
+
+    def __init__(self, seed: int):
+        self._rng = np.random.default_rng(seed)
+        self.calls = 0
+
+    def random(self, size=None):
+        self.calls += 1
+        return self._rng.random(size)
+
+
+def test_rng_batching():
+    n = 3000
+    rng = CountingGenerator(seed=7)
+    engine = MatchingEngine(cancel_rate=0.2, partial_fill_rate=0.3, rng=rng)
+    statuses = [engine.process_order(Order("AAPL", 9, 150, OrderStatus.PENDING)).status for _ in range(n)]
+
+    assert rng.calls <= math.ceil(n / RANDOM_BATCH_SIZE)
+
+    # Same seed, same draws, same outcomes as deciding each order from the raw stream
+    draws = np.random.default_rng(7).random(math.ceil(n / RANDOM_BATCH_SIZE) * RANDOM_BATCH_SIZE)[:n]
+    expected = [
+        OrderStatus.CANCELED if u < 0.2 else OrderStatus.PARTIALLY_FILLED if u < 0.5 else OrderStatus.FILLED
+        for u in draws.tolist()
+    ]
+    assert statuses == expected
@@ -0,0 +1,42 @@
+import copy
+
+import pytest
+
+from trading_lib.models import Order, OrderStatus
+
+
+def test_order_has_no_instance_dict():
+    order = Order("AAPL", 10, 150.0, OrderStatus.PENDING)
+    with pytest.raises(AttributeError):
+        order.unknown_field = 1
+
+
+def test_acquire_reuses_released_order():
+    order = Order.acquire("AAPL", 10, 150.0, OrderStatus.PENDING, id="a", filled_quantity=5)
+    order.release()
+
+    reused = Order.acquire("MSFT", -3, 99.5, OrderStatus.PENDING)
+    assert reused is order
+    assert (reused.symbol, reused.quantity, reused.price, reused.id, reused.filled_quantity) == ("MSFT", -3, 99.5, None, 0)
+
+
+def test_copy_keeps_slots():
+    order = Order("AAPL", 10, 150.0, OrderStatus.ACTIVE, id="x", filled_quantity=4)
+    clone = copy.copy(order)
+    assert clone is not order
+    assert (clone.symbol, clone.quantity, clone.status, clone.id, clone.filled_quantity) == ("AAPL", 10, OrderStatus.ACTIVE, "x", 4)
+
+
+def test_client_order_id_is_unique_and_survives_copy():
+    first = Order("AAPL", 10, 150.0, OrderStatus.PENDING)
+    second = Order("AAPL", 10, 150.0, OrderStatus.PENDING)
+    assert first.client_order_id != second.client_order_id
+    assert isinstance(first.client_order_id, int)
+    assert copy.copy(first).client_order_id == first.client_order_id
+    assert Order("AAPL", 1, 1.0, OrderStatus.PENDING, client_order_id="mine").client_order_id == "mine"
+
+
+def test_side_follows_quantity_sign():
+    assert Order("AAPL", 10, 150.0, OrderStatus.PENDING).side == 1
+    assert Order("AAPL", -10, 150.0, OrderStatus.PENDING).side == -1
+    assert Order.acquire("AAPL", -3, 150.0, OrderStatus.PENDING).side == -1
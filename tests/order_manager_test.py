@@ -1,3 +1,6 @@
+import gc
+import time
+
 import pytest
 from datetime import datetime, timedelta
 
@@ -6,9 +9,9 @@ from trading_lib.portfolio import SimplePortfolio
 from trading_lib.models import Order, OrderStatus
 
 
-def test_order_tracking():
+def test_order_tracking(fresh_portfolio):
     """Test that orders are tracked when recorded."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     om = OrderManager(portfolio=portfolio)
     
     order = Order("AAPL", 10, 100.0, OrderStatus.PENDING, filled_quantity=0)
@@ -16,12 +19,12 @@ def test_order_tracking():
     
     active_orders = om.get_active_orders()
     assert len(active_orders) == 1
-    assert id(order) in active_orders
+    assert order.client_order_id in active_orders
 
 
-def test_partial_fill_tracking():
+def test_partial_fill_tracking(fresh_portfolio):
     """Test that partial fills are tracked correctly."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     om = OrderManager(portfolio=portfolio)
     
     order = Order("AAPL", 100, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
@@ -53,12 +56,12 @@ def test_partial_fill_tracking():
     
     # Order should be removed from active orders
     active_orders = om.get_active_orders()
-    assert id(order) not in active_orders
+    assert order.client_order_id not in active_orders
 
 
-def test_full_fill_immediately():
+def test_full_fill_immediately(fresh_portfolio):
     """Test order that fills completely on first update."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     om = OrderManager(portfolio=portfolio)
     
     order = Order("AAPL", 50, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
@@ -73,12 +76,12 @@ def test_full_fill_immediately():
     
     # Order should be removed
     active_orders = om.get_active_orders()
-    assert id(order) not in active_orders
+    assert order.client_order_id not in active_orders
 
 
-def test_order_removal():
+def test_order_removal(fresh_portfolio):
     """Test that orders can be manually removed."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     om = OrderManager(portfolio=portfolio)
     
     order1 = Order("AAPL", 10, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
@@ -87,13 +90,13 @@ def test_order_removal():
     om.record_order(order1)
     om.record_order(order2)
     
-    assert len(om.get_active_orders()) == 2
+    assert om.active_order_count == 2
     
     om.remove_order(order1)
     active_orders = om.get_active_orders()
     assert len(active_orders) == 1
-    assert id(order2) in active_orders
-    assert id(order1) not in active_orders
+    assert order2.client_order_id in active_orders
+    assert order1.client_order_id not in active_orders
 
 
 def test_multiple_orders_same_symbol():
@@ -107,7 +110,7 @@ def test_multiple_orders_same_symbol():
     om.record_order(order1)
     om.record_order(order2)
     
-    assert len(om.get_active_orders()) == 2
+    assert om.active_order_count == 2
     
     # Partially fill first order
     new_fill_qty, remaining_qty = om.update_order_fill(order1, filled_quantity=5)
@@ -117,12 +120,12 @@ def test_multiple_orders_same_symbol():
     
     # Second order still active
     assert order2.status == OrderStatus.ACTIVE
-    assert len(om.get_active_orders()) == 2
+    assert om.active_order_count == 2
 
 
-def test_sell_order_tracking():
+def test_sell_order_tracking(fresh_portfolio):
     """Test tracking sell orders (negative quantity)."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     portfolio.add_to_holding("AAPL", 100, 100.0)
     om = OrderManager(portfolio=portfolio)
     
@@ -141,9 +144,9 @@ def test_sell_order_tracking():
     assert order.remaining_quantity == 20
 
 
-def test_no_fill_update():
+def test_no_fill_update(fresh_portfolio):
     """Test that updating with same filled_quantity doesn't change anything."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     om = OrderManager(portfolio=portfolio)
     
     order = Order("AAPL", 100, 100.0, OrderStatus.ACTIVE, filled_quantity=0)
@@ -161,9 +164,9 @@ def test_no_fill_update():
     assert order.status == OrderStatus.PARTIALLY_FILLED
 
 
-def test_order_validation_with_tracking():
+def test_order_validation_with_tracking(fresh_portfolio):
     """Test that order validation works with tracking."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     om = OrderManager(
         portfolio=portfolio,
         max_order_value=5000,
@@ -202,9 +205,9 @@ def test_rate_limiting():
     assert "Rate limit" in reason
 
 
-def test_position_tracking():
+def test_position_tracking(fresh_portfolio):
     """Test that position values are tracked correctly."""
-    portfolio = SimplePortfolio(cash=10000)
+    portfolio = fresh_portfolio()
     om = OrderManager(portfolio=portfolio, max_position_size=5000)
     
     # First order
@@ -218,6 +221,75 @@ def test_position_tracking():
     assert om.get_position_value("AAPL") == 3000.0  # 10*100 + 20*100
 
 
+def test_reset(fresh_portfolio):
+    """Test that reset clears rate limit, position and active order state."""
+    portfolio = fresh_portfolio()
+    om = OrderManager(portfolio=portfolio, max_orders_per_minute=1)
+    
+    om.record_order(Order("AAPL", 10, 100.0, OrderStatus.PENDING, filled_quantity=0))
+    om.reset()
+    
+    assert om.get_active_orders() == {}
+    assert om.get_position_value("AAPL") == 0.0
+    valid, _ = om.validate_order(Order("AAPL", 10, 100.0, OrderStatus.PENDING, filled_quantity=0))
+    assert valid is True
+
+
+def test_active_key_is_client_order_id(fresh_portfolio):
+    """Test that active orders are keyed by client_order_id and survive garbage collection."""
+    portfolio = fresh_portfolio()
+    om = OrderManager(portfolio=portfolio)
+    
+    order = Order("AAPL", 10, 100.0, OrderStatus.PENDING, filled_quantity=0, client_order_id="my-order-1")
+    om.record_order(order)
+    del order
+    gc.collect()
+    
+    # A new order reusing the freed memory must not collide with the tracked one
+    other = Order("AAPL", 5, 100.0, OrderStatus.PENDING, filled_quantity=0)
+    om.record_order(other)
+    
+    active_orders = om.get_active_orders()
+    assert set(active_orders) == {"my-order-1", other.client_order_id}
+    assert active_orders["my-order-1"].quantity == 10
+
+
+def _record_and_remove_ns(portfolio, n):
+    """Per-order ns to record, then remove, n active orders."""
+    om = OrderManager(portfolio=portfolio, max_orders_per_minute=n)
+    orders = [Order("AAPL", 1, 100.0, OrderStatus.PENDING, filled_quantity=0) for _ in range(n)]
+    
+    start = time.perf_counter_ns()
+    for order in orders:
+        om.record_order(order)
+    record_ns = time.perf_counter_ns() - start
+    
+    assert om.active_order_count == n
+    assert len(om.get_active_orders()) == n
+    
+    start = time.perf_counter_ns()
+    for order in orders:
+        om.remove_order(order)
+    remove_ns = time.perf_counter_ns() - start
+    
+    assert om.active_order_count == 0
+    return record_ns / n, remove_ns / n
+
+
+def test_large_order_set_is_o1(fresh_portfolio):
+    """Test that recording and removing stay O(1) per order with 100k active orders.
+    
+    Compares per-order cost at 10k and 100k orders rather than wall-clock
+    limits: a list scan would make it ~10x worse at 100k, constant-time
+    bookkeeping keeps it flat (the bound leaves room for timing noise).
+    """
+    small = [min(times) for times in zip(*(_record_and_remove_ns(fresh_portfolio(), 10_000) for _ in range(3)))]
+    large = _record_and_remove_ns(fresh_portfolio(), 100_000)
+    
+    assert large[0] < 4 * small[0]
+    assert large[1] < 4 * small[1]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from datetime import datetime
 
@@ -49,6 +50,23 @@ def test_position_tracking():
     assert pos.avg_entry_price == 155.0  # Average doesn't change on sell
 
 
+def test_total_cost_basis_many_positions():
+    """Test the vectorized cost basis over 1k open positions."""
+    tracker = PerformanceTracker(initial_capital=100000.0)
+    rng = np.random.default_rng(0)
+    quantities = rng.integers(1, 100, 1000)
+    prices = rng.uniform(10, 500, 1000)
+    
+    for i, (quantity, price) in enumerate(zip(quantities.tolist(), prices.tolist())):
+        tracker.record_trade(Order(f"SYM{i}", quantity, price, OrderStatus.FILLED, filled_quantity=quantity))
+    # Add to one position so its average moves
+    tracker.record_trade(Order("SYM0", 10, 1.0, OrderStatus.FILLED, filled_quantity=10))
+    
+    expected = sum(pos.quantity * pos.avg_entry_price for pos in tracker.positions.values())
+    assert tracker.total_cost_basis() == pytest.approx(expected, rel=1e-12)
+    assert PerformanceTracker(initial_capital=1.0).total_cost_basis() == 0.0
+
+
 def test_position_closing():
     """Test that closing a position records P&L."""
     tracker = PerformanceTracker(initial_capital=100000.0)
@@ -159,6 +177,33 @@ def test_drawdown_calculation():
     assert max_dd_pct == pytest.approx(13.64, abs=0.1)  # 15k / 110k * 100
 
 
+def test_drawdown_vectorized_large():
+    """Test drawdown on a 100k-point equity curve against a plain-Python reference."""
+    tracker = PerformanceTracker(initial_capital=100000.0)
+    rng = np.random.default_rng(42)
+    values = rng.normal(0.0, 100.0, 100_000).cumsum() + 1e5
+    
+    from trading_lib.portfolio import SimplePortfolio
+    portfolio = SimplePortfolio(cash=100000.0)
+    start = datetime(2024, 1, 1)
+    for value in values.tolist():
+        portfolio.cash = value
+        tracker.record_portfolio_value(portfolio, start)
+    
+    peak = tracker.initial_capital
+    expected_dd = expected_pct = 0.0
+    for value in values.tolist():
+        peak = max(peak, value)
+        if peak - value > expected_dd:
+            expected_dd = peak - value
+            expected_pct = expected_dd / peak * 100
+    
+    max_dd, max_dd_pct = tracker._calculate_drawdown()
+    assert max_dd == pytest.approx(expected_dd, abs=1e-9)
+    assert max_dd_pct == pytest.approx(expected_pct, abs=1e-9)
+    assert max_dd == pytest.approx((np.maximum.accumulate(np.maximum(values, 1e5)) - values).max())
+
+
 def test_multiple_symbols():
     """Test tracking multiple symbols."""
     tracker = PerformanceTracker(initial_capital=100000.0)
@@ -193,6 +238,39 @@ def test_reset():
     assert tracker.current_capital == 100000.0
 
 
+def test_reset_with_new_capital():
+    """Test reset can change the starting capital for the next run."""
+    tracker = PerformanceTracker(initial_capital=100000.0)
+    trades = tracker.trades
+    
+    tracker.record_trade(Order("AAPL", 10, 150.0, OrderStatus.FILLED, filled_quantity=10))
+    tracker.reset(initial_capital=50000.0)
+    
+    assert tracker.trades is trades
+    assert tracker.initial_capital == 50000.0
+    assert tracker.current_capital == 50000.0
+
+
+def test_trade_log(tmp_path):
+    """Test trades are streamed to the CSV trade log."""
+    tracker = PerformanceTracker(initial_capital=100000.0)
+    log_path = tmp_path / "trades.csv"
+    tracker.open_trade_log(log_path, flush_every=1)
+    
+    tracker.record_trade(Order("AAPL", 10, 150.0, OrderStatus.FILLED, filled_quantity=10), datetime(2025, 1, 1, 10, 0))
+    
+    # Flushed before the log is closed
+    assert log_path.read_text().splitlines() == [
+        "timestamp,symbol,side,quantity,price",
+        "2025-01-01T10:00:00,AAPL,buy,10,150.0",
+    ]
+    
+    tracker.record_trade(Order("AAPL", -10, 155.0, OrderStatus.FILLED, filled_quantity=10), datetime(2025, 1, 1, 10, 5))
+    tracker.close_trade_log()
+    
+    assert log_path.read_text().splitlines()[-1] == "2025-01-01T10:05:00,AAPL,sell,-10,155.0"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -1,6 +1,10 @@
+import copy
+
+import numpy as np
 import pytest
 
 from trading_lib.portfolio import SimplePortfolio
+from trading_lib.portfolio.base import FILL_OK, FILL_INSUFFICIENT_CASH, FILL_INSUFFICIENT_HOLDINGS
 from trading_lib.models import Order, OrderStatus
 from trading_lib.exceptions import OrderError
 
@@ -17,8 +21,8 @@ def test_update_cash():
     with pytest.raises(ValueError):
         portfolio.update_cash(-10000)
 
-def test_add_to_holding():
-    portfolio = SimplePortfolio(cash=10000)
+def test_add_to_holding(fresh_portfolio):
+    portfolio = fresh_portfolio()
     
     portfolio.add_to_holding("AAPL", 10, 150)
     assert portfolio.get_holding("AAPL") == {"quantity": 10, "avg_price": 150.0}
@@ -62,8 +66,8 @@ def test_zero_out_holding():
     portfolio.add_to_holding("MSFT", -10, 150)
     assert portfolio.get_holding("MSFT") == {"quantity": 0, "avg_price": 0.0}
 
-def test_apply_order():
-    portfolio = SimplePortfolio(holdings={}, cash=10000)
+def test_apply_order(fresh_portfolio):
+    portfolio = fresh_portfolio()
 
     portfolio.apply_order(Order("AAPL", 10, 150, OrderStatus.FILLED))
     assert portfolio.cash == 8500
@@ -86,15 +90,79 @@ def test_apply_order():
     #     portfolio.apply_order(over_sell_order)
 
 
-def test_apply_invalid_order():
-    portfolio = SimplePortfolio(cash=10000)
+@pytest.mark.parametrize("k", [100, 10_000])
+@pytest.mark.parametrize("sides", ["buy", "mixed"])
+def test_apply_order_random_stream(k, sides):
+    rng = np.random.default_rng(0)
+    quantities = rng.integers(1, 10, k)
+    if sides == "mixed":
+        quantities = np.where(rng.random(k) < 0.3, -quantities, quantities)
+    prices = rng.uniform(100, 200, k)
+    cash0, held0 = 1e9, 10 * k  # enough cash and shares that no order is rejected
+    portfolio = SimplePortfolio(cash=cash0)
+    portfolio.add_to_holding("AAPL", held0, 150.0)
+
+    for quantity, price in zip(quantities.tolist(), prices.tolist()):
+        portfolio.apply_order(Order("AAPL", quantity, price, OrderStatus.FILLED))
+
+    holding = portfolio.get_holding("AAPL")
+    assert portfolio.cash == pytest.approx(cash0 - np.dot(quantities, prices), rel=1e-12)
+    assert holding["quantity"] == held0 + quantities.sum()
+    if sides == "buy":
+        expected_avg = (150.0 * held0 + np.dot(quantities, prices)) / (held0 + quantities.sum())
+        assert holding["avg_price"] == pytest.approx(expected_avg, rel=1e-12)
+
+
+def test_apply_orders_batch_matches_scalar():
+    rng = np.random.default_rng(1)
+    quantities = rng.integers(1, 10, 1000)
+    prices = rng.integers(100, 200, 1000).astype(np.float64)
+
+    scalar = SimplePortfolio(cash=1e7)
+    scalar.add_to_holding("AAPL", 5, 120.0)
+    batch = copy.copy(scalar)
+    for quantity, price in zip(quantities.tolist(), prices.tolist()):
+        scalar.apply_order(Order("AAPL", quantity, price, OrderStatus.FILLED))
+    batch.apply_orders_batch("AAPL", quantities, prices)
+
+    # Integer quantities and prices: cash and quantity are exact either way
+    assert batch.cash == scalar.cash
+    assert batch.get_holding("AAPL")["quantity"] == scalar.get_holding("AAPL")["quantity"]
+    assert batch.get_holding("AAPL")["avg_price"] == pytest.approx(scalar.get_holding("AAPL")["avg_price"], rel=1e-12)
+
+    # Sells fall back to per-order application; an unaffordable buy batch changes nothing
+    batch.apply_orders_batch("AAPL", [-5, 3], [150.0, 100.0])
+    assert batch.get_holding("AAPL")["quantity"] == scalar.get_holding("AAPL")["quantity"] - 2
+    with pytest.raises(ValueError):
+        batch.apply_orders_batch("MSFT", [10**6], [1e6])
+    assert batch.get_holding("MSFT") == {"quantity": 0, "avg_price": 0.0}
+
+def test_apply_fill(fresh_portfolio):
+    portfolio = fresh_portfolio()
+
+    portfolio.apply_fill("AAPL", 10, 150)
+    portfolio.apply_fill("AAPL", -4, 200)
+    assert portfolio.cash == 9300
+    assert portfolio.get_holding("AAPL") == {"quantity": 6, "avg_price": 150.0}
+
+def test_check_fill():
+    portfolio = SimplePortfolio(cash=1000, holdings={"AAPL": {"quantity": 5, "avg_price": 100.0}})
+
+    assert portfolio.check_fill("AAPL", 10, 100) == FILL_OK
+    assert portfolio.check_fill("AAPL", 11, 100) == FILL_INSUFFICIENT_CASH
+    assert portfolio.check_fill("AAPL", -5, 100) == FILL_OK
+    assert portfolio.check_fill("AAPL", -6, 100) == FILL_INSUFFICIENT_HOLDINGS
+    assert portfolio.check_fill("MSFT", -1, 100) == FILL_INSUFFICIENT_HOLDINGS
+
+def test_apply_invalid_order(fresh_portfolio):
+    portfolio = fresh_portfolio()
     with pytest.raises(OrderError):
         pending_order = Order("AAPL", 5, 180, OrderStatus.PENDING)
         portfolio.apply_order(pending_order)
 
 
-def test_sell_quantity_exceeds_holding():
-    portfolio = SimplePortfolio(holdings={}, cash=10000)
+def test_sell_quantity_exceeds_holding(fresh_portfolio):
+    portfolio = fresh_portfolio()
     
     portfolio.apply_order(Order("AAPL", 10, 150, OrderStatus.FILLED))
     assert portfolio.cash == 8500
@@ -103,11 +171,38 @@ def test_sell_quantity_exceeds_holding():
         portfolio.apply_order(Order("AAPL", -15, 150, OrderStatus.FILLED))
 
 
-def test_sell_missing_holding():
-    portfolio = SimplePortfolio(holdings={}, cash=10000)
+def test_sell_missing_holding(fresh_portfolio):
+    portfolio = fresh_portfolio()
     with pytest.raises(OrderError):
         portfolio.apply_order(Order("AAPL", -5, 150, OrderStatus.FILLED))
 
 
+def test_reset(fresh_portfolio):
+    portfolio = fresh_portfolio()
+    portfolio.add_to_holding("AAPL", 10, 150)
+
+    portfolio.reset(5000)
+    assert portfolio.cash == 5000
+    assert portfolio.get_all_holdings() == {}
+
+
+def test_copy_has_independent_holdings(fresh_portfolio):
+    template = fresh_portfolio()
+    template.add_to_holding("AAPL", 10, 150)
+
+    clone = copy.copy(template)
+    clone.add_to_holding("AAPL", 10, 170)
+    clone.update_cash(-1700)
+
+    assert template.cash == 10000
+    assert template.get_holding("AAPL") == {"quantity": 10, "avg_price": 150}
+    assert clone.get_holding("AAPL") == {"quantity": 20, "avg_price": 160}
+
+    first, second = fresh_portfolio(), fresh_portfolio()
+    first.add_to_holding("MSFT", 1, 300)
+    assert second.get_all_holdings() == {}
+    assert second.cash == 10000
+
+
 if __name__ == "__main__":
     test_insufficient_holding()
\ No newline at end of file
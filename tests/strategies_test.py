@@ -1,55 +1,22 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from trading_lib.strategies import MovingAverageStrategy
+import numpy as np
+import pytest
+
+from trading_lib.strategies import MovingAverageStrategy, indicators
 from trading_lib.models import Action, MarketDataPoint
 
 def test_moving_avg_crossover():
-    strategy = MovingAverageStrategy(
-        short_window=3, long_window=5, quantity=10
+    prices = np.array([100, 101, 102, 106, 108, 110], dtype=np.float64)
+    timestamps = np.arange(
+        np.datetime64("2025-09-21T19:54:01"), np.datetime64("2025-09-21T19:54:07"), dtype="datetime64[s]"
     )
+    symbols = np.full(len(prices), "AAPL", dtype=object)
+
+    strategy = MovingAverageStrategy(short_window=3, long_window=5, quantity=10)
     ticks = [
-        MarketDataPoint(
-            timestamp=datetime(
-                year=2025, month=9, day=21, hour=19, minute=54, second=1
-            ),
-            symbol="AAPL",
-            price=100,
-        ),
-        MarketDataPoint(
-            timestamp=datetime(
-                year=2025, month=9, day=21, hour=19, minute=54, second=2
-            ),
-            symbol="AAPL",
-            price=101,
-        ),
-        MarketDataPoint(
-            timestamp=datetime(
-                year=2025, month=9, day=21, hour=19, minute=54, second=3
-            ),
-            symbol="AAPL",
-            price=102,
-        ),
-        MarketDataPoint(
-            timestamp=datetime(
-                year=2025, month=9, day=21, hour=19, minute=54, second=4
-            ),
-            symbol="AAPL",
-            price=106,
-        ),
-        MarketDataPoint(
-            timestamp=datetime(
-                year=2025, month=9, day=21, hour=19, minute=54, second=5
-            ),
-            symbol="AAPL",
-            price=108,
-        ),
-        MarketDataPoint(
-            timestamp=datetime(
-                year=2025, month=9, day=21, hour=19, minute=54, second=6
-            ),
-            symbol="AAPL",
-            price=110,
-        )
+        MarketDataPoint(timestamp=timestamp, symbol="AAPL", price=price)
+        for timestamp, price in zip(timestamps.tolist(), prices.tolist())
     ]
     signals = []
     for tick in ticks:
@@ -58,33 +25,84 @@ def test_moving_avg_crossover():
     assert len(signals) == 1
     assert signals[0] == ("AAPL", 10, 110, Action.BUY) 
 
+    # The array path gives the same signal without building tick objects
+    batch_strategy = MovingAverageStrategy(short_window=3, long_window=5, quantity=10)
+    actions = batch_strategy.generate_signals_batch(prices, symbols, timestamps)
+    assert actions.tolist() == [0, 0, 0, 0, 0, 1]
+
 def test_moving_avg_generate_buy():
     # Use smaller windows for testing
-        strategy = MovingAverageStrategy(short_window=3, long_window=5, quantity=100)
-        
-        # Create price data that will generate a buy signal
-        # Start with declining prices, then rising prices to create MA crossover
-        ticks = []
-        base_time = datetime(2025, 1, 1, 10, 0, 0)
-        
-        # First 5 prices: declining trend (long MA will be higher)
-        prices = [100, 99, 98, 97, 96]
-        for i, price in enumerate(prices):
-            ticks.append(MarketDataPoint(timestamp=base_time + timedelta(seconds=i), symbol="AAPL", price=price))
-        
-        # Next 3 prices: rising trend (short MA will catch up and cross above long MA)
-        prices = [97, 98, 99]
-        for i, price in enumerate(prices):
-            ticks.append(MarketDataPoint(timestamp=base_time + timedelta(seconds=i+5), symbol="AAPL", price=price))
-        
-        # Add a few more prices to ensure we have enough for MA calculation
-        prices = [100, 101, 102]
-        for i, price in enumerate(prices):
-            ticks.append(MarketDataPoint(timestamp=base_time + timedelta(seconds=i+8), symbol="AAPL", price=price))
-        
-        signals = []
-        for tick in ticks:
-            signals.extend(strategy.generate_signals(tick))
-        
-        assert len(signals) == 1
-        assert signals[0] == ("AAPL", 100, 100, Action.BUY)
\ No newline at end of file
+    strategy = MovingAverageStrategy(short_window=3, long_window=5, quantity=100)
+    
+    # Declining prices first (long MA higher), then rising prices so the
+    # short MA crosses above the long MA
+    prices = [100, 99, 98, 97, 96] + [97, 98, 99] + [100, 101, 102]
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    ticks = [
+        MarketDataPoint(base_time.replace(second=i), "AAPL", price)
+        for i, price in enumerate(prices)
+    ]
+    
+    signals = []
+    for tick in ticks:
+        signals.extend(strategy.generate_signals(tick))
+    
+    assert len(signals) == 1
+    assert signals[0] == ("AAPL", 100, 100, Action.BUY)
+
+def test_macd_matches_prefix_recomputation():
+    prices = [100 + ((i * 7) % 11) - 0.5 * (i % 3) for i in range(60)]
+    fast, slow, signal = 12, 26, 9
+
+    macd_values = [
+        indicators.ema(prices[:i + 1], fast) - indicators.ema(prices[:i + 1], slow)
+        for i in range(slow, len(prices))
+    ]
+    expected = (
+        indicators.ema(prices, fast) - indicators.ema(prices, slow),
+        indicators.ema(macd_values, signal),
+    )
+
+    assert indicators.macd(prices, fast, slow, signal) == expected
+    assert indicators.macd(prices[:slow], fast, slow, signal) == (0.0, 0.0)
+
+def _per_tick_actions(strategy, prices):
+    tick_time = datetime(2025, 1, 1)
+    return [
+        1 if strategy.generate_signals(MarketDataPoint(tick_time, "AAPL", price)) else 0
+        for price in prices.tolist()
+    ]
+
+def _batch_actions(strategy, prices, batch_size):
+    symbols = np.full(len(prices), "AAPL", dtype=object)
+    return np.concatenate([
+        strategy.generate_signals_batch(prices[i:i + batch_size], symbols[i:i + batch_size])
+        for i in range(0, len(prices), batch_size)
+    ]).tolist()
+
+@pytest.mark.parametrize("windows", [(3, 5), (5, 20)])
+def test_moving_avg_batch_matches_per_tick(windows):
+    # Cent-rounded prices make cumulative-sum shortcuts round differently
+    walk = np.round(100 + np.random.default_rng(0).normal(0, 0.05, 5000).cumsum(), 2)
+    flat = np.full(100, 100.1)
+    for prices in (walk, flat):
+        expected = _per_tick_actions(MovingAverageStrategy(*windows), prices)
+        for batch_size in (1, 7, 256, len(prices)):
+            assert _batch_actions(MovingAverageStrategy(*windows), prices, batch_size) == expected
+    assert sum(_per_tick_actions(MovingAverageStrategy(*windows), walk)) > 0
+
+@pytest.mark.skipif(not indicators.SEQUENTIAL_FLOAT_SUM, reason="sum() of floats is compensated from Python 3.12")
+def test_ma_crossover_kernel_matches_per_tick(monkeypatch):
+    prices = np.round(100 + np.random.default_rng(3).normal(0, 0.05, 2000).cumsum(), 2)
+    expected = _per_tick_actions(MovingAverageStrategy(short_window=5, long_window=20), prices)
+
+    # The (uncompiled) kernel, and the strategy with it plugged in, fed in
+    # two batches so history carries over
+    flags, state = indicators.ma_crossover(prices, 0, 5, 20, False)
+    assert flags.tolist() == expected
+
+    monkeypatch.setattr(indicators, "ma_crossover_jit", indicators.ma_crossover)
+    kernel_strategy = MovingAverageStrategy(short_window=5, long_window=20)
+    assert _batch_actions(kernel_strategy, prices, 700) == expected
+    assert state == kernel_strategy._prev_short_gt_long["AAPL"]
+    assert sum(expected) > 0
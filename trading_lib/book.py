@@ -1,95 +1,121 @@
 """Order Book implementation with price-time priority matching."""
 
 import heapq
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict
-from datetime import datetime
+from array import array
+from collections import deque
+from typing import Optional, List, Dict, Deque, NamedTuple
 
+from trading_lib.exceptions import OrderError
 from trading_lib.models import Order, OrderStatus
 
 
-@dataclass(order=True)
-class BookOrder:
-    """Order wrapper for heap operations with price-time priority.
+class BookOrder(NamedTuple):
+    """An order resting in the book.
     
-    For buy orders: Higher price = higher priority (max heap via negation)
-    For sell orders: Lower price = higher priority (min heap)
-    Time is secondary: Earlier timestamp = higher priority
+    Built from the book's slot arrays when an order is handed out.
+    priority_ticks is the level key: the price in integer ticks, negated for
+    buy orders (so the best bid sorts first). sequence is the book's arrival
+    counter, used for time priority; order_id is the same number, as issued by
+    add_order. Tuples compare field by field, so book orders order by price,
+    then arrival.
     """
     
-    # Fields for comparison (used by heap)
-    priority_price: float = field(compare=True)
-    timestamp: datetime = field(compare=True)
-    
-    # Data fields (not used for comparison)
-    order: Order = field(compare=False)
-    order_id: str = field(compare=False)
+    priority_ticks: int
+    sequence: int
+    order_id: int
+    order: Order
+
+
+# Slot states in OrderBook._slot_status
+SLOT_LIVE = 0
+SLOT_CANCELED = 1
+SLOT_REMOVED = 2
 
 
 class OrderBook:
-    """Order book with price-time priority matching using heaps.
+    """Order book with price-time priority matching using price levels.
     
     Architecture:
-    - Buy orders (bids): Max heap (via negative prices)
-    - Sell orders (asks): Min heap
-    - Price-time priority: Price first, then timestamp
-    - O(log n) insertion, O(log n) matching
+    - Every order added gets a slot (its arrival sequence); per-slot level key,
+      quantity and state live in parallel arrays rather than per-order objects
+    - Each side maps a level key to a FIFO deque of slots (time priority)
+    - A heap of each side's level keys gives the best price (bids negated)
+    - Prices are integer ticks internally; prices within half a tick share a level
+    - Cancels are lazy: cancel_order flips the slot's state byte and the slot is
+      skipped when it reaches the front of its level
+    - Resting volume per level is kept up to date, so depth never scans orders
+    - O(1) insertion at an existing price, O(log L) for a new level (L = levels)
     """
     
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, tick_size: float = 0.01):
         self.symbol = symbol
+        self.tick_size = tick_size
+        self._ticks_per_unit = 1 / tick_size
+        
+        # Per-slot data, indexed by arrival sequence
+        self._slot_keys = array('q')  # Level key (ticks, negated for bids)
+        self._slot_qtys = array('q')  # Signed quantity
+        self._slot_status = bytearray()  # SLOT_* state
+        self._slot_orders: List[Optional[Order]] = []  # Released once the slot leaves the book
         
-        # Heaps for efficient matching
-        self._bids: List[BookOrder] = []  # Max heap (negative prices)
-        self._asks: List[BookOrder] = []  # Min heap
+        # Price levels: level key -> slots at that price, oldest first
+        self._bids: Dict[int, Deque[int]] = {}  # Keyed by negative ticks
+        self._asks: Dict[int, Deque[int]] = {}
         
-        # Order tracking for modify/cancel
-        self._orders: Dict[str, BookOrder] = {}
-        self._cancelled_ids: set = set()  # Lazy deletion
+        # Heaps of the level keys above, best first
+        self._bid_keys: List[int] = []
+        self._ask_keys: List[int] = []
+        
+        # Live resting quantity per level key (levels with none are removed)
+        self._bid_vol: Dict[int, int] = {}
+        self._ask_vol: Dict[int, int] = {}
         
         # Stats
         self.total_orders = 0
     
-    def add_order(self, order: Order) -> str:
+    def add_order(self, order: Order) -> int:
         """Add order to book.
         
         Args:
             order: Order to add (quantity > 0 = buy, quantity < 0 = sell)
         
         Returns:
-            order_id for tracking
+            order_id for tracking (an int; see format_order_id for the string form)
+        
+        Raises:
+            OrderError: If the order is already canceled
         """
-        # Generate order ID
-        order_id = f"{self.symbol}_{self.total_orders}"
-        self.total_orders += 1
+        if order.status == OrderStatus.CANCELED:
+            raise OrderError(order, "Cannot add a canceled order to the book")
         
-        # Create book order with priority
-        timestamp = datetime.now()
+        # The arrival sequence is both the slot and the time priority
+        slot = self.total_orders
+        self.total_orders += 1
         
         if order.quantity > 0:  # Buy order
-            # Use negative price for max heap behavior
-            book_order = BookOrder(
-                priority_price=-order.price,  # Negate for max heap
-                timestamp=timestamp,
-                order=order,
-                order_id=order_id
-            )
-            heapq.heappush(self._bids, book_order)
+            levels, keys, volumes, key = self._bids, self._bid_keys, self._bid_vol, -self._to_ticks(order.price)  # Negate for max-first
         else:  # Sell order
-            book_order = BookOrder(
-                priority_price=order.price,  # Positive for min heap
-                timestamp=timestamp,
-                order=order,
-                order_id=order_id
-            )
-            heapq.heappush(self._asks, book_order)
+            levels, keys, volumes, key = self._asks, self._ask_keys, self._ask_vol, self._to_ticks(order.price)
+        
+        self._slot_keys.append(key)
+        self._slot_qtys.append(order.quantity)
+        self._slot_status.append(SLOT_LIVE)
+        self._slot_orders.append(order)
         
-        # Track for modify/cancel
-        self._orders[order_id] = book_order
+        level = levels.get(key)
+        if level is None:
+            level = levels[key] = deque()
+            heapq.heappush(keys, key)
+        level.append(slot)
+        volumes[key] = volumes.get(key, 0) + abs(order.quantity)
         
-        return order_id
+        return slot
+    
+    def format_order_id(self, order_id: int) -> str:
+        """String form of an order id for logs and external APIs, e.g. 'AAPL_3'."""
+        return f"{self.symbol}_{order_id}"
     
-    def cancel_order(self, order_id: str) -> bool:
+    def cancel_order(self, order_id: int) -> bool:
         """Cancel an order (lazy deletion).
         
         Args:
@@ -98,16 +124,20 @@ class OrderBook:
         Returns:
             True if cancelled, False if not found
         """
-        if order_id not in self._orders:
+        slot = self._live_slot(order_id)
+        if slot is None:
             return False
         
-        # Mark as cancelled (lazy deletion - removed during matching)
-        self._cancelled_ids.add(order_id)
-        del self._orders[order_id]
+        # The slot itself is dropped from its level when it reaches the front
+        self._slot_status[slot] = SLOT_CANCELED
+        order = self._slot_orders[slot]
+        self._slot_orders[slot] = None
+        order.status = OrderStatus.CANCELED
+        self._reduce_volume(slot)
         
         return True
     
-    def modify_order(self, order_id: str, new_price: float = None, new_quantity: int = None) -> bool:
+    def modify_order(self, order_id: int, new_price: float = None, new_quantity: int = None) -> bool:
         """Modify an existing order.
         
         Implementation: Cancel old, add new (maintains price-time priority)
@@ -120,12 +150,12 @@ class OrderBook:
         Returns:
             True if modified, False if not found
         """
-        if order_id not in self._orders:
+        slot = self._live_slot(order_id)
+        if slot is None:
             return False
         
         # Get old order
-        old_book_order = self._orders[order_id]
-        old_order = old_book_order.order
+        old_order = self._slot_orders[slot]
         
         # Cancel old order
         self.cancel_order(order_id)
@@ -138,7 +168,7 @@ class OrderBook:
             status=OrderStatus.PENDING
         )
         
-        # Add new order (gets new timestamp - loses time priority)
+        # Add new order (gets new sequence - loses time priority)
         self.add_order(new_order)
         
         return True
@@ -149,55 +179,41 @@ class OrderBook:
         Returns:
             (best_bid_book_order, best_ask_book_order) if matchable, else None
         """
-        # Clean tops
-        self._clean_top(self._bids)
-        self._clean_top(self._asks)
+        best_bid = self._top(self._bids, self._bid_keys)
+        best_ask = self._top(self._asks, self._ask_keys)
         
-        if not self._bids or not self._asks:
+        if best_bid is None or best_ask is None:
             return None
         
-        best_bid = self._bids[0]
-        best_ask = self._asks[0]
-        
         # Check if they can match
-        bid_price = -best_bid.priority_price
-        ask_price = best_ask.priority_price
+        bid_ticks = -self._slot_keys[best_bid]
+        ask_ticks = self._slot_keys[best_ask]
         
-        if bid_price >= ask_price:
-            return (best_bid, best_ask)
+        if bid_ticks >= ask_ticks:
+            return (self._book_order(best_bid), self._book_order(best_ask))
         
         return None
     
     def remove_top_bid(self) -> Optional[BookOrder]:
         """Remove and return the best bid."""
-        self._clean_top(self._bids)
-        if self._bids:
-            book_order = heapq.heappop(self._bids)
-            self._orders.pop(book_order.order_id, None)
-            return book_order
-        return None
+        return self._remove_top(self._bids, self._bid_keys)
     
     def remove_top_ask(self) -> Optional[BookOrder]:
         """Remove and return the best ask."""
-        self._clean_top(self._asks)
-        if self._asks:
-            book_order = heapq.heappop(self._asks)
-            self._orders.pop(book_order.order_id, None)
-            return book_order
-        return None
+        return self._remove_top(self._asks, self._ask_keys)
     
     def get_best_bid(self) -> Optional[float]:
         """Get best bid price (highest buy price)."""
-        self._clean_top(self._bids)
-        if self._bids:
-            return -self._bids[0].priority_price  # Convert from negative
+        best = self._top(self._bids, self._bid_keys)
+        if best is not None:
+            return self._to_price(-self._slot_keys[best])  # Convert from negative
         return None
     
     def get_best_ask(self) -> Optional[float]:
         """Get best ask price (lowest sell price)."""
-        self._clean_top(self._asks)
-        if self._asks:
-            return self._asks[0].priority_price
+        best = self._top(self._asks, self._ask_keys)
+        if best is not None:
+            return self._to_price(self._slot_keys[best])
         return None
     
     def get_spread(self) -> Optional[float]:
@@ -208,10 +224,57 @@ class OrderBook:
             return ask - bid
         return None
     
-    def _clean_top(self, heap: List[BookOrder]):
-        """Remove cancelled orders from top of heap (lazy deletion cleanup)."""
-        while heap and heap[0].order_id in self._cancelled_ids:
-            heapq.heappop(heap)
+    def _to_ticks(self, price: float) -> int:
+        """Price -> nearest whole number of ticks."""
+        return round(price * self._ticks_per_unit)
+    
+    def _to_price(self, ticks: int) -> float:
+        """Whole number of ticks -> price."""
+        return ticks / self._ticks_per_unit
+    
+    def _live_slot(self, order_id: int) -> Optional[int]:
+        """Slot for an order id this book issued, if that order is still resting."""
+        if 0 <= order_id < self.total_orders and self._slot_status[order_id] == SLOT_LIVE:
+            return order_id
+        return None
+    
+    def _book_order(self, slot: int) -> BookOrder:
+        return BookOrder(self._slot_keys[slot], slot, slot, self._slot_orders[slot])
+    
+    def _top(self, levels: Dict[int, Deque[int]], keys: List[int]) -> Optional[int]:
+        """Slot of the best live order on one side, dropping cancelled slots and empty levels on the way."""
+        status = self._slot_status
+        while keys:
+            level = levels[keys[0]]
+            while level:
+                if status[level[0]] == SLOT_LIVE:
+                    return level[0]
+                level.popleft()
+            del levels[heapq.heappop(keys)]
+        return None
+    
+    def _remove_top(self, levels: Dict[int, Deque[int]], keys: List[int]) -> Optional[BookOrder]:
+        """Remove and return the best live order on one side."""
+        slot = self._top(levels, keys)
+        if slot is None:
+            return None
+        book_order = self._book_order(slot)
+        levels[book_order.priority_ticks].popleft()
+        self._slot_status[slot] = SLOT_REMOVED
+        self._slot_orders[slot] = None
+        self._reduce_volume(slot)
+        return book_order
+    
+    def _reduce_volume(self, slot: int):
+        """Take a departing slot's quantity off its level's volume."""
+        quantity = self._slot_qtys[slot]
+        volumes = self._bid_vol if quantity > 0 else self._ask_vol
+        key = self._slot_keys[slot]
+        remaining = volumes[key] - abs(quantity)
+        if remaining:
+            volumes[key] = remaining
+        else:
+            del volumes[key]
     
     def get_depth(self, levels: int = 5) -> dict:
         """Get order book depth.
@@ -222,27 +285,11 @@ class OrderBook:
         Returns:
             Dict with bids and asks at each price level
         """
-        # Aggregate orders by price level
-        bid_levels = {}
-        ask_levels = {}
-        
-        for book_order in self._bids:
-            if book_order.order_id not in self._cancelled_ids:
-                price = -book_order.priority_price
-                bid_levels[price] = bid_levels.get(price, 0) + book_order.order.quantity
-        
-        for book_order in self._asks:
-            if book_order.order_id not in self._cancelled_ids:
-                price = book_order.priority_price
-                ask_levels[price] = ask_levels.get(price, 0) + abs(book_order.order.quantity)
-        
-        # Get top N levels
-        top_bids = sorted(bid_levels.items(), reverse=True)[:levels]
-        top_asks = sorted(ask_levels.items())[:levels]
-        
+        # Volumes are maintained per level, so this only selects the best
+        # `levels` keys (partial selection, not a sort of every level)
         return {
-            'bids': top_bids,
-            'asks': top_asks
+            'bids': [(self._to_price(-key), qty) for key, qty in heapq.nsmallest(levels, self._bid_vol.items())],
+            'asks': [(self._to_price(key), qty) for key, qty in heapq.nsmallest(levels, self._ask_vol.items())]
         }
     
     def __repr__(self):
@@ -277,7 +324,7 @@ if __name__ == "__main__":
     matchable = book1.get_matchable_orders()
     if matchable:
         bid, ask = matchable
-        print(f"\nMatchable: Bid ${-bid.priority_price:.2f} >= Ask ${ask.priority_price:.2f}")
+        print(f"\nMatchable: Bid ${bid.order.price:.2f} >= Ask ${ask.order.price:.2f}")
     else:
         print(f"\nNot matchable: Bid ${book1.get_best_bid():.2f} < Ask ${book1.get_best_ask():.2f}")
     
@@ -297,8 +344,8 @@ if __name__ == "__main__":
     matchable = book2.get_matchable_orders()
     if matchable:
         bid, ask = matchable
-        bid_price = -bid.priority_price
-        ask_price = ask.priority_price
+        bid_price = bid.order.price
+        ask_price = ask.order.price
         print(f"\nMatchable: Bid ${bid_price:.2f} >= Ask ${ask_price:.2f}")
         print(f"Best bid: {bid.order.quantity} @ ${bid.order.price:.2f}")
         print(f"Best ask: {abs(ask.order.quantity)} @ ${ask.order.price:.2f}")
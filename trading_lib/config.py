@@ -1,6 +1,8 @@
 """Configuration management for the trading system."""
 
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
@@ -8,6 +10,11 @@ from enum import Enum
 from dotenv import load_dotenv
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional: faster JSON parsing
+
 load_dotenv()
 
 
@@ -53,6 +60,13 @@ class TradingConfig:
     max_order_value: Optional[float] = None
 
 
+@lru_cache(maxsize=16)
+def _read_config_json(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a config file; cached on path and file stat so edits are picked up."""
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 def load_config(config_path: str) -> TradingConfig:
     """Load configuration from JSON file.
     
@@ -76,8 +90,9 @@ def load_config(config_path: str) -> TradingConfig:
     if not config_file.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    with open(config_file, 'r') as f:
-        data = json.load(f)
+    stat = config_file.stat()
+    # Copy so callers can't mutate the cached parse
+    data = copy.deepcopy(_read_config_json(str(config_file.resolve()), stat.st_mtime_ns, stat.st_size))
     
     alpaca_key = os.getenv('ALPACA_API_KEY')
     alpaca_secret = os.getenv('ALPACA_API_SECRET')
@@ -1,15 +1,37 @@
 """Simple data loader for downloading and preparing market data."""
 
-import csv
+from importlib.util import find_spec
 from pathlib import Path
-from datetime import datetime
-from typing import List
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
 
 import pandas as pd
 import yfinance as yf
 
 from trading_lib.models import MarketDataPoint
 
+# Arrow's multi-threaded CSV parser when pyarrow is installed, else pandas' C parser
+CSV_ENGINE = "pyarrow" if find_spec("pyarrow") is not None else "c"
+
+# Downloads are cached as zstd Parquet when pyarrow is installed, else pickled
+DOWNLOAD_CACHE_SUFFIX = ".parquet" if find_spec("pyarrow") is not None else ".pkl"
+
+# Cached downloads older than this are fetched again
+DOWNLOAD_CACHE_MAX_AGE = timedelta(days=1)
+
+
+def _parse_timestamps(values: pd.Series) -> pd.Series:
+    """pd.to_datetime of a Datetime column, parsed row by row when it mixes UTC offsets.
+    
+    Downloads spanning a DST change have both -04:00 and -05:00 rows,
+    which pd.to_datetime rejects; each row then keeps its own offset.
+    """
+    try:
+        return pd.to_datetime(values)
+    except ValueError:
+        return values.map(pd.Timestamp)
+
 
 class DataLoader:
     """Download, clean, and load market data."""
@@ -18,8 +40,20 @@ class DataLoader:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
     
-    def download_data(self, ticker: str, period: str = "7d", interval: str = "1m") -> pd.DataFrame:
-        """Download equity data from yfinance."""
+    def download_data(self, ticker: str, period: str = "7d", interval: str = "1m",
+                      use_cache: bool = True) -> pd.DataFrame:
+        """Download equity data from yfinance.
+        
+        Results are cached in data_dir per (ticker, period, interval) and
+        reused for DOWNLOAD_CACHE_MAX_AGE, so repeated runs skip the network.
+        """
+        cache_path = self.data_dir / f"{ticker}_{period}_{interval}{DOWNLOAD_CACHE_SUFFIX}"
+        if use_cache:
+            cached = self._read_download_cache(cache_path)
+            if cached is not None:
+                print(f"Loaded {ticker} data from cache ({len(cached)} rows)")
+                return cached
+        
         print(f"Downloading {ticker} data...")
         data = yf.download(tickers=ticker, period=period, interval=interval, progress=False)
         
@@ -34,8 +68,29 @@ class DataLoader:
         
         data['Symbol'] = ticker
         print(f"Downloaded {len(data)} rows")
+        if use_cache:
+            self._write_download_cache(data, cache_path)
         return data
     
+    def _read_download_cache(self, path: Path) -> Optional[pd.DataFrame]:
+        """Return a cached download if it exists and is fresh, else None."""
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if age > DOWNLOAD_CACHE_MAX_AGE.total_seconds():
+            return None
+        if path.suffix == '.parquet':
+            return pd.read_parquet(path, engine='pyarrow')
+        return pd.read_pickle(path)
+    
+    def _write_download_cache(self, data: pd.DataFrame, path: Path):
+        """Store a download for _read_download_cache."""
+        if path.suffix == '.parquet':
+            data.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+        else:
+            data.to_pickle(path)
+    
     def clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Remove missing values, duplicates, and sort by time."""
         df = data.copy()
@@ -60,39 +115,57 @@ class DataLoader:
         print(f"Saved to {filepath}")
     
     def load_csv(self, filename: str) -> pd.DataFrame:
-        """Load DataFrame from CSV."""
+        """Load DataFrame from CSV, parsing Datetime while reading."""
         filepath = self.data_dir / filename
-        df = pd.read_csv(filepath)
-        df['Datetime'] = pd.to_datetime(df['Datetime'])
+        df = pd.read_csv(filepath, engine=CSV_ENGINE, parse_dates=['Datetime'])
+        if not pd.api.types.is_datetime64_any_dtype(df['Datetime']):
+            # e.g. mixed UTC offsets, which the inline parser leaves as strings
+            df['Datetime'] = _parse_timestamps(df['Datetime'])
         return df
     
     def to_market_data_points(self, data: pd.DataFrame) -> List[MarketDataPoint]:
         """Convert DataFrame to MarketDataPoint objects (loads all into memory)."""
-        points = []
-        for _, row in data.iterrows():
-            points.append(MarketDataPoint(
-                timestamp=row['Datetime'],
-                symbol=row['Symbol'],
-                price=row['Close']
-            ))
-        return points
+        return list(map(MarketDataPoint, data['Datetime'].tolist(), data['Symbol'].tolist(), data['Close'].tolist()))
     
     def from_csv(self, filename: str) -> List[MarketDataPoint]:
         """Load CSV and convert to MarketDataPoint list (all in memory)."""
         data = self.load_csv(filename)
         return self.to_market_data_points(data)
     
-    def stream_from_csv(self, filename: str):
-        """Stream MarketDataPoint objects line-by-line from CSV without loading into memory."""
-        filepath = self.data_dir / filename
+    def _read_chunks(self, filename: str, chunksize: int):
+        """Chunked reader over the Datetime, Symbol and Close columns."""
+        return pd.read_csv(
+            self.data_dir / filename,
+            usecols=['Datetime', 'Symbol', 'Close'],
+            dtype={'Close': 'float64'},
+            float_precision='round_trip',  # same values as float() on the raw text
+            chunksize=chunksize
+        )
+    
+    def stream_from_csv(self, filename: str, chunksize: int = 10_000):
+        """Stream MarketDataPoint objects from CSV without loading it all into memory.
+        
+        The file is parsed ``chunksize`` rows at a time.
+        """
+        with self._read_chunks(filename, chunksize) as reader:
+            for chunk in reader:
+                timestamps = _parse_timestamps(chunk['Datetime']).tolist()
+                yield from map(MarketDataPoint, timestamps, chunk['Symbol'].tolist(), chunk['Close'].tolist())
+    
+    def stream_batches(self, filename: str, chunksize: int = 10_000):
+        """Stream the CSV as column arrays, ``chunksize`` rows at a time.
         
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                yield MarketDataPoint(
-                    timestamp=pd.to_datetime(row['Datetime']),
-                    symbol=row['Symbol'],
-                    price=float(row['Close'])
+        Yields ``(prices, symbols, timestamps)`` numpy arrays rather than
+        MarketDataPoint objects, in the argument order of
+        Strategy.generate_signals_batch, so ``generate_signals_batch(*batch)``
+        works directly.
+        """
+        with self._read_chunks(filename, chunksize) as reader:
+            for chunk in reader:
+                yield (
+                    chunk['Close'].to_numpy(),
+                    chunk['Symbol'].to_numpy(dtype=object),
+                    _parse_timestamps(chunk['Datetime']).to_numpy()
                 )
 
 
@@ -1,13 +1,41 @@
-from trading_lib.models import MarketDataPoint, OrderStatus, Order, Action
+from trading_lib.models import MarketDataPoint, OrderStatus, Order, Action, RecordingInterval
 from trading_lib.gateway import Gateway
 from trading_lib.strategies import Strategy
+from trading_lib.strategies.base import ACTION_CODES
 from trading_lib.portfolio import Portfolio
+from trading_lib.portfolio.base import FILL_OK, FILL_ERRORS
 from trading_lib.order_manager import OrderManager
 from trading_lib.logging_config import get_logger
 from trading_lib.performance import PerformanceTracker
-from typing import Optional
+from typing import Callable, Optional
 from datetime import datetime
 
+import numpy as np
+
+# Period key for each recording interval: ticks in the same period share one
+# equity curve point. None means every tick gets its own point. Keys are ints
+# (wall-clock seconds/days since 0001-01-01 divided into buckets), which are
+# cheaper to build and compare than tuples and need no timezone lookup.
+_DAY_SECONDS = 86400
+
+
+def _wall_seconds(ts: datetime) -> int:
+    return ts.toordinal() * _DAY_SECONDS + ts.hour * 3600 + ts.minute * 60 + ts.second
+
+
+_PERIOD_FNS = {
+    RecordingInterval.TICK: None,
+    RecordingInterval.SECOND: _wall_seconds,
+    RecordingInterval.MINUTE: lambda ts: _wall_seconds(ts) // 60,
+    RecordingInterval.HOURLY: lambda ts: _wall_seconds(ts) // 3600,
+    RecordingInterval.DAILY: datetime.toordinal,
+    RecordingInterval.WEEKLY: lambda ts: (ts.toordinal() - 1) // 7,  # Day 1 is a Monday, so weeks run Mon-Sun
+    RecordingInterval.MONTHLY: lambda ts: ts.year * 12 + ts.month,
+}
+
+# Action for each code in a generate_signals_batch result
+_CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
 class TradingEngine:
     """Main orchestrator for backtesting and live trading.
     
@@ -19,6 +47,11 @@ class TradingEngine:
     5. [Sim] MatchingEngine simulates fills using OrderBook
     6. [Live] Real exchange handles fills
     7. Gateway publishes fills -> Portfolio subscribes to fills, updates positions
+    
+    With ``batch_size`` the engine subscribes to market data in batches and
+    gets signals for a whole batch from ``Strategy.generate_signals_batch``,
+    building Orders only for ticks that trade. This suits strategies whose
+    signals are at most one per tick with quantity ``action * strategy.quantity``.
     """
     
     def __init__(
@@ -27,33 +60,106 @@ class TradingEngine:
         strategy: Strategy, 
         portfolio: Portfolio, 
         order_manager: OrderManager,
-        performance_tracker: Optional[PerformanceTracker] = None
+        performance_tracker: Optional[PerformanceTracker] = None,
+        recording_interval: RecordingInterval = RecordingInterval.TICK,
+        batch_size: Optional[int] = None
     ):
         self.gateway = gateway
         self.strategy = strategy
         self.portfolio = portfolio
         self.order_manager = order_manager
         self.performance_tracker = performance_tracker
+        self.recording_interval = recording_interval
+        self.batch_size = batch_size
+        # Fills are stamped with the latest tick's time when the gateway
+        # replays data, so trades carry simulated rather than wall-clock time
+        self._use_tick_time = getattr(gateway, 'market_clock', False)
+        self._tick_time: Optional[datetime] = None
+        # Log calls pass values as arguments (not f-strings), so nothing is
+        # formatted for disabled levels; the logger caches isEnabledFor itself
         self.logger = get_logger('engine')
         
+        # Order update handler per status (statuses not listed are ignored)
+        self._status_handlers = {
+            OrderStatus.ACTIVE: self._handle_active,
+            OrderStatus.PARTIALLY_FILLED: self._handle_partially_filled,
+            OrderStatus.FILLED: self._handle_filled,
+            OrderStatus.FAILED: self._handle_failed,
+            OrderStatus.CANCELED: self._handle_canceled,
+        }
+        
         self._setup_subscriptions()
     
+    @property
+    def recording_interval(self) -> RecordingInterval:
+        """How often the equity curve gets a new point (the latest value per period is kept)."""
+        return self._recording_interval
+    
+    @recording_interval.setter
+    def recording_interval(self, interval: RecordingInterval):
+        # Resolve the period function once here rather than branching per tick
+        interval = RecordingInterval(interval)  # ValueError for unknown intervals
+        self._recording_interval = interval
+        self._period_fn = _PERIOD_FNS[interval]
+    
+    def _get_period(self, timestamp: datetime):
+        """Recording period key for a timestamp (None when recording every tick)."""
+        period_fn = self._period_fn
+        return period_fn(timestamp) if period_fn is not None else None
+    
     def _setup_subscriptions(self):
         # Subscribe to market data
-        self.gateway.subscribe_market_data(self._on_market_data)
+        if self.batch_size:
+            self.gateway.subscribe_market_data_batch(self._on_market_data_batch, self.batch_size)
+        else:
+            self.gateway.subscribe_market_data(self._on_market_data)
         
         # Subscribe to order updates
         self.gateway.subscribe_order_updates(self._on_order_update)
     
     def _on_market_data(self, tick: MarketDataPoint):
+        self._tick_time = tick.timestamp
         # Update performance tracker with current market price
         if self.performance_tracker:
             self.performance_tracker.update_market_price(tick.symbol, tick.price)
             # Record portfolio value periodically
-            self.performance_tracker.record_portfolio_value(self.portfolio, tick.timestamp)
+            self.performance_tracker.record_portfolio_value(
+                self.portfolio, tick.timestamp, period=self._get_period(tick.timestamp)
+            )
         
         signals = self.strategy.generate_signals(tick)
+        if signals:  # Most ticks produce none
+            self._submit_signals(signals)
+    
+    def _on_market_data_batch(self, batch: np.ndarray):
+        """Handle a batch of ticks (fields timestamp, symbol, price) in order."""
+        actions = self.strategy.generate_signals_batch(batch['price'], batch['symbol'], batch['timestamp'])
+        quantity = self.strategy.quantity
+        # Plain lists: indexing them per row is much cheaper than ndarray scalars
+        symbols, timestamps = batch['symbol'].tolist(), batch['timestamp'].tolist()
+        prices, codes = batch['price'].tolist(), actions.tolist()
         
+        tracker = self.performance_tracker
+        if tracker:
+            # Period keys for the whole batch in one pass
+            period_fn = self._period_fn
+            periods = list(map(period_fn, timestamps)) if period_fn is not None else [None] * len(prices)
+            rows = range(len(prices))
+        else:
+            # Without a tracker only the ticks that trade need visiting
+            rows = np.flatnonzero(actions).tolist()
+        for i in rows:
+            if tracker:
+                tracker.update_market_price(symbols[i], prices[i])
+                tracker.record_portfolio_value(self.portfolio, timestamps[i], period=periods[i])
+            code = codes[i]
+            if code:
+                self._tick_time = timestamps[i]
+                self._submit_signals([(symbols[i], code * quantity, prices[i], _CODE_ACTIONS[code])])
+    
+    def _submit_signals(self, signals):
+        """Turn one tick's signals into validated orders and submit them together."""
+        orders = []
         for signal in signals:
             symbol, quantity, price, action = signal
             if action == Action.HOLD:
@@ -62,60 +168,73 @@ class TradingEngine:
             order = Order(symbol=symbol, quantity=quantity, price=price, status=OrderStatus.PENDING, filled_quantity=0)
             
             if self.order_manager.validate_order(order):
-                self.gateway.submit_order(order)
+                orders.append(order)
             else:
-                self.logger.warning(f"Order validation failed: {order.symbol} {order.quantity}@{order.price}")
+                self.logger.warning("Order validation failed: %s %s@%s", order.symbol, order.quantity, order.price)
+        
+        if orders:
+            self.gateway.submit_orders(orders)
     
     def _on_order_update(self, order: Order):
-        if order.status == OrderStatus.ACTIVE:
-            # Order is now active on exchange (acknowledged)
-            self.order_manager.record_order(order)
-            
-            # Check if there's a fill update even though status is ACTIVE
-            # (Gateway might send ACTIVE status with filled_quantity > 0)
-            if order.filled_quantity > 0:
-                new_fill_qty, remaining_qty = self.order_manager.update_order_fill(order, order.filled_quantity)
-                if new_fill_qty > 0:
-                    self._apply_fill(order, new_fill_qty, datetime.now())
-                    # Status is already updated by update_order_fill
-                    if remaining_qty > 0:
-                        self.logger.info(f"Order partially filled: {order.symbol} {new_fill_qty} filled, {remaining_qty} remaining @{order.price}")
-                    else:
-                        self.logger.info(f"Order fully filled: {order.symbol} {order.quantity}@{order.price}")
-                        self.order_manager.remove_order(order)
+        handler = self._status_handlers.get(order.status)
+        if handler is not None:
+            handler(order)
+    
+    def _handle_active(self, order: Order):
+        # Order is now active on exchange (acknowledged)
+        self.order_manager.record_order(order)
+        
+        # Plain acknowledgement (the common case): nothing filled yet
+        if order.filled_quantity <= 0:
+            self.logger.debug("Order active: %s %s@%s", order.symbol, order.quantity, order.price)
+            return
+        
+        # Gateway might send ACTIVE status with filled_quantity > 0
+        new_fill_qty, remaining_qty = self.order_manager.update_order_fill(order, order.filled_quantity)
+        if new_fill_qty > 0:
+            self._apply_fill(order, new_fill_qty, self._fill_time())
+            # Status is already updated by update_order_fill
+            if remaining_qty > 0:
+                self.logger.info("Order partially filled: %s %s filled, %s remaining @%s", order.symbol, new_fill_qty, remaining_qty, order.price)
             else:
-                self.logger.debug(f"Order active: {order.symbol} {order.quantity}@{order.price}")
-            
-        elif order.status == OrderStatus.PARTIALLY_FILLED:
-            # Order partially filled - update tracking and apply fill
-            new_fill_qty, remaining_qty = self.order_manager.update_order_fill(order, order.filled_quantity)
-            
-            if new_fill_qty > 0:
-                self._apply_fill(order, new_fill_qty, datetime.now())
-                self.logger.info(f"Order partially filled: {order.symbol} {new_fill_qty} filled, {remaining_qty} remaining @{order.price}")
-            
-        elif order.status == OrderStatus.FILLED:
-            # Order fully filled
-            new_fill_qty, remaining_qty = self.order_manager.update_order_fill(order, order.filled_quantity)
-            
-            if new_fill_qty > 0:
-                self._apply_fill(order, new_fill_qty, datetime.now())
-            
-            self.order_manager.record_order(order)
-            self.logger.info(f"Order fully filled: {order.symbol} {order.quantity}@{order.price}")
-            self.order_manager.remove_order(order)
-            
-        elif order.status == OrderStatus.FAILED:
-            # Order failed to submit
-            self.order_manager.record_order(order)
-            self.logger.warning(f"Order failed: {order.symbol} {order.quantity}@{order.price}")
-            self.order_manager.remove_order(order)
-            
-        elif order.status == OrderStatus.CANCELED:
-            # Order was canceled
-            self.order_manager.record_order(order)
-            self.logger.info(f"Order canceled: {order.symbol} {order.quantity}@{order.price}")
-            self.order_manager.remove_order(order)
+                self.logger.info("Order fully filled: %s %s@%s", order.symbol, order.quantity, order.price)
+                self.order_manager.remove_order(order)
+    
+    def _handle_partially_filled(self, order: Order):
+        # Order partially filled - update tracking and apply fill
+        new_fill_qty, remaining_qty = self.order_manager.update_order_fill(order, order.filled_quantity)
+        
+        if new_fill_qty > 0:
+            self._apply_fill(order, new_fill_qty, self._fill_time())
+            self.logger.info("Order partially filled: %s %s filled, %s remaining @%s", order.symbol, new_fill_qty, remaining_qty, order.price)
+    
+    def _handle_filled(self, order: Order):
+        # Order fully filled
+        new_fill_qty, remaining_qty = self.order_manager.update_order_fill(order, order.filled_quantity)
+        
+        if new_fill_qty > 0:
+            self._apply_fill(order, new_fill_qty, self._fill_time())
+        
+        self._close_order(order, self.logger.info, "Order fully filled")
+    
+    def _handle_failed(self, order: Order):
+        # Order failed to submit
+        self._close_order(order, self.logger.warning, "Order failed")
+    
+    def _handle_canceled(self, order: Order):
+        self._close_order(order, self.logger.info, "Order canceled")
+    
+    def _close_order(self, order: Order, log: Callable[..., None], message: str):
+        """Record a finished order, log it and stop tracking it."""
+        self.order_manager.record_order(order)
+        log("%s: %s %s@%s", message, order.symbol, order.quantity, order.price)
+        self.order_manager.remove_order(order)
+    
+    def _fill_time(self) -> datetime:
+        """Timestamp for a fill happening now (see market_clock on Gateway)."""
+        if self._use_tick_time and self._tick_time is not None:
+            return self._tick_time
+        return datetime.now()
     
     def _apply_fill(self, order: Order, fill_quantity: int, timestamp: Optional[datetime] = None):
         """Apply a fill (partial or full) to the portfolio.
@@ -125,28 +244,34 @@ class TradingEngine:
             fill_quantity: The quantity that was just filled (positive number)
             timestamp: Timestamp of the fill (default: now)
         """
-        # Create a temporary order with just the fill quantity
-        # Use the same sign as original order (buy vs sell)
-        fill_sign = 1 if order.quantity > 0 else -1
-        fill_order = Order(
-            symbol=order.symbol,
-            quantity=fill_sign * fill_quantity,
-            price=order.price,
-            status=OrderStatus.FILLED,
-            filled_quantity=fill_quantity
-        )
-        
-        try:
-            self.portfolio.apply_order(fill_order)
-            
-            # Record trade in performance tracker
-            if self.performance_tracker:
-                self.performance_tracker.record_trade(fill_order, timestamp)
-        except ValueError as e:
-            # Handle insufficient cash/holdings gracefully
-            self.logger.error(f"Failed to apply fill: {e}. Order: {fill_order.symbol} {fill_order.quantity}@{fill_order.price}")
+        # Read the order once; this runs for every fill
+        symbol = order.symbol
+        price = order.price
+        portfolio = self.portfolio
+        
+        # Just the fill quantity, with the same sign as the original order (buy vs sell)
+        quantity = order.side * fill_quantity
+        
+        # Insufficient cash/holdings is an expected outcome here, so check for
+        # it up front rather than catching the portfolio's exception
+        result = portfolio.check_fill(symbol, quantity, price)
+        if result != FILL_OK:
+            self.logger.error("Failed to apply fill: %s. Order: %s %s@%s", FILL_ERRORS[result], symbol, quantity, price)
             # Don't record the trade if it couldn't be applied
+            return
+        
+        portfolio.apply_fill(symbol, quantity, price)
+        
+        # Record trade in performance tracker
+        tracker = self.performance_tracker
+        if tracker:
+            tracker.record_fill(symbol, quantity, price, timestamp)
     
     def run(self):
         """Start the trading engine."""
-        self.gateway.run()        
+        self.gateway.run()
+    
+    async def run_async(self):
+        """Start the trading engine on the running asyncio event loop."""
+        await self.gateway.run_async()
+        
@@ -1,9 +1,9 @@
 """Gateway module for market data and order routing."""
 
-from trading_lib.gateway.base import Gateway
-from trading_lib.gateway.simulation import SimulationGateway
+from trading_lib.gateway.base import Gateway, QueuedSubscriber
+from trading_lib.gateway.simulation import SimulationGateway, MarketDataArrays, load_market_data
 from trading_lib.gateway.live import LiveGateway
 from trading_lib.gateway.factory import create_gateway
 
-__all__ = ["Gateway", "SimulationGateway", "LiveGateway", "create_gateway"]
+__all__ = ["Gateway", "QueuedSubscriber", "SimulationGateway", "MarketDataArrays", "load_market_data", "LiveGateway", "create_gateway"]
 
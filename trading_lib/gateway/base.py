@@ -1,12 +1,109 @@
 """Base Gateway interface for market data and order routing."""
 
+import asyncio
+import atexit
 import csv
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Generator, Callable, Optional
 
+import numpy as np
+
 from trading_lib.models import MarketDataPoint, Order
+from trading_lib.logging_config import get_logger
+
+# Row layout of the structured arrays passed to batch subscribers
+MARKET_DATA_BATCH_DTYPE = np.dtype([
+    ('timestamp', object),
+    ('symbol', object),
+    ('price', np.float64),
+])
+
+# The audit log is written through a buffer and flushed after this many
+# events or this many seconds since the last flush (and on close)
+AUDIT_FLUSH_EVENTS = 1000
+AUDIT_FLUSH_SECONDS = 1.0
+
+# Audit rows are written pre-formatted (same output as csv.writer, including
+# its \r\n line ends) unless a text field needs CSV quoting
+AUDIT_ROW_FORMAT = "%s,%s,%s,%s,%s,%s,%s,%s\r\n"
+_NEEDS_QUOTING = re.compile(r'[,"\r\n]').search
+
+
+class QueuedSubscriber:
+    """Runs a subscriber callback on its own daemon thread.
+    
+    Publishing only appends to a bounded deque and returns, so a slow
+    subscriber never blocks the publisher. When the deque is full the oldest
+    pending event is dropped (counted in ``dropped``), or with
+    ``drop_oldest=False`` the publisher waits for room instead, for events
+    that must not be lost. The delivery thread takes all pending events at
+    once, so a burst costs one hand-over rather than one per event.
+    """
+    
+    def __init__(self, callback: Callable, maxlen: int, drop_oldest: bool = True):
+        if maxlen < 1:
+            raise ValueError("queue_size must be positive")
+        self.callback = callback
+        self.dropped = 0
+        self.maxlen = maxlen
+        self.drop_oldest = drop_oldest
+        self._queue = deque(maxlen=maxlen if drop_oldest else None)
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, daemon=True,
+                                        name=f"subscriber-{getattr(callback, '__name__', 'callback')}")
+        self._thread.start()
+    
+    def __call__(self, event):
+        with self._cond:
+            if len(self._queue) >= self.maxlen:
+                if self.drop_oldest:
+                    self.dropped += 1
+                else:
+                    self._cond.wait_for(lambda: len(self._queue) < self.maxlen)
+            self._queue.append(event)
+            self._cond.notify_all()
+    
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                events = list(self._queue)
+                self._queue.clear()
+                self._busy = True
+                # Room again for a publisher waiting on a full queue
+                self._cond.notify_all()
+            try:
+                for event in events:
+                    try:
+                        self.callback(event)
+                    except Exception:
+                        get_logger('gateway').exception("Queued subscriber failed")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+    
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued events have been delivered."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+    
+    def close(self):
+        """Stop the delivery thread once the queue is drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
 
 
 class Gateway(ABC):
@@ -17,34 +114,192 @@ class Gateway(ABC):
     2. Routing orders to execution venue
     3. Publishing order status updates back to strategy
     4. Audit logging all order events
+    
+    Events are delivered through an event pump: a publish made while another
+    event is being delivered (e.g. an order fill triggered from a market data
+    callback) is queued and delivered once the current callbacks return,
+    instead of recursing into the subscribers.
     """
     
+    # True when market data timestamps are the clock (replayed data), so
+    # events such as fills should be stamped with the current tick's time
+    market_clock = False
+    
     def __init__(self, audit_log_path: Optional[str] = None):
+        # Cleared by stop()/disconnect(); run loops return once it is False
+        self._connected = False
         self._market_data_callbacks = []
         self._order_update_callbacks = []
+        # Tuple snapshots of the lists above, read on every publish
+        self._market_data_cbs = ()
+        self._order_update_cbs = ()
+        # What the pump calls per event: the lone subscriber itself when
+        # there is exactly one, otherwise the fan-out method
+        self._tick_deliver = self._deliver_tick_callbacks
+        self._market_data_deliver = self._deliver_market_data
+        self._order_update_deliver = self._deliver_order_update
+        # Batch subscribers: [callback, batch_size, pending rows]
+        self._market_data_batch_subscribers = []
+        # Subscribers delivered on their own thread (see QueuedSubscriber)
+        self._queued_subscribers = []
+        
+        # Event pump: (deliver, event) pairs waiting for delivery
+        self._event_queue = deque()
+        self._pumping = False
         
         # Setup audit logging
         self.audit_log_path = audit_log_path
         self._audit_file = None
         self._audit_writer = None
+        self._audit_pending = 0
+        self._audit_last_flush = 0.0
+        # Formatted date and time of the last audit event's second
+        self._audit_second = None
+        self._audit_second_str = ""
         
         if audit_log_path:
             self._setup_audit_log(audit_log_path)
     
     # Market Data Subscription
-    def subscribe_market_data(self, callback: Callable[[MarketDataPoint], None]):
+    def subscribe_market_data(self, callback: Callable[[MarketDataPoint], None], queue_size: Optional[int] = None):
         """Subscribe to market data updates.
         
+        By default the callback runs synchronously on the publishing thread.
+        With ``queue_size`` it runs on a dedicated thread fed by a bounded
+        drop-oldest queue, for consumers (monitoring, logging) that must not
+        slow the data loop. Such callbacks must not submit orders.
+        
         Args:
             callback: Function to call when new market data arrives
+            queue_size: Optional queue length for asynchronous delivery
         """
+        if queue_size is not None:
+            callback = QueuedSubscriber(callback, queue_size)
+            self._queued_subscribers.append(callback)
         self._market_data_callbacks.append(callback)
+        self._refresh_callbacks()
+    
+    def _refresh_callbacks(self):
+        """Re-snapshot the callback lists; call after changing them."""
+        self._market_data_cbs = tuple(self._market_data_callbacks)
+        self._order_update_cbs = tuple(self._order_update_callbacks)
+        
+        single = len(self._market_data_cbs) == 1
+        self._tick_deliver = self._market_data_cbs[0] if single else self._deliver_tick_callbacks
+        if single and not self._market_data_batch_subscribers:
+            self._market_data_deliver = self._market_data_cbs[0]
+        else:
+            self._market_data_deliver = self._deliver_market_data
+        if len(self._order_update_cbs) == 1:
+            self._order_update_deliver = self._order_update_cbs[0]
+        else:
+            self._order_update_deliver = self._deliver_order_update
+    
+    def wait_for_subscribers(self, timeout: Optional[float] = None):
+        """Block until queued (asynchronous) subscribers have caught up."""
+        for subscriber in self._queued_subscribers:
+            subscriber.join(timeout)
+    
+    def _close_queued_subscribers(self):
+        """Stop delivery threads of queued subscribers."""
+        for subscriber in self._queued_subscribers:
+            subscriber.close()
+        self._queued_subscribers.clear()
+    
+    def subscribe_market_data_batch(self, callback: Callable[[np.ndarray], None], batch_size: int = 1024):
+        """Subscribe to market data delivered in batches.
+        
+        Ticks are buffered and handed over as a structured array with
+        ``timestamp``, ``symbol`` and ``price`` fields (MARKET_DATA_BATCH_DTYPE)
+        once ``batch_size`` ticks have arrived. Any remainder is delivered when
+        the data stream ends.
+        
+        Args:
+            callback: Function to call with each batch
+            batch_size: Number of ticks per batch
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self._market_data_batch_subscribers.append([callback, batch_size, []])
+        self._refresh_callbacks()
+    
+    def _pump(self, deliver: Callable, event):
+        """Queue an event and, unless already pumping, drain the queue."""
+        queue = self._event_queue
+        queue.append((deliver, event))
+        if self._pumping:
+            return
+        
+        self._pumping = True
+        try:
+            while queue:
+                deliver, event = queue.popleft()
+                deliver(event)
+        except BaseException:
+            # Don't deliver stale events on the next publish
+            queue.clear()
+            raise
+        finally:
+            self._pumping = False
     
     def _publish_market_data(self, data_point: MarketDataPoint):
         """Publish market data to all subscribers."""
-        for callback in self._market_data_callbacks:
+        self._pump(self._market_data_deliver, data_point)
+    
+    def _deliver_market_data(self, data_point: MarketDataPoint):
+        for callback in self._market_data_cbs:
+            callback(data_point)
+        
+        for subscriber in self._market_data_batch_subscribers:
+            callback, batch_size, pending = subscriber
+            pending.append((data_point.timestamp, data_point.symbol, data_point.price))
+            if len(pending) >= batch_size:
+                subscriber[2] = []
+                callback(np.array(pending, dtype=MARKET_DATA_BATCH_DTYPE))
+    
+    def _publish_market_data_batch(self, batch: np.ndarray):
+        """Publish a block of ticks (a MARKET_DATA_BATCH_DTYPE array) at once.
+        
+        Batch subscribers get the rows in slices of their batch_size, after
+        any rows still pending from single-tick publishes; a short remainder
+        stays pending as usual. Per-tick subscribers get one MarketDataPoint
+        per row, each delivered as its own event.
+        
+        Outside of a callback, order updates raised while a batch subscriber
+        handles the block are delivered as they happen, so the subscriber sees
+        each tick's fills before it moves on to the next tick.
+        """
+        if self._pumping:
+            self._pump(self._deliver_market_data_batch, batch)
+        else:
+            self._deliver_market_data_batch(batch)
+    
+    def _deliver_market_data_batch(self, batch: np.ndarray):
+        if self._market_data_cbs:
+            for data_point in map(MarketDataPoint, batch['timestamp'], batch['symbol'], batch['price'].tolist()):
+                self._pump(self._tick_deliver, data_point)
+        
+        for subscriber in self._market_data_batch_subscribers:
+            callback, batch_size, pending = subscriber
+            rows = np.concatenate([np.array(pending, dtype=MARKET_DATA_BATCH_DTYPE), batch]) if pending else batch
+            full = len(rows) - len(rows) % batch_size
+            subscriber[2] = rows[full:].tolist()
+            for start in range(0, full, batch_size):
+                callback(rows[start:start + batch_size])
+    
+    def _deliver_tick_callbacks(self, data_point: MarketDataPoint):
+        """Per-tick subscribers only (batch subscribers are fed separately)."""
+        for callback in self._market_data_cbs:
             callback(data_point)
     
+    def _flush_market_data_batches(self):
+        """Deliver partially filled batches to batch subscribers."""
+        for subscriber in self._market_data_batch_subscribers:
+            callback, _, pending = subscriber
+            if pending:
+                subscriber[2] = []
+                callback(np.array(pending, dtype=MARKET_DATA_BATCH_DTYPE))
+    
     # Order Routing
     @abstractmethod
     def submit_order(self, order: Order) -> None:
@@ -55,18 +310,44 @@ class Gateway(ABC):
         """
         raise NotImplementedError
     
+    def submit_orders(self, orders: list[Order]) -> None:
+        """Submit several orders at once (e.g. all orders from one tick).
+        
+        The default submits them one at a time; gateways with a round trip
+        per order override this to send them together.
+        
+        Args:
+            orders: Orders to submit, in order
+        """
+        for order in orders:
+            self.submit_order(order)
+    
     # Order Status Updates
-    def subscribe_order_updates(self, callback: Callable[[Order], None]):
+    def subscribe_order_updates(self, callback: Callable[[Order], None], queue_size: Optional[int] = None):
         """Subscribe to order status updates.
         
+        As with subscribe_market_data, ``queue_size`` runs the callback on a
+        dedicated thread so bursts of updates don't hold up the gateway. Order
+        updates are never dropped: when the queue is full the publisher waits.
+        Such callbacks see each Order as it is at delivery time and must not
+        submit orders.
+        
         Args:
             callback: Function to call when order status changes
+            queue_size: Optional queue length for asynchronous delivery
         """
+        if queue_size is not None:
+            callback = QueuedSubscriber(callback, queue_size, drop_oldest=False)
+            self._queued_subscribers.append(callback)
         self._order_update_callbacks.append(callback)
+        self._refresh_callbacks()
     
     def _publish_order_update(self, order: Order):
         """Publish order update to all subscribers."""
-        for callback in self._order_update_callbacks:
+        self._pump(self._order_update_deliver, order)
+    
+    def _deliver_order_update(self, order: Order):
+        for callback in self._order_update_cbs:
             callback(order)
     
     # Gateway Lifecycle
@@ -85,14 +366,34 @@ class Gateway(ABC):
         """Start the gateway (blocking call that processes data)."""
         raise NotImplementedError
     
+    def stop(self) -> None:
+        """Ask a running run()/run_async() to return soon.
+        
+        Only sets a flag, so it is safe to call from signal handlers,
+        subscriber callbacks and other threads. Call disconnect() afterwards
+        to release resources.
+        """
+        self._connected = False
+    
+    async def run_async(self) -> None:
+        """Start the gateway on the running event loop.
+        
+        The default runs the blocking run() in a worker thread so the event
+        loop stays free for other tasks.
+        """
+        await asyncio.to_thread(self.run)
+    
     # Order Audit Logging
     def _setup_audit_log(self, log_path: str):
         """Setup audit log file."""
         log_file = Path(log_path)
         log_file.parent.mkdir(parents=True, exist_ok=True)
         
-        self._audit_file = open(log_file, 'a', newline='')
+        self._audit_file = open(log_file, 'a', newline='', buffering=1 << 20)
         self._audit_writer = csv.writer(self._audit_file)
+        self._audit_last_flush = time.monotonic()
+        # Don't lose buffered events if the gateway is never disconnected
+        atexit.register(self._close_audit_log)
         
         # Write header if file is empty
         if log_file.stat().st_size == 0:
@@ -107,8 +408,8 @@ class Gateway(ABC):
         if not self._audit_writer:
             return
         
-        self._audit_writer.writerow([
-            datetime.now().isoformat(),
+        row = (
+            self._audit_timestamp(),
             event,
             order.symbol,
             order.quantity,
@@ -116,8 +417,33 @@ class Gateway(ABC):
             order_id,
             order.status.value if hasattr(order.status, 'value') else str(order.status),
             notes
-        ])
-        self._audit_file.flush()
+        )
+        text = (order.symbol, order_id, notes)
+        if all(type(field) is str and not _NEEDS_QUOTING(field) for field in text):
+            self._audit_file.write(AUDIT_ROW_FORMAT % row)
+        else:
+            self._audit_writer.writerow(row)
+        self._audit_pending += 1
+        if (self._audit_pending >= AUDIT_FLUSH_EVENTS
+                or time.monotonic() - self._audit_last_flush > AUDIT_FLUSH_SECONDS):
+            self.flush_audit_log()
+    
+    def _audit_timestamp(self) -> str:
+        """Same as datetime.now().isoformat(), formatting the date and time once per second."""
+        second, micro = divmod(time.time_ns() // 1000, 1_000_000)
+        if second != self._audit_second:
+            self._audit_second = second
+            self._audit_second_str = datetime.fromtimestamp(second).isoformat()
+        if micro:
+            return "%s.%06d" % (self._audit_second_str, micro)
+        return self._audit_second_str
+    
+    def flush_audit_log(self):
+        """Write buffered audit log events to the file now."""
+        if self._audit_file:
+            self._audit_file.flush()
+            self._audit_pending = 0
+            self._audit_last_flush = time.monotonic()
     
     def log_order_sent(self, order: Order, order_id: str = ""):
         """Log when order is sent."""
@@ -142,3 +468,4 @@ class Gateway(ABC):
             self._audit_file.close()
             self._audit_file = None
             self._audit_writer = None
+            atexit.unregister(self._close_audit_log)
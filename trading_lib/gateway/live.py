@@ -1,5 +1,8 @@
 """Live Gateway for real-time trading with Alpaca."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from trading_lib.gateway.base import Gateway
 from trading_lib.models import (
     MarketDataPoint, Order, OrderStatus,
@@ -8,6 +11,12 @@ from trading_lib.models import (
 from trading_lib.logging_config import get_logger
 from trading_lib.market_data_logger import MarketDataLogger
 
+# HTTP connection pool for the Alpaca REST session
+HTTP_POOL_SIZE = 10
+
+# How often the websocket stream checks for stop() (seconds)
+STREAM_STOP_POLL_SECONDS = 0.5
+
 
 class LiveGateway(Gateway):
     """Gateway for live trading with Alpaca API."""
@@ -20,7 +29,9 @@ class LiveGateway(Gateway):
         symbols: list = None,
         audit_log_path: str = None,
         save_market_data: bool = True,
-        market_data_dir: str = "data/live"
+        market_data_dir: str = "data/live",
+        stream: bool = True,
+        data_feed: str = "iex"
     ):
         """Initialize live gateway.
         
@@ -32,13 +43,20 @@ class LiveGateway(Gateway):
             audit_log_path: Optional path for order audit log
             save_market_data: Whether to save market data to CSV (default: True)
             market_data_dir: Directory to save market data CSVs
+            stream: Receive trades over the websocket data stream (default)
+                rather than polling the REST API every second
+            data_feed: Alpaca data feed for the stream ('iex' or 'sip')
         """
         super().__init__(audit_log_path=audit_log_path)
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url
         self.symbols = symbols or []
+        self.stream = stream
+        self.data_feed = data_feed
         self._api = None
+        # Loop that streamed trades are published on, while streaming
+        self._publish_loop = None
         self._connected = False
         self.logger = get_logger('gateway.live')
         
@@ -57,6 +75,7 @@ class LiveGateway(Gateway):
             )
         
         self._api = tradeapi.REST(self.api_key, self.api_secret, self.base_url)
+        self._configure_session(self._api._session)
         
         # Test connection
         account = self._api.get_account()
@@ -67,6 +86,23 @@ class LiveGateway(Gateway):
         
         self._connected = True
     
+    @staticmethod
+    def _configure_session(session):
+        """Size the REST client's keep-alive pool and retry failed connects.
+        
+        Only connection errors are retried here: the client already retries
+        rate-limit responses itself, and retrying reads could duplicate orders.
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.2)
+        )
+        session.mount('https://', adapter)
+    
     def get_account_state(self) -> AccountState:
         """Get current account state from Alpaca.
         
@@ -76,18 +112,23 @@ class LiveGateway(Gateway):
         if not self._connected:
             raise RuntimeError("Gateway not connected")
         
-        # Get account info
-        account = self._api.get_account()
+        # Account, positions and open orders are independent requests; issue
+        # them concurrently over the session's connection pool
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            account_future = executor.submit(self._api.get_account)
+            positions_future = executor.submit(self._api.list_positions)
+            orders_future = executor.submit(self._api.list_orders, status='open')
+        account = account_future.result()
+        positions_raw = positions_future.result()
+        open_orders_raw = orders_future.result()
         
         # Get current positions
-        positions_raw = self._api.list_positions()
         positions_dict = {}
         for pos in positions_raw:
             alpaca_pos = AlpacaPosition.from_alpaca_position(pos)
             positions_dict[alpaca_pos.symbol] = alpaca_pos
         
         # Get open orders
-        open_orders_raw = self._api.list_orders(status='open')
         orders_list = [AlpacaOrder.from_alpaca_order(order) for order in open_orders_raw]
         
         state = AccountState(
@@ -104,9 +145,13 @@ class LiveGateway(Gateway):
     
     def disconnect(self):
         """Disconnect from Alpaca."""
+        self.stop()
+        self._flush_market_data_batches()
         self._close_audit_log()
         if self.market_data_logger:
             self.market_data_logger.close_all()
+        if self._api is not None:
+            self._api.close()
         self._connected = False
         self.logger.info("Disconnected from Alpaca")
     
@@ -120,71 +165,189 @@ class LiveGateway(Gateway):
             raise RuntimeError("Gateway not connected")
         
         try:
-            # Determine side
-            side = 'buy' if order.quantity > 0 else 'sell'
-            qty = abs(order.quantity)
-            
-            # Submit to Alpaca
-            alpaca_order = self._api.submit_order(
-                symbol=order.symbol,
-                qty=qty,
-                side=side,
-                type='limit',
-                limit_price=order.price,
-                time_in_force='day'
-            )
-            
-            self.logger.info(f"Submitted order to Alpaca: {alpaca_order.id}")
-            
-            # Log order submission
-            self.log_order_sent(order, order_id=alpaca_order.id)
-            
-            # Update order status to ACTIVE
-            # Note: filled_quantity will be updated when polling for order status
-            order.status = OrderStatus.ACTIVE
-            order.filled_quantity = 0  # Initialize
-            self._publish_order_update(order)
-            
+            alpaca_order = self._send_order(order)
         except Exception as e:
-            self.logger.error(f"Error submitting order: {e}")
-            order.status = OrderStatus.FAILED
-            self.log_order_cancelled(order, notes=str(e))
-            self._publish_order_update(order)
+            self._order_failed(order, e)
+        else:
+            self._order_accepted(order, alpaca_order)
+    
+    def submit_orders(self, orders: list[Order]):
+        """Submit several orders to Alpaca concurrently.
+        
+        Alpaca has no bulk order endpoint, so the requests are sent in
+        parallel over the session's connection pool. Order updates are
+        published afterwards from the calling thread, in submission order.
+        
+        Args:
+            orders: Orders to submit
+        """
+        if len(orders) <= 1:
+            for order in orders:
+                self.submit_order(order)
+            return
+        
+        if not self._connected:
+            raise RuntimeError("Gateway not connected")
+        
+        with ThreadPoolExecutor(max_workers=min(len(orders), HTTP_POOL_SIZE)) as executor:
+            futures = [executor.submit(self._send_order, order) for order in orders]
+        
+        for order, future in zip(orders, futures):
+            try:
+                alpaca_order = future.result()
+            except Exception as e:
+                self._order_failed(order, e)
+            else:
+                self._order_accepted(order, alpaca_order)
+    
+    def _send_order(self, order: Order):
+        """POST a limit order to Alpaca and return Alpaca's order object."""
+        # Determine side
+        side = 'buy' if order.quantity > 0 else 'sell'
+        qty = abs(order.quantity)
+        
+        return self._api.submit_order(
+            symbol=order.symbol,
+            qty=qty,
+            side=side,
+            type='limit',
+            limit_price=order.price,
+            time_in_force='day'
+        )
+    
+    def _order_accepted(self, order: Order, alpaca_order):
+        """Log a submitted order and publish it as ACTIVE."""
+        self.logger.info("Submitted order to Alpaca: %s", alpaca_order.id)
+        
+        # Log order submission
+        self.log_order_sent(order, order_id=alpaca_order.id)
+        
+        # Update order status to ACTIVE
+        # Note: filled_quantity will be updated when polling for order status
+        order.status = OrderStatus.ACTIVE
+        order.filled_quantity = 0  # Initialize
+        self._publish_order_update(order)
+    
+    def _order_failed(self, order: Order, error: Exception):
+        """Log a rejected submission and publish it as FAILED."""
+        self.logger.error("Error submitting order: %s", error)
+        order.status = OrderStatus.FAILED
+        self.log_order_cancelled(order, notes=str(error))
+        self._publish_order_update(order)
     
     def run(self):
-        """Stream real-time market data from Alpaca.
+        """Stream real-time market data from Alpaca (blocking).
         
-        Note: This is a simplified polling implementation.
+        Trades are pushed over Alpaca's websocket data stream; with
+        ``stream=False`` the latest trade of each symbol is polled over REST
+        once a second instead.
         """
         if not self._connected:
             self.connect()
         
+        if self.stream:
+            try:
+                asyncio.run(self._stream_trades())
+            except KeyboardInterrupt:
+                self.logger.info("Received interrupt signal, stopping...")
+                raise
+            return
+        
         import time
         
-        self.logger.info(f"Streaming market data for: {', '.join(self.symbols)}")
+        self.logger.info(f"Polling market data for: {', '.join(self.symbols)}")
         
         try:
             # Poll for latest trades 
             while self._connected:
                 for symbol in self.symbols:
                     try:
-                        trade = self._api.get_latest_trade(symbol)
-                        data_point = MarketDataPoint(
-                            timestamp=trade.timestamp,
-                            symbol=symbol,
-                            price=float(trade.price)
-                        )
-                        # Publish to subscribers
-                        self._publish_market_data(data_point)
-                        
-                        # Save to CSV if enabled
-                        if self.market_data_logger:
-                            self.market_data_logger.log_tick(data_point)
+                        self._publish_trade(self._api.get_latest_trade(symbol), symbol)
                     except Exception as e:
-                        self.logger.error(f"Error fetching {symbol}: {e}")
+                        self.logger.error("Error fetching %s: %s", symbol, e)
                 
                 time.sleep(1)  # Poll every second
         except KeyboardInterrupt:
             self.logger.info("Received interrupt signal, stopping...")
             raise
-
+    
+    async def run_async(self):
+        """Stream real-time market data without blocking the event loop.
+        
+        Same as run(), on the running event loop: the websocket stream is
+        awaited directly, and when polling, the REST calls run in worker
+        threads and the poll interval is an asyncio sleep.
+        """
+        if not self._connected:
+            self.connect()
+        
+        if self.stream:
+            await self._stream_trades()
+            return
+        
+        self.logger.info(f"Polling market data for: {', '.join(self.symbols)}")
+        
+        while self._connected:
+            for symbol in self.symbols:
+                try:
+                    trade = await asyncio.to_thread(self._api.get_latest_trade, symbol)
+                    self._publish_trade(trade, symbol)
+                except Exception as e:
+                    self.logger.error("Error fetching %s: %s", symbol, e)
+            
+            await asyncio.sleep(1)  # Poll every second
+    
+    async def _stream_trades(self):
+        """Publish trades from Alpaca's websocket data stream until stop()/disconnect().
+        
+        The stream runs with its own event loop (Stream.run) on a worker
+        thread; its trade handler hands each trade to this loop, so
+        subscribers run here exactly as with polling. A stop() is noticed
+        within STREAM_STOP_POLL_SECONDS and shuts the stream down.
+        """
+        import alpaca_trade_api as tradeapi
+        
+        stream = tradeapi.Stream(
+            self.api_key, self.api_secret, self.base_url, data_feed=self.data_feed
+        )
+        self._publish_loop = asyncio.get_running_loop()
+        stream.subscribe_trades(self._on_trade, *self.symbols)
+        self.logger.info(f"Streaming market data for: {', '.join(self.symbols)}")
+        
+        runner = asyncio.ensure_future(asyncio.to_thread(stream.run))
+        try:
+            while not runner.done() and self._connected:
+                await asyncio.wait({runner}, timeout=STREAM_STOP_POLL_SECONDS)
+            if runner.done():
+                runner.result()  # re-raise if the stream thread failed
+        finally:
+            # Also reached on cancellation (e.g. Ctrl+C under asyncio.run):
+            # the worker thread must end before the loop can shut down
+            self._connected = False
+            while not runner.done():
+                try:
+                    stream.stop()
+                except AttributeError:
+                    pass  # stream loops not started yet; try again
+                await asyncio.wait({runner}, timeout=STREAM_STOP_POLL_SECONDS)
+            self._publish_loop = None
+    
+    async def _on_trade(self, trade):
+        """Websocket trade handler (runs on the stream's thread and loop)."""
+        loop = self._publish_loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._publish_trade, trade, trade.symbol)
+    
+    def _publish_trade(self, trade, symbol: str):
+        """Publish an Alpaca trade as market data and save it if enabled."""
+        data_point = MarketDataPoint(
+            timestamp=trade.timestamp,
+            symbol=symbol,
+            price=float(trade.price)
+        )
+        # Publish to subscribers
+        self._publish_market_data(data_point)
+        
+        # Save to CSV if enabled
+        if self.market_data_logger:
+            self.market_data_logger.log_tick(data_point)
@@ -1,44 +1,149 @@
 """Simulation Gateway for backtesting."""
 
+import asyncio
 import csv
+from contextlib import closing
+from datetime import datetime
 from pathlib import Path
+from typing import NamedTuple, Optional
 
+import numpy as np
 import pandas as pd
 
-from trading_lib.gateway.base import Gateway
+from trading_lib.gateway.base import Gateway, MARKET_DATA_BATCH_DTYPE
 from trading_lib.models import MarketDataPoint, Order
 from trading_lib.logging_config import get_logger
 
 
+class MarketDataArrays(NamedTuple):
+    """Column-oriented market data, parsed once and shareable across gateways."""
+    timestamps: np.ndarray  # pd.Timestamp objects
+    symbols: np.ndarray
+    prices: np.ndarray  # float64
+
+
+MARKET_DATA_COLUMNS = ['Datetime', 'Symbol', 'Close']
+
+# Columnar formats are loaded up front; CSV keeps the line-by-line stream
+BINARY_FORMATS = {'.parquet', '.feather'}
+
+# run_async() hands control back to the event loop after this many ticks
+ASYNC_YIELD_INTERVAL = 256
+
+# Rows per block when run() publishes whole batches (see _run_batches)
+MARKET_DATA_BATCH_ROWS = 10_000
+
+
+def load_market_data(csv_path) -> MarketDataArrays:
+    """Load a market data file into column arrays in a single pass.
+    
+    The reader is chosen by file suffix: ``.parquet`` and ``.feather`` files
+    are read directly as columns, anything else is parsed as CSV.
+    
+    Args:
+        csv_path: Path to a file with Datetime, Symbol and Close columns
+        
+    Returns:
+        MarketDataArrays with one entry per row
+    """
+    suffix = Path(csv_path).suffix.lower()
+    if suffix == '.parquet':
+        df = pd.read_parquet(csv_path, columns=MARKET_DATA_COLUMNS)
+    elif suffix == '.feather':
+        df = pd.read_feather(csv_path, columns=MARKET_DATA_COLUMNS)
+    else:
+        df = _read_market_data_csv(csv_path)
+    return _frame_to_arrays(df)
+
+
+def _read_market_data_csv(csv_path, chunksize: Optional[int] = None):
+    """pd.read_csv of the market data columns (a chunk reader with chunksize)."""
+    return pd.read_csv(
+        csv_path,
+        usecols=MARKET_DATA_COLUMNS,
+        dtype={'Close': 'float64'},
+        engine='c',
+        float_precision='round_trip',  # match float() parsing of the streaming path
+        chunksize=chunksize
+    )
+
+
+def _parse_timestamps(values: pd.Series) -> pd.Series:
+    """pd.to_datetime of a Datetime column, parsed row by row when it mixes UTC offsets.
+    
+    Data spanning a DST change has both -04:00 and -05:00 rows, which
+    pd.to_datetime rejects; each row then keeps its own offset, as in the
+    line-by-line CSV stream.
+    """
+    try:
+        return pd.to_datetime(values)
+    except ValueError:
+        return values.map(pd.Timestamp)
+
+
+def _frame_to_arrays(df: pd.DataFrame) -> MarketDataArrays:
+    """Column arrays of a market data frame, with parsed timestamps."""
+    timestamps = _parse_timestamps(df['Datetime'])
+    return MarketDataArrays(
+        timestamps=timestamps.to_numpy(dtype=object),
+        symbols=df['Symbol'].to_numpy(dtype=object),
+        prices=df['Close'].to_numpy(dtype=np.float64)
+    )
+
+
 class SimulationGateway(Gateway):
     """Gateway for backtesting with historical CSV data and simulated execution."""
     
-    def __init__(self, csv_path: str, data_dir: str = "data", matching_engine=None, audit_log_path: str = None):
+    market_clock = True
+    
+    def __init__(self, csv_path: Optional[str] = None, data_dir: str = "data", matching_engine=None,
+                 audit_log_path: str = None, market_data: Optional[MarketDataArrays] = None):
         """Initialize simulation gateway.
         
         Args:
-            csv_path: Path to CSV file with historical market data
+            csv_path: Path to CSV (or .parquet/.feather) file with historical market data
             data_dir: Directory containing data files
             matching_engine: Optional MatchingEngine for order simulation
             audit_log_path: Optional path for order audit log
+            market_data: Optional pre-parsed data; when given the CSV is not read
         """
         super().__init__(audit_log_path=audit_log_path)
         self.data_dir = Path(data_dir)
-        self.csv_path = self.data_dir / csv_path if not Path(csv_path).is_absolute() else Path(csv_path)
+        if csv_path is not None:
+            self.csv_path = self.data_dir / csv_path if not Path(csv_path).is_absolute() else Path(csv_path)
+        else:
+            self.csv_path = None
+        self.market_data = market_data
         self._connected = False
+        self._ticks = None
         self.logger = get_logger('gateway.simulation')
 
         self.matching_engine = matching_engine
         if self.matching_engine:
             self.matching_engine.subscribe_order_updates(self._publish_order_update)
         
-        if not self.csv_path.exists():
-            raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+        if self.market_data is None:
+            if self.csv_path is None:
+                raise ValueError("Either csv_path or market_data must be provided")
+            if not self.csv_path.exists():
+                raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+            if self.csv_path.suffix.lower() in BINARY_FORMATS:
+                self.market_data = load_market_data(self.csv_path)
+    
+    @classmethod
+    def from_arrays(cls, market_data: MarketDataArrays, **kwargs) -> "SimulationGateway":
+        """Create a gateway that replays already-parsed market data.
         
+        Args:
+            market_data: Arrays returned by load_market_data (may be shared)
+            **kwargs: Passed through to the constructor
+        """
+        return cls(market_data=market_data, **kwargs)
     
     def connect(self):
         """Connect to simulation data source."""
-        self.logger.info(f"Connected to simulation data: {self.csv_path}")
+        source = self.csv_path if self.csv_path is not None else "in-memory arrays"
+        self.logger.info(f"Connected to simulation data: {source}")
         self._connected = True
     
     def disconnect(self):
@@ -47,6 +152,21 @@ class SimulationGateway(Gateway):
         self.logger.info("Disconnected from simulation")
         self._connected = False
     
+    def reset(self):
+        """Prepare the gateway for another run over the same data.
+        
+        Drops all market data and order update subscribers (including any
+        pending batches) and marks the gateway disconnected, so the next
+        run() replays the data from the first row. Parsed market data is kept.
+        """
+        self._market_data_callbacks.clear()
+        self._order_update_callbacks.clear()
+        self._market_data_batch_subscribers.clear()
+        self._refresh_callbacks()
+        self._close_queued_subscribers()
+        self._connected = False
+        self._ticks = None
+    
     def submit_order(self, order: Order):
         """Submit order to matching engine simulator.
         
@@ -69,7 +189,7 @@ class SimulationGateway(Gateway):
             # Set filled_quantity to full quantity and status to FILLED
             order.filled_quantity = abs(order.quantity)
             order.status = OrderStatus.FILLED
-            self.logger.debug(f"Simulated order execution: {order.symbol} {order.quantity}@{order.price}")
+            self.logger.debug("Simulated order execution: %s %s@%s", order.symbol, order.quantity, order.price)
             self.log_order_filled(order, fill_price=order.price)
             self._publish_order_update(order)
     
@@ -78,24 +198,138 @@ class SimulationGateway(Gateway):
         if not self._connected:
             self.connect()
         
+        if self._market_data_batch_subscribers and not self._market_data_cbs:
+            # Nobody needs single ticks: publish blocks of rows instead
+            self._run_batches()
+        elif self.market_data is not None:
+            self._run_arrays()
+        else:
+            self._run_csv()
+        
+        # End of data: hand any partial batches to batch subscribers and let
+        # queued subscribers catch up
+        self._flush_market_data_batches()
+        self.wait_for_subscribers()
+    
+    def _next_tick(self) -> Optional[MarketDataPoint]:
+        """Next data point of the replay, or None at the end of the data."""
+        if self._ticks is None:
+            self._ticks = self._iter_ticks()
+        return next(self._ticks, None)
+    
+    async def run_async(self):
+        """Stream market data like run(), yielding to the event loop periodically."""
+        if not self._connected:
+            self.connect()
+        
+        count = 0
+        while self._connected:
+            data_point = self._next_tick()
+            if data_point is None:
+                break
+            self._publish_market_data(data_point)
+            count += 1
+            if count % ASYNC_YIELD_INTERVAL == 0:
+                await asyncio.sleep(0)
+        else:
+            self.logger.info("Simulation stopped by disconnect signal")
+        
+        self._flush_market_data_batches()
+        await asyncio.to_thread(self.wait_for_subscribers)
+    
+    def _iter_ticks(self):
+        """Yield data points from the pre-parsed arrays or the CSV file."""
+        if self.market_data is not None:
+            data = self.market_data
+            yield from map(MarketDataPoint, data.timestamps, data.symbols, data.prices.tolist())
+        else:
+            yield from self._read_csv_ticks()
+    
+    def _read_csv_ticks(self):
+        """Yield data points line-by-line from the CSV file.
+        
+        Rows are read as plain lists with the column positions looked up once,
+        and timestamps (ISO 8601, as yfinance writes them) are parsed with
+        datetime.fromisoformat, then wrapped in pd.Timestamp so every replay
+        path yields the same timestamp type as load_market_data.
+        """
+        with open(self.csv_path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            ts_col, symbol_col, price_col = (header.index(name) for name in MARKET_DATA_COLUMNS)
+            fromisoformat, timestamp = datetime.fromisoformat, pd.Timestamp
+            for row in reader:
+                yield MarketDataPoint(timestamp(fromisoformat(row[ts_col])), row[symbol_col], float(row[price_col]))
+    
+    def _run_csv(self):
+        """Stream market data line-by-line from the CSV file."""
+        # Bound once: what it delivers to follows _refresh_callbacks
+        publish = self._publish_market_data
         try:
             # Stream data line-by-line
-            with open(self.csv_path, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
+            with closing(self._read_csv_ticks()) as ticks:
+                for data_point in ticks:
                     # Check if we should stop
                     if not self._connected:
                         self.logger.info("Simulation stopped by disconnect signal")
                         break
                     
-                    data_point = MarketDataPoint(
-                        timestamp=pd.to_datetime(row['Datetime']),
-                        symbol=row['Symbol'],
-                        price=float(row['Close'])
-                    )
                     # Publish to all subscribers
-                    self._publish_market_data(data_point)
+                    publish(data_point)
         except KeyboardInterrupt:
             self.logger.info("Simulation interrupted")
             raise
+    
+    def _run_arrays(self):
+        """Publish pre-parsed market data to subscribers."""
+        data = self.market_data
+        publish = self._publish_market_data
+        try:
+            # map() builds the points from the columns without a Python-level loop body
+            for data_point in map(MarketDataPoint, data.timestamps, data.symbols, data.prices.tolist()):
+                if not self._connected:
+                    self.logger.info("Simulation stopped by disconnect signal")
+                    break
+                publish(data_point)
+        except KeyboardInterrupt:
+            self.logger.info("Simulation interrupted")
+            raise
+    
+    def _run_batches(self):
+        """Publish market data in blocks of MARKET_DATA_BATCH_ROWS rows."""
+        try:
+            for batch in self._iter_batches():
+                if not self._connected:
+                    self.logger.info("Simulation stopped by disconnect signal")
+                    break
+                self._publish_market_data_batch(batch)
+        except KeyboardInterrupt:
+            self.logger.info("Simulation interrupted")
+            raise
+    
+    def _iter_batches(self):
+        """Yield MARKET_DATA_BATCH_DTYPE blocks from the pre-parsed arrays or the CSV file.
+        
+        The CSV file is read in chunks of MARKET_DATA_BATCH_ROWS rows with
+        pandas, so timestamps are parsed a column at a time.
+        """
+        if self.market_data is not None:
+            data = self.market_data
+            for start in range(0, len(data.prices), MARKET_DATA_BATCH_ROWS):
+                rows = slice(start, start + MARKET_DATA_BATCH_ROWS)
+                yield _batch_from_arrays(MarketDataArrays(*(column[rows] for column in data)))
+        else:
+            with _read_market_data_csv(self.csv_path, chunksize=MARKET_DATA_BATCH_ROWS) as chunks:
+                for chunk in chunks:
+                    yield _batch_from_arrays(_frame_to_arrays(chunk))
+
 
+def _batch_from_arrays(data: MarketDataArrays) -> np.ndarray:
+    """MARKET_DATA_BATCH_DTYPE array holding the given columns."""
+    batch = np.empty(len(data.prices), dtype=MARKET_DATA_BATCH_DTYPE)
+    batch['timestamp'] = data.timestamps
+    batch['symbol'] = data.symbols
+    batch['price'] = data.prices
+    return batch
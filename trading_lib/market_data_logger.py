@@ -1,30 +1,47 @@
 """Market data logger for saving live ticks to CSV files."""
 
 import csv
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 
 from trading_lib.models import MarketDataPoint
 
+FIELDNAMES = ['Datetime', 'Symbol', 'Close']
+
 
 class MarketDataLogger:
-    """Logs market data ticks to CSV files organized by date and symbol."""
+    """Logs market data ticks to CSV files organized by date and symbol.
+    
+    Rows are buffered per symbol and written in batches, either when a
+    buffer reaches ``batch_size`` rows or when ``commit_delay`` seconds have
+    passed since the last flush (checked as ticks arrive). ``flush()`` and
+    ``close_all()`` write out anything still pending.
+    """
     
-    def __init__(self, data_dir: str = "data/live"):
+    def __init__(self, data_dir: str = "data/live", batch_size: int = 10000, commit_delay: float = 30.0):
         """Initialize market data logger.
         
         Args:
             data_dir: Directory to store market data CSVs
+            batch_size: Rows buffered per symbol before writing to disk
+            commit_delay: Max seconds between flushes while ticks are arriving
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.commit_delay = commit_delay
         
         # Track open file handles by symbol
         self._files = {}
         self._writers = {}
         self._current_date = {}
         
+        # Pending rows per symbol, written on flush
+        self._buffers = {}
+        self._last_flush = time.monotonic()
+        
         # Track last logged tick per symbol to prevent duplicates
         # Key: symbol, Value: (timestamp, price) tuple
         self._last_logged = {}
@@ -53,18 +70,40 @@ class MarketDataLogger:
         if symbol not in self._files:
             self._open_file(symbol, date_str)
         
-        # Write the tick
-        self._writers[symbol].writerow({
-            'Datetime': tick.timestamp.isoformat(),
-            'Symbol': tick.symbol,
-            'Close': tick.price
-        })
-        
-        # Flush immediately for real-time logging
-        self._files[symbol].flush()
+        # Buffer the tick; it is written on the next flush
+        buffer = self._buffers.setdefault(symbol, [])
+        buffer.append((tick.timestamp.isoformat(), symbol, tick.price))
         
         # Update last logged tick for this symbol
         self._last_logged[symbol] = tick_key
+        
+        if len(buffer) >= self.batch_size:
+            self._flush_symbol(symbol)
+        if time.monotonic() - self._last_flush >= self.commit_delay:
+            self.flush()
+    
+    def log_ticks(self, ticks: Iterable[MarketDataPoint]):
+        """Log a batch of market data ticks.
+        
+        Args:
+            ticks: Market data points to log
+        """
+        for tick in ticks:
+            self.log_tick(tick)
+    
+    def flush(self):
+        """Write all buffered rows to disk."""
+        for symbol in list(self._buffers):
+            self._flush_symbol(symbol)
+        self._last_flush = time.monotonic()
+    
+    def _flush_symbol(self, symbol: str):
+        """Write buffered rows for one symbol to its open file."""
+        buffer = self._buffers.get(symbol)
+        if buffer and symbol in self._files:
+            self._writers[symbol].writerows(buffer)
+            self._files[symbol].flush()
+            buffer.clear()
     
     def _open_file(self, symbol: str, date_str: str):
         """Open CSV file for symbol and date."""
@@ -81,19 +120,20 @@ class MarketDataLogger:
         
         # Open file in append mode
         file_handle = open(filepath, 'a', newline='')
-        writer = csv.DictWriter(file_handle, fieldnames=['Datetime', 'Symbol', 'Close'])
+        writer = csv.writer(file_handle)
         
         # Write header if new file
         if not file_exists:
-            writer.writeheader()
+            writer.writerow(FIELDNAMES)
         
         self._files[symbol] = file_handle
         self._writers[symbol] = writer
         self._current_date[symbol] = date_str
     
     def _close_file(self, symbol: str):
-        """Close file handle for symbol."""
+        """Flush pending rows and close file handle for symbol."""
         if symbol in self._files:
+            self._flush_symbol(symbol)
             self._files[symbol].close()
             del self._files[symbol]
             del self._writers[symbol]
@@ -101,7 +141,7 @@ class MarketDataLogger:
             # Note: Keep _last_logged to prevent duplicates across file rotations
     
     def close_all(self):
-        """Close all open file handles."""
+        """Flush pending rows and close all open file handles."""
         for symbol in list(self._files.keys()):
             self._close_file(symbol)
     
@@ -1,7 +1,9 @@
-import random
-from typing import Callable
+from itertools import count
+from typing import Callable, Optional
 import copy
 
+import numpy as np
+
 from trading_lib.models import Order, OrderStatus
 
 # TODO: Matching engine class
@@ -13,15 +15,29 @@ from trading_lib.models import Order, OrderStatus
     # This ID is returned as part of the order object, along with the other fields.
     # Once an order is placed, it can be queried using either the client-provided order ID or the system-assigned unique ID to check its status.
 
+# Uniform draws fetched from the generator at a time
+RANDOM_BATCH_SIZE = 1024
+
+# Fill outcome codes, in the order of the thresholds they are decided by
+OUTCOME_CANCEL, OUTCOME_PARTIAL, OUTCOME_FILL = 0, 1, 2
+
 class MatchingEngine:
     """ Simulates order matching and execution outcomes """
     
-    def __init__(self, cancel_rate: float = 0.05, partial_fill_rate: float = 0.1):
+    def __init__(self, cancel_rate: float = 0.05, partial_fill_rate: float = 0.1,
+                 rng: Optional[np.random.Generator] = None):
         self._orders = {}
         self._cancel_rate = cancel_rate
         self._partial_fill_rate = partial_fill_rate
         self._preset_random_value = None
-        self._order_update_callbacks = []
+        # Fill outcomes are decided RANDOM_BATCH_SIZE at a time: a uniform u
+        # below the first threshold cancels, below the second partially fills
+        self._rng = rng if rng is not None else np.random.default_rng()
+        self._thresholds = np.array([cancel_rate, cancel_rate + partial_fill_rate])
+        self._outcomes = ()
+        self._outcome_index = 0
+        self._order_update_callbacks = ()  # tuple: cheap to iterate per order
+        self._next_order_number = count(1)  # next() is atomic, so ids stay unique across threads
 
     def subscribe_order_updates(self, callback: Callable[[Order], None]):
         """Subscribe to order status updates.
@@ -29,18 +45,27 @@ class MatchingEngine:
         Args:
             callback: Function to call when order status changes
         """
-        self._order_update_callbacks.append(callback)
+        self._order_update_callbacks += (callback,)
 
     def _publish_order_update(self, order: Order):
         """Publish order update to all subscribers."""
         for callback in self._order_update_callbacks:
             callback(order)    
     
-    def _get_random_value(self) -> float:
-        """ Generate a random float between 0 and 1 or return a preset value if specified"""    
+    def _outcome_for(self, uniforms):
+        """ OUTCOME_* code(s) for uniform draw(s) in [0, 1) """
+        return np.searchsorted(self._thresholds, uniforms, side='right')
+
+    def _next_outcome(self) -> int:
+        """ Outcome for the next order, from the preset value if specified """
         if self._preset_random_value is not None:
-            return self._preset_random_value
-        return random.random()
+            return int(self._outcome_for(self._preset_random_value))
+        i = self._outcome_index
+        if i >= len(self._outcomes):
+            self._outcomes = self._outcome_for(self._rng.random(RANDOM_BATCH_SIZE)).tolist()
+            i = 0
+        self._outcome_index = i + 1
+        return self._outcomes[i]
 
     def set_random_value(self, value: float):
         """ Set a preset random value for testing purposes """
@@ -48,7 +73,7 @@ class MatchingEngine:
 
     def create_unique_id(self) -> str:
         """ Generate a unique order ID """
-        return f"order_{len(self._orders) + 1}_X"
+        return f"order_{next(self._next_order_number)}_X"
     
     def ensure_order_id(self, order: Order) -> Order:
         """ Ensure the order has a unique ID """
@@ -58,12 +83,12 @@ class MatchingEngine:
 
     def attempt_to_fill_order(self, order: Order) -> Order:
         """ Simulate order fill attempt based on cancel and partial fill rates """
-        random_value = self._get_random_value()
+        outcome = self._next_outcome()
         
-        if self._cancel_rate > 0 and random_value < self._cancel_rate:
+        if outcome == OUTCOME_CANCEL:
             order.status = OrderStatus.CANCELED
             order.filled_quantity = 0
-        elif self._partial_fill_rate > 0 and random_value < self._partial_fill_rate + self._cancel_rate:
+        elif outcome == OUTCOME_PARTIAL:
             order.status = OrderStatus.PARTIALLY_FILLED
             order.filled_quantity = order.quantity  // 3 
         else:
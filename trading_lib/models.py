@@ -1,9 +1,11 @@
+from collections import deque
+from itertools import count
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarketDataPoint:
     """Frozen dataclass representing a market data point."""
 
@@ -30,17 +32,52 @@ class OrderStatus(str, Enum):
     CANCELED = "CANCELED"
     FAILED = "FAILED"
 
+# Source of default client order ids (unique within the process)
+_client_order_ids = count(1)
+
 class Order:
-    """Mutable class representing a trade order."""
+    """Mutable class representing a trade order.
+
+    ``id`` is assigned by the exchange (or matching engine). ``client_order_id``
+    is fixed at creation, survives copies and is used to track the order
+    locally; unless one is given (e.g. a broker client id string) it is an
+    int from a process-wide counter. ``side`` is +1 for a buy and -1 for a sell, taken from the sign
+    of ``quantity`` at creation.
+    """
 
-    def __init__(self, symbol: str, quantity: int, price: float, status: OrderStatus, id: str | None = None, filled_quantity: int = 0):
+    __slots__ = ("symbol", "quantity", "price", "status", "id", "filled_quantity", "client_order_id", "side")
+
+    # Freelist of released orders reused by acquire()
+    _pool: deque = deque(maxlen=4096)
+
+    def __init__(self, symbol: str, quantity: int, price: float, status: OrderStatus, id: str | None = None, filled_quantity: int = 0,
+                 client_order_id: int | str | None = None):
         self.symbol = symbol
         self.quantity = quantity  # Total order quantity
+        self.side = 1 if quantity > 0 else -1
         self.price = price
         self.status = status
         self.id = id
         
         self.filled_quantity = filled_quantity  # How much has been filled so far
+        self.client_order_id = client_order_id if client_order_id is not None else next(_client_order_ids)
+
+    @classmethod
+    def acquire(cls, symbol: str, quantity: int, price: float, status: OrderStatus, id: str | None = None, filled_quantity: int = 0,
+                client_order_id: int | str | None = None) -> "Order":
+        """Get an order from the freelist (or a new one) initialized with these fields."""
+        pool = cls._pool
+        order = pool.pop() if pool else object.__new__(cls)
+        order.__init__(symbol, quantity, price, status, id, filled_quantity, client_order_id)
+        return order
+
+    def release(self):
+        """Return an order to the freelist.
+
+        Only release orders nothing else references, e.g. ones rejected
+        before being submitted; a released order may be handed out again.
+        """
+        self._pool.append(self)
         
     @property
     def remaining_quantity(self) -> int:
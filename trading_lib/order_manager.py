@@ -43,8 +43,9 @@ class OrderManager:
         # Position tracking
         self._position_values = {}  # {symbol: net_position_value}
         
-        # Active order tracking - track orders by their object id
-        # Key: order object id, Value: (Order object, last_known_filled_quantity)
+        # Active order tracking - track orders by their client order id
+        # Key: order.client_order_id, Value: (Order object, last_known_filled_quantity)
+        # Plain dict so record/update/remove are O(1) regardless of how many are open
         self._active_orders = {}
     
     def validate_order(self, order: Order) -> tuple[bool, str]:
@@ -114,7 +115,7 @@ class OrderManager:
         self._order_timestamps.append(datetime.now())
         
         # Track active order with initial filled_quantity
-        order_id = id(order)
+        order_id = order.client_order_id
         self._active_orders[order_id] = (order, order.filled_quantity)
         
         # Update position tracking (only for new orders, not fills)
@@ -136,7 +137,7 @@ class OrderManager:
             - new_fill_qty: Quantity that was just filled (difference from last known)
             - remaining_qty: Remaining quantity to fill
         """
-        order_id = id(order)
+        order_id = order.client_order_id
         order.filled_quantity = filled_quantity
         
         # Get previous filled quantity
@@ -169,17 +170,22 @@ class OrderManager:
         """Get all active orders being tracked.
         
         Returns:
-            Dictionary mapping order_id -> Order
+            Dictionary mapping client_order_id -> Order
         """
         return {order_id: order for order_id, (order, _) in self._active_orders.items()}
     
+    @property
+    def active_order_count(self) -> int:
+        """Number of orders currently tracked as active (no dict copy)."""
+        return len(self._active_orders)
+    
     def remove_order(self, order: Order):
         """Remove order from active tracking.
         
         Args:
             order: Order to remove
         """
-        order_id = id(order)
+        order_id = order.client_order_id
         self._active_orders.pop(order_id, None)
     
     def get_order_rate(self) -> int:
@@ -202,6 +208,12 @@ class OrderManager:
     def reset_positions(self):
         """Reset position tracking (e.g., end of day)."""
         self._position_values.clear()
+    
+    def reset(self):
+        """Clear all rate-limit, position and active order state (for a new run)."""
+        self._order_timestamps.clear()
+        self._position_values.clear()
+        self._active_orders.clear()
 
 
 if __name__ == "__main__":
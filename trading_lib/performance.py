@@ -1,13 +1,20 @@
 """Performance tracking and metrics calculation for trading strategies."""
 
+import csv
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Dict, List
 import math
 
+import numpy as np
+
 from trading_lib.models import Order, MarketDataPoint
 from trading_lib.portfolio import Portfolio
 
+TRADE_LOG_FIELDNAMES = ['timestamp', 'symbol', 'side', 'quantity', 'price']
+
 
 @dataclass
 class Trade:
@@ -83,8 +90,11 @@ class PerformanceTracker:
         # Trade history
         self.trades: List[Trade] = []
         
-        # Equity curve: timestamp -> portfolio value
-        self.equity_curve: List[tuple[datetime, float]] = []
+        # Equity curve as two columns: timestamps and portfolio values (raw
+        # doubles, 8 bytes a point instead of a float and a tuple per point)
+        self._equity_timestamps: List[datetime] = []
+        self._equity_values = array('d')
+        self._last_period = None  # Period key of the last equity curve point
         
         # Open positions: symbol -> Position
         self.positions: Dict[str, Position] = {}
@@ -94,6 +104,44 @@ class PerformanceTracker:
         
         # Current prices for unrealized P&L
         self.current_prices: Dict[str, float] = {}
+        
+        # Optional CSV trade log written during the run (see open_trade_log)
+        self._trade_log = None
+        self._trade_log_writer = None
+        self._trade_log_flush_every = 0
+        self._trade_log_pending = 0
+    
+    @property
+    def equity_curve(self) -> List[tuple[datetime, float]]:
+        """Equity curve as (timestamp, portfolio value) pairs (a new list each call)."""
+        return list(zip(self._equity_timestamps, self._equity_values))
+    
+    def open_trade_log(self, path: str, flush_every: int = 100):
+        """Append each recorded trade to a CSV file as it happens.
+        
+        Rows go through the file's buffer and are flushed to disk every
+        ``flush_every`` trades, so a crashed run still leaves most of its
+        trade history behind.
+        
+        Args:
+            path: CSV file to create (overwritten if it exists)
+            flush_every: Trades between flushes
+        """
+        self.close_trade_log()
+        log_file = Path(path)
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        self._trade_log = open(log_file, 'w', newline='')
+        self._trade_log_writer = csv.writer(self._trade_log)
+        self._trade_log_writer.writerow(TRADE_LOG_FIELDNAMES)
+        self._trade_log_flush_every = max(1, flush_every)
+        self._trade_log_pending = 0
+    
+    def close_trade_log(self):
+        """Flush and close the trade log, if one is open."""
+        if self._trade_log is not None:
+            self._trade_log.close()
+            self._trade_log = None
+            self._trade_log_writer = None
     
     def record_trade(self, order: Order, timestamp: Optional[datetime] = None):
         """Record an executed trade.
@@ -102,24 +150,50 @@ class PerformanceTracker:
             order: The filled order
             timestamp: Trade timestamp (default: now)
         """
+        self.record_fill(order.symbol, order.quantity, order.price, timestamp)
+    
+    def record_fill(self, symbol: str, quantity: int, price: float, timestamp: Optional[datetime] = None):
+        """Record an executed trade given as plain values.
+        
+        Args:
+            symbol: Symbol traded
+            quantity: Filled quantity (positive for buy, negative for sell)
+            price: Fill price
+            timestamp: Trade timestamp (default: now)
+        """
         if timestamp is None:
             timestamp = datetime.now()
         
         trade = Trade(
             timestamp=timestamp,
-            symbol=order.symbol,
-            quantity=order.quantity,
-            price=order.price,
-            side='buy' if order.quantity > 0 else 'sell'
+            symbol=symbol,
+            quantity=quantity,
+            price=price,
+            side='buy' if quantity > 0 else 'sell'
         )
         self.trades.append(trade)
         
+        if self._trade_log_writer is not None:
+            self._trade_log_writer.writerow(
+                (trade.timestamp.isoformat(), trade.symbol, trade.side, trade.quantity, trade.price)
+            )
+            self._trade_log_pending += 1
+            if self._trade_log_pending >= self._trade_log_flush_every:
+                self._trade_log.flush()
+                self._trade_log_pending = 0
+        
         # Update position tracking
         self._update_position(trade)
     
     def _update_position(self, trade: Trade):
-        """Update position tracking based on trade."""
+        """Update position tracking based on trade.
+        
+        A position is marked at the latest market price for its symbol (the
+        trade price if none has been seen); update_market_price keeps it
+        current from then on.
+        """
         symbol = trade.symbol
+        mark = self.current_prices.get(symbol, trade.price)
         
         if symbol not in self.positions:
             # New position
@@ -128,7 +202,7 @@ class PerformanceTracker:
                     symbol=symbol,
                     quantity=trade.quantity,
                     avg_entry_price=trade.price,
-                    current_price=trade.price
+                    current_price=mark
                 )
         else:
             # Update existing position
@@ -153,7 +227,7 @@ class PerformanceTracker:
                     pos.avg_entry_price = total_cost / abs(new_quantity)
                 
                 pos.quantity = new_quantity
-                pos.current_price = trade.price
+                pos.current_price = mark
     
     def update_market_price(self, symbol: str, price: float):
         """Update current market price for a symbol.
@@ -166,24 +240,30 @@ class PerformanceTracker:
         if symbol in self.positions:
             self.positions[symbol].current_price = price
     
-    def record_portfolio_value(self, portfolio: Portfolio, timestamp: Optional[datetime] = None):
+    def record_portfolio_value(self, portfolio: Portfolio, timestamp: Optional[datetime] = None,
+                               period=None):
         """Record current portfolio value for equity curve.
         
         Args:
             portfolio: Portfolio to get value from
             timestamp: Timestamp for recording (default: now)
+            period: Recording period key. A value in the same period as the
+                previous one replaces it instead of adding a point
+                (default: always add a point)
         """
         if timestamp is None:
             timestamp = datetime.now()
         
-        # Update current prices in positions
-        for symbol in self.positions:
-            if symbol in self.current_prices:
-                self.positions[symbol].current_price = self.current_prices[symbol]
-        
-        # Calculate total portfolio value
+        # Positions are kept marked by update_market_price/_update_position,
+        # so there is no per-record walk over them
         portfolio_value = portfolio.get_portfolio_value(self.current_prices)
-        self.equity_curve.append((timestamp, portfolio_value))
+        if period is not None and period == self._last_period and self._equity_values:
+            self._equity_timestamps[-1] = timestamp
+            self._equity_values[-1] = portfolio_value
+        else:
+            self._equity_timestamps.append(timestamp)
+            self._equity_values.append(portfolio_value)
+        self._last_period = period
         self.current_capital = portfolio_value
     
     def calculate_metrics(self) -> PerformanceMetrics:
@@ -259,14 +339,13 @@ class PerformanceTracker:
         Returns:
             Sharpe ratio
         """
-        if len(self.equity_curve) < 2:
+        values = self._equity_values
+        if len(values) < 2:
             return 0.0
         
         # Calculate returns
         returns = []
-        for i in range(1, len(self.equity_curve)):
-            prev_value = self.equity_curve[i-1][1]
-            curr_value = self.equity_curve[i][1]
+        for prev_value, curr_value in zip(values, values[1:]):
             if prev_value > 0:
                 ret = (curr_value - prev_value) / prev_value
                 returns.append(ret)
@@ -294,23 +373,21 @@ class PerformanceTracker:
         Returns:
             (max_drawdown, max_drawdown_pct) tuple
         """
-        if not self.equity_curve:
+        if not self._equity_values:
             return (0.0, 0.0)
         
-        peak = self.initial_capital
-        max_drawdown = 0.0
-        max_drawdown_pct = 0.0
+        values = np.array(self._equity_values, dtype=np.float64)
+        # Running peak, starting from the initial capital
+        peaks = np.maximum.accumulate(np.maximum(values, self.initial_capital))
+        drawdowns = peaks - values
         
-        for _, value in self.equity_curve:
-            if value > peak:
-                peak = value
-            
-            drawdown = peak - value
-            drawdown_pct = (drawdown / peak * 100) if peak > 0 else 0.0
-            
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-                max_drawdown_pct = drawdown_pct
+        # Percentage is reported at the (first) largest absolute drawdown
+        i = int(np.argmax(drawdowns))
+        max_drawdown = float(drawdowns[i])
+        if max_drawdown <= 0:
+            return (0.0, 0.0)
+        peak = float(peaks[i])
+        max_drawdown_pct = (max_drawdown / peak * 100) if peak > 0 else 0.0
         
         return (max_drawdown, max_drawdown_pct)
     
@@ -320,12 +397,17 @@ class PerformanceTracker:
         Returns:
             (timestamps, values) tuple
         """
-        if not self.equity_curve:
-            return ([], [])
-        
-        timestamps = [t for t, _ in self.equity_curve]
-        values = [v for _, v in self.equity_curve]
-        return (timestamps, values)
+        return (list(self._equity_timestamps), self._equity_values.tolist())
+    
+    def total_cost_basis(self) -> float:
+        """Signed cost basis of all open positions (sum of quantity * avg entry price)."""
+        n = len(self.positions)
+        if n == 0:
+            return 0.0
+        positions = self.positions.values()
+        quantities = np.fromiter((pos.quantity for pos in positions), dtype=np.float64, count=n)
+        avg_prices = np.fromiter((pos.avg_entry_price for pos in positions), dtype=np.float64, count=n)
+        return float(np.dot(quantities, avg_prices))
     
     def get_trade_history(self) -> List[Trade]:
         """Get all recorded trades."""
@@ -335,10 +417,20 @@ class PerformanceTracker:
         """Get current open positions."""
         return self.positions.copy()
     
-    def reset(self):
-        """Reset tracker (for new backtest run)."""
+    def reset(self, initial_capital: Optional[float] = None):
+        """Reset tracker (for new backtest run).
+        
+        Containers are cleared in place so the tracker can be reused.
+        
+        Args:
+            initial_capital: New starting capital (default: keep current)
+        """
+        if initial_capital is not None:
+            self.initial_capital = initial_capital
         self.trades.clear()
-        self.equity_curve.clear()
+        self._equity_timestamps.clear()
+        del self._equity_values[:]
+        self._last_period = None
         self.positions.clear()
         self.closed_pnls.clear()
         self.current_prices.clear()
@@ -1,6 +1,16 @@
 from abc import ABC, abstractmethod
 
-from trading_lib.models import MarketDataPoint, Order
+from trading_lib.models import MarketDataPoint, Order, OrderStatus
+
+# Results of Portfolio.check_fill
+FILL_OK = 0
+FILL_INSUFFICIENT_CASH = 1
+FILL_INSUFFICIENT_HOLDINGS = 2
+
+FILL_ERRORS = {
+    FILL_INSUFFICIENT_CASH: "Insufficient cash in portfolio",
+    FILL_INSUFFICIENT_HOLDINGS: "Cannot sell more than currently held",
+}
 
 class Portfolio(ABC):
     """
@@ -35,6 +45,42 @@ class Portfolio(ABC):
     def get_all_holdings(self):
         raise NotImplementedError("Subclasses must implement get_all_holdings method")
     
+    def check_fill(self, symbol: str, quantity: int, price: float) -> int:
+        """Check whether apply_fill would succeed, without raising.
+        
+        The default accepts every fill; portfolios that can reject fills
+        override this.
+        
+        Returns:
+            FILL_OK, or a FILL_* code whose message is in FILL_ERRORS
+        """
+        return FILL_OK
+    
+    def apply_fill(self, symbol: str, quantity: int, price: float):
+        """Apply one fill given as plain values (no Order needed).
+        
+        Subclasses may override this to skip building an Order.
+        
+        Args:
+            symbol: Symbol traded
+            quantity: Filled quantity (positive for buy, negative for sell)
+            price: Fill price
+        """
+        self.apply_order(Order(symbol, quantity, price, OrderStatus.FILLED))
+    
+    def apply_orders_batch(self, symbol: str, quantities, prices):
+        """Apply a batch of filled orders for one symbol, in order.
+        
+        Subclasses may override this with a vectorized implementation.
+        
+        Args:
+            symbol: Symbol traded by every order in the batch
+            quantities: Order quantities (positive for buy, negative for sell)
+            prices: Fill prices, same length as quantities
+        """
+        for quantity, price in zip(quantities, prices):
+            self.apply_fill(symbol, int(quantity), float(price))
+    
     def sync_state(self, cash: float, positions: dict):
         """Sync portfolio state with external source (optional to implement).
         
@@ -1,6 +1,10 @@
+import numpy as np
+
 from trading_lib.models import Order, OrderStatus, AlpacaPosition
 from trading_lib.exceptions import OrderError
-from trading_lib.portfolio.base import Portfolio
+from trading_lib.portfolio.base import (
+    Portfolio, FILL_OK, FILL_INSUFFICIENT_CASH, FILL_INSUFFICIENT_HOLDINGS
+)
 
 
 class SimplePortfolio(Portfolio):
@@ -11,6 +15,18 @@ class SimplePortfolio(Portfolio):
         self.__holdings = holdings if holdings is not None else {}
         self.cash = cash
 
+    def __copy__(self):
+        """Copy with independent holdings, so the copy can trade without touching the original."""
+        clone = type(self).__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.__holdings = {symbol: dict(holding) for symbol, holding in self.__holdings.items()}
+        return clone
+
+    def reset(self, cash: float = 0):
+        """Empty all holdings and set cash (for reuse across backtests)."""
+        self.__holdings.clear()
+        self.cash = cash
+
     def update_cash(self, amount: float):
         self.cash += amount
         
@@ -44,9 +60,44 @@ class SimplePortfolio(Portfolio):
                 order, "Only filled orders can be applied to the portfolio"
             )
 
-        total_cost = order.price * order.quantity
+        self.apply_fill(order.symbol, order.quantity, order.price)
+
+    def check_fill(self, symbol: str, quantity: int, price: float) -> int:
+        if quantity > 0:
+            return FILL_OK if price * quantity <= self.cash else FILL_INSUFFICIENT_CASH
+        holding = self.__holdings.get(symbol)
+        held = holding["quantity"] if holding is not None else 0
+        return FILL_OK if held + quantity >= 0 else FILL_INSUFFICIENT_HOLDINGS
+
+    def apply_fill(self, symbol: str, quantity: int, price: float):
+        total_cost = price * quantity
         self.update_cash(-total_cost)
-        self.add_to_holding(order.symbol, order.quantity, order.price)
+        self.add_to_holding(symbol, quantity, price)
+
+    def apply_orders_batch(self, symbol: str, quantities, prices):
+        """Apply a batch of filled orders for one symbol.
+        
+        Buy-only batches are applied in one step, with the total cost from
+        np.dot; if it exceeds cash, nothing is applied. Batches containing
+        sells go through apply_fill one fill at a time.
+        """
+        quantities = np.asarray(quantities, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(quantities) == 0:
+            return
+        if (quantities <= 0).any():
+            super().apply_orders_batch(symbol, quantities.tolist(), prices.tolist())
+            return
+        
+        total_cost = float(np.dot(quantities, prices))
+        if total_cost > self.cash:
+            raise ValueError("Insufficient cash in portfolio")
+        self.cash -= total_cost
+        
+        holding = self.__holdings.setdefault(symbol, {"quantity": 0, "avg_price": 0.0})
+        new_quantity = holding["quantity"] + int(quantities.sum())
+        holding["avg_price"] = (holding["avg_price"] * holding["quantity"] + total_cost) / new_quantity
+        holding["quantity"] = new_quantity
 
     def get_holding(self, symbol: str):
         holding = self.__holdings.get(symbol, {"quantity": 0, "avg_price": 0.0})
@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
-from trading_lib.models import MarketDataPoint
+import numpy as np
+
+from trading_lib.models import MarketDataPoint, Action
+
+# Codes used in the int8 arrays returned by generate_signals_batch
+ACTION_CODES = {Action.HOLD: 0, Action.BUY: 1, Action.SELL: -1}
 
 class Strategy(ABC):
     """Base class for trading strategies.
@@ -16,4 +22,29 @@ class Strategy(ABC):
 
     @abstractmethod
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
-        raise NotImplementedError("Subclasses must implement generate_signals method")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement generate_signals method")
+
+    def generate_signals_batch(self, prices: np.ndarray, symbols: np.ndarray,
+                               timestamps: Optional[np.ndarray] = None) -> np.ndarray:
+        """Generate signals for a batch of ticks.
+
+        Equivalent to calling generate_signals on each tick in order; strategy
+        state carries over between batches. Subclasses can override this with a
+        vectorized implementation.
+
+        Args:
+            prices: Tick prices
+            symbols: Tick symbols, same length as prices
+            timestamps: Optional tick timestamps
+
+        Returns:
+            int8 array with 1 (BUY), -1 (SELL) or 0 (HOLD) per tick. Order
+            quantity is ``action * self.quantity``.
+        """
+        actions = np.zeros(len(prices), dtype=np.int8)
+        if timestamps is None:
+            timestamps = [None] * len(prices)
+        for i, (timestamp, symbol, price) in enumerate(zip(timestamps, symbols, prices)):
+            for signal in self.generate_signals(MarketDataPoint(timestamp, symbol, float(price))):
+                actions[i] = ACTION_CODES[signal[3]]
+        return actions
@@ -1,6 +1,6 @@
 from typing import Dict, List
-import math
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -26,20 +26,7 @@ class BollingerBandsStrategy(Strategy):
         Returns:
             (upper_band, middle_band, lower_band)
         """
-        if len(prices) < self.period:
-            return (0.0, 0.0, 0.0)
-        
-        recent_prices = prices[-self.period:]
-        middle_band = sum(recent_prices) / len(recent_prices)
-        
-        # Calculate standard deviation
-        variance = sum((p - middle_band) ** 2 for p in recent_prices) / len(recent_prices)
-        std = math.sqrt(variance)
-        
-        upper_band = middle_band + (self.std_dev * std)
-        lower_band = middle_band - (self.std_dev * std)
-        
-        return (upper_band, middle_band, lower_band)
+        return indicators.bollinger_bands(prices, self.period, self.std_dev)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals based on Bollinger Bands."""
@@ -0,0 +1,192 @@
+"""Indicator kernels shared by the strategies.
+
+Plain functions over a list of prices (oldest first). Each one reproduces the
+arithmetic the strategies used inline, in the same order, so results are
+bit-for-bit identical to the per-tick code they replace (ma_crossover only
+on Python < 3.12; see there).
+"""
+
+import math
+import sys
+from typing import List, Sequence
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # optional: compiled kernels
+
+
+def sma(prices: Sequence[float], period: int) -> float:
+    """Simple moving average of the last `period` prices (0.0 if not enough data)."""
+    if len(prices) < period:
+        return 0.0
+    return sum(prices[-period:]) / period
+
+
+def trailing_sma(prices: Sequence[float], start: int, period: int) -> np.ndarray:
+    """sma(prices[:g], period) for every g from `start` on, as a float64 array.
+
+    Each window is summed with the builtin sum(), like sma() and the per-tick
+    strategies, so the values match them exactly. (A cumulative-sum
+    difference would be faster but rounds differently.) Requires
+    ``start >= period``.
+    """
+    return np.array([sum(prices[g - period:g]) for g in range(start, len(prices))],
+                    dtype=np.float64) / period
+
+
+def ema_path(prices: Sequence[float], period: int) -> List[float]:
+    """EMA of ``prices[:i+1]`` for every i, in one pass.
+
+    The EMA is seeded with the SMA of the first `period` prices; entries
+    before that are 0.0.
+    """
+    out = [0.0] * len(prices)
+    if len(prices) < period:
+        return out
+
+    ema = sum(prices[:period]) / period
+    out[period - 1] = ema
+    multiplier = 2.0 / (period + 1)
+    for i in range(period, len(prices)):
+        ema = (prices[i] - ema) * multiplier + ema
+        out[i] = ema
+    return out
+
+
+def ema(prices: Sequence[float], period: int) -> float:
+    """Exponential moving average over all prices, seeded with an SMA."""
+    if len(prices) < period:
+        return 0.0
+
+    value = sum(prices[:period]) / period
+    multiplier = 2.0 / (period + 1)
+    for price in prices[period:]:
+        value = (price - value) * multiplier + value
+    return value
+
+
+def rsi(prices: Sequence[float], period: int) -> float:
+    """RSI from simple average gain/loss over the last `period` price changes.
+
+    Returns 50.0 (neutral) without enough data and 100.0 when there are no losses.
+    """
+    if len(prices) < period + 1:
+        return 50.0
+
+    gain = 0
+    loss = 0
+    for i in range(len(prices) - period, len(prices)):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            gain += delta
+        elif delta < 0:
+            loss -= delta
+
+    avg_gain = gain / period
+    avg_loss = loss / period
+    if avg_loss == 0:
+        return 100.0
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def macd(prices: Sequence[float], fast_period: int, slow_period: int, signal_period: int) -> tuple[float, float]:
+    """MACD line and signal line.
+
+    The signal line is the EMA of the MACD values at every index from
+    `slow_period` on. Running EMAs make this O(n) instead of recomputing
+    both EMAs for every prefix.
+
+    Returns:
+        (macd_line, signal_line), or (0.0, 0.0) without enough data
+    """
+    if len(prices) < slow_period + signal_period:
+        return (0.0, 0.0)
+
+    fast = ema_path(prices, fast_period)
+    slow = ema_path(prices, slow_period)
+    macd_line = fast[-1] - slow[-1]
+
+    macd_values = [fast[i] - slow[i] for i in range(slow_period, len(prices))]
+    if len(macd_values) >= signal_period:
+        signal_line = ema(macd_values, signal_period)
+    else:
+        signal_line = macd_line
+    return (macd_line, signal_line)
+
+
+def bollinger_bands(prices: Sequence[float], period: int, std_dev: float) -> tuple[float, float, float]:
+    """Bollinger Bands over the last `period` prices (population std).
+
+    Returns:
+        (upper_band, middle_band, lower_band), or zeros without enough data
+    """
+    if len(prices) < period:
+        return (0.0, 0.0, 0.0)
+
+    recent_prices = prices[-period:]
+    middle_band = sum(recent_prices) / len(recent_prices)
+    variance = sum((p - middle_band) ** 2 for p in recent_prices) / len(recent_prices)
+    std = math.sqrt(variance)
+
+    return (middle_band + std_dev * std, middle_band, middle_band - std_dev * std)
+
+
+def rate_of_change(prices: Sequence[float], period: int) -> float:
+    """Percentage change of the last price versus `period` prices earlier."""
+    if len(prices) < period + 1:
+        return 0.0
+
+    past_price = prices[-period - 1]
+    if past_price == 0:
+        return 0.0
+    return ((prices[-1] - past_price) / past_price) * 100
+
+
+def ma_crossover(prices: np.ndarray, start: int, short_window: int, long_window: int,
+                 prev_state: bool) -> tuple[np.ndarray, bool]:
+    """Moving-average crossover-up flags for ``prices[start:]``.
+
+    The MAs at index g cover the prices before it and start once
+    `long_window` of them are available. Each window is summed left to
+    right, which is what the builtin sum() in the per-tick strategy does on
+    Python < 3.12 (later versions compensate float sums; see
+    ma_crossover_jit).
+
+    Args:
+        prices: float64 price history followed by the new prices
+        start: Index of the first new price
+        prev_state: Whether short MA > long MA before `start`
+
+    Returns:
+        (flags, state): int8 array with 1 where the short MA crosses above the
+        long MA, and the short > long state after the last price
+    """
+    n = len(prices)
+    flags = np.zeros(n - start, dtype=np.int8)
+
+    state = prev_state
+    for g in range(max(start, long_window, 1), n):
+        short_sum = 0.0
+        for i in range(g - short_window, g):
+            short_sum += prices[i]
+        long_sum = 0.0
+        for i in range(g - long_window, g):
+            long_sum += prices[i]
+        curr = short_sum / short_window > long_sum / long_window
+        if curr and not state:
+            flags[g - start] = 1
+        state = curr
+    return flags, state
+
+
+# Compiled ma_crossover when numba is installed (None otherwise). From 3.12
+# on, sum() of floats is compensated, so the kernel's plain left-to-right
+# sums would no longer match the per-tick strategy and it is not used.
+SEQUENTIAL_FLOAT_SUM = sys.version_info < (3, 12)
+ma_crossover_jit = (njit(cache=True)(ma_crossover)
+                    if njit is not None and SEQUENTIAL_FLOAT_SUM else None)
@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -21,57 +22,14 @@ class MACDStrategy(Strategy):
         self._positions: Dict[str, int] = {}  # Track current position per symbol
         self._prev_macd_above_signal: Dict[str, bool] = {}  # Track previous crossover state
     
-    def _calculate_ema(self, prices: List[float], period: int) -> float:
-        """Calculate Exponential Moving Average."""
-        if len(prices) < period:
-            return 0.0
-        
-        # Start with SMA
-        sma = sum(prices[:period]) / period
-        multiplier = 2.0 / (period + 1)
-        
-        ema = sma
-        for price in prices[period:]:
-            ema = (price - ema) * multiplier + ema
-        
-        return ema
-    
     def _calculate_macd(self, prices: List[float]) -> tuple[float, float, float]:
         """Calculate MACD, Signal, and Histogram.
         
         Returns:
             (macd_line, signal_line, histogram)
         """
-        if len(prices) < self.slow_period + self.signal_period:
-            return (0.0, 0.0, 0.0)
-        
-        # Calculate fast and slow EMAs
-        fast_ema = self._calculate_ema(prices, self.fast_period)
-        slow_ema = self._calculate_ema(prices, self.slow_period)
-        
-        macd_line = fast_ema - slow_ema
-        
-        # Calculate signal line (EMA of MACD)
-        # We need MACD values over time for signal line
-        # For simplicity, use recent prices to approximate
-        if len(prices) >= self.slow_period + self.signal_period:
-            # Calculate MACD values for signal line
-            macd_values = []
-            for i in range(self.slow_period, len(prices)):
-                fast = self._calculate_ema(prices[:i+1], self.fast_period)
-                slow = self._calculate_ema(prices[:i+1], self.slow_period)
-                macd_values.append(fast - slow)
-            
-            if len(macd_values) >= self.signal_period:
-                signal_line = self._calculate_ema(macd_values, self.signal_period)
-            else:
-                signal_line = macd_line
-        else:
-            signal_line = macd_line
-        
-        histogram = macd_line - signal_line
-        
-        return (macd_line, signal_line, histogram)
+        macd_line, signal_line = indicators.macd(prices, self.fast_period, self.slow_period, self.signal_period)
+        return (macd_line, signal_line, macd_line - signal_line)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals based on MACD crossover."""
@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -23,17 +24,7 @@ class MomentumStrategy(Strategy):
     
     def _calculate_roc(self, prices: List[float]) -> float:
         """Calculate Rate of Change (ROC) percentage."""
-        if len(prices) < self.period + 1:
-            return 0.0
-        
-        current_price = prices[-1]
-        past_price = prices[-self.period - 1]
-        
-        if past_price == 0:
-            return 0.0
-        
-        roc = ((current_price - past_price) / past_price) * 100
-        return roc
+        return indicators.rate_of_change(prices, self.period)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals based on momentum."""
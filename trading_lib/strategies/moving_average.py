@@ -1,5 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+import numpy as np
+
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -47,4 +50,50 @@ class MovingAverageStrategy(Strategy):
         prev_prices.append(price)
         self._prices[sym] = prev_prices[-self.long_window:]  # long_window is enough
         
-        return signals
\ No newline at end of file
+        return signals
+
+    def generate_signals_batch(self, prices: np.ndarray, symbols: np.ndarray,
+                               timestamps: Optional[np.ndarray] = None) -> np.ndarray:
+        """Vectorized generate_signals over a batch of ticks (see Strategy)."""
+        prices = np.asarray(prices, dtype=np.float64)
+        symbols = np.asarray(symbols, dtype=object)
+        actions = np.zeros(len(prices), dtype=np.int8)
+        if len(prices) == 0:
+            return actions
+
+        if (symbols == symbols[0]).all():
+            actions[:] = self._batch_for_symbol(symbols[0], prices)
+        else:
+            for sym in dict.fromkeys(symbols.tolist()):
+                mask = symbols == sym
+                actions[mask] = self._batch_for_symbol(sym, prices[mask])
+        return actions
+
+    def _batch_for_symbol(self, sym: str, prices: np.ndarray) -> np.ndarray:
+        history = self._prices.get(sym, [])
+        if sym not in self._prices:
+            self._prev_short_gt_long[sym] = False
+        full = np.concatenate([np.asarray(history, dtype=np.float64), prices])
+        n_hist = len(history)
+
+        if indicators.ma_crossover_jit is not None:
+            actions, self._prev_short_gt_long[sym] = indicators.ma_crossover_jit(
+                full, n_hist, self.short_window, self.long_window, self._prev_short_gt_long[sym])
+            self._prices[sym] = full[-self.long_window:].tolist() if self.long_window else []
+            return actions
+
+        # MAs at position g use the prices before it, once long_window are
+        # available; summed per window exactly like generate_signals
+        first = max(n_hist, self.long_window, 1)
+        values = history + prices.tolist()
+        curr = (indicators.trailing_sma(values, first, self.short_window)
+                > indicators.trailing_sma(values, first, self.long_window))
+
+        actions = np.zeros(len(prices), dtype=np.int8)
+        if len(curr):
+            prev = np.concatenate([[self._prev_short_gt_long[sym]], curr[:-1]])
+            actions[first - n_hist:][curr & ~prev] = 1
+            self._prev_short_gt_long[sym] = bool(curr[-1])
+
+        self._prices[sym] = full[-self.long_window:].tolist() if self.long_window else []
+        return actions
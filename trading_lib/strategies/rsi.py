@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -30,28 +31,7 @@ class RSIStrategy(Strategy):
         Returns:
             RSI value (0-100)
         """
-        if len(prices) < self.period + 1:
-            return 50.0  # Neutral RSI
-        
-        # Calculate price changes
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        
-        # Separate gains and losses
-        gains = [d if d > 0 else 0 for d in deltas[-self.period:]]
-        losses = [-d if d < 0 else 0 for d in deltas[-self.period:]]
-        
-        # Calculate average gain and loss
-        avg_gain = sum(gains) / self.period
-        avg_loss = sum(losses) / self.period
-        
-        if avg_loss == 0:
-            return 100.0  # All gains, no losses
-        
-        # Calculate RS and RSI
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return indicators.rsi(prices, self.period)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals based on RSI.
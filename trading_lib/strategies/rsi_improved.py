@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -26,22 +27,7 @@ class ImprovedRSIStrategy(Strategy):
     
     def _calculate_rsi(self, prices: List[float]) -> float:
         """Calculate RSI."""
-        if len(prices) < self.period + 1:
-            return 50.0
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [d if d > 0 else 0 for d in deltas[-self.period:]]
-        losses = [-d if d < 0 else 0 for d in deltas[-self.period:]]
-        
-        avg_gain = sum(gains) / self.period
-        avg_loss = sum(losses) / self.period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return indicators.rsi(prices, self.period)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals with improved exit logic."""
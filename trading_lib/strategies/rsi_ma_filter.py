@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -27,28 +28,11 @@ class RSIMAFilterStrategy(Strategy):
     
     def _calculate_rsi(self, prices: List[float]) -> float:
         """Calculate RSI."""
-        if len(prices) < self.rsi_period + 1:
-            return 50.0
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [d if d > 0 else 0 for d in deltas[-self.rsi_period:]]
-        losses = [-d if d < 0 else 0 for d in deltas[-self.rsi_period:]]
-        
-        avg_gain = sum(gains) / self.rsi_period
-        avg_loss = sum(losses) / self.rsi_period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return indicators.rsi(prices, self.rsi_period)
     
     def _calculate_ma(self, prices: List[float]) -> float:
         """Calculate Moving Average."""
-        if len(prices) < self.ma_period:
-            return 0.0
-        return sum(prices[-self.ma_period:]) / self.ma_period
+        return indicators.sma(prices, self.ma_period)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals with MA filter."""
@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -28,36 +29,7 @@ class RSIMACDComboStrategy(Strategy):
     
     def _calculate_rsi(self, prices: List[float]) -> float:
         """Calculate RSI."""
-        if len(prices) < self.rsi_period + 1:
-            return 50.0
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [d if d > 0 else 0 for d in deltas[-self.rsi_period:]]
-        losses = [-d if d < 0 else 0 for d in deltas[-self.rsi_period:]]
-        
-        avg_gain = sum(gains) / self.rsi_period
-        avg_loss = sum(losses) / self.rsi_period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def _calculate_ema(self, prices: List[float], period: int) -> float:
-        """Calculate Exponential Moving Average."""
-        if len(prices) < period:
-            return 0.0
-        
-        sma = sum(prices[:period]) / period
-        multiplier = 2.0 / (period + 1)
-        
-        ema = sma
-        for price in prices[period:]:
-            ema = (price - ema) * multiplier + ema
-        
-        return ema
+        return indicators.rsi(prices, self.rsi_period)
     
     def _calculate_macd(self, prices: List[float]) -> tuple[float, float]:
         """Calculate MACD line and signal line.
@@ -65,30 +37,7 @@ class RSIMACDComboStrategy(Strategy):
         Returns:
             (macd_line, signal_line)
         """
-        min_prices = self.macd_slow + self.macd_signal
-        if len(prices) < min_prices:
-            return (0.0, 0.0)
-        
-        fast_ema = self._calculate_ema(prices, self.macd_fast)
-        slow_ema = self._calculate_ema(prices, self.macd_slow)
-        macd_line = fast_ema - slow_ema
-        
-        # Simplified signal line calculation
-        if len(prices) >= min_prices:
-            macd_values = []
-            for i in range(self.macd_slow, len(prices)):
-                fast = self._calculate_ema(prices[:i+1], self.macd_fast)
-                slow = self._calculate_ema(prices[:i+1], self.macd_slow)
-                macd_values.append(fast - slow)
-            
-            if len(macd_values) >= self.macd_signal:
-                signal_line = self._calculate_ema(macd_values, self.macd_signal)
-            else:
-                signal_line = macd_line
-        else:
-            signal_line = macd_line
-        
-        return (macd_line, signal_line)
+        return indicators.macd(prices, self.macd_fast, self.macd_slow, self.macd_signal)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals based on RSI + MACD combination."""
@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from trading_lib.strategies import indicators
 from trading_lib.strategies.base import Strategy
 from trading_lib.models import MarketDataPoint, Action
 
@@ -23,9 +24,7 @@ class TrendFollowingStrategy(Strategy):
     
     def _calculate_ma(self, prices: List[float], period: int) -> float:
         """Calculate Simple Moving Average."""
-        if len(prices) < period:
-            return 0.0
-        return sum(prices[-period:]) / period
+        return indicators.sma(prices, period)
     
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
         """Generate trading signals based on trend."""